@@ -0,0 +1,181 @@
+from ct_client.clinical_trials_gov_rest_api_client.cache import (
+    AsyncCachingTransport,
+    CachingTransport,
+    SQLiteResponseCache,
+)
+from ct_client.clinical_trials_gov_rest_api_client.client import Client
+from ct_client.clinical_trials_gov_rest_api_client.projection import FieldIndex, load_field_index
+from ct_client.clinical_trials_gov_rest_api_client.transport import (
+    AsyncRetryTransport,
+    RetryTransport,
+    TokenBucket,
+    TransportStats,
+)
+from typing import Any, Dict, Optional
+from .settings import get_settings
+from ..services.rate_limiter import RedisTokenBucket
+import asyncio
+import importlib.util
+import httpx
+import logging
+
+settings = get_settings()
+
+logger = logging.getLogger("clinical_trials")
+
+class CTGovClient:
+    """
+    Application-scoped ClinicalTrials.gov client.
+
+    One pooled `Client` (sync and async httpx clients sharing the same limits)
+    is opened at startup and reused by every service, so requests ride on
+    warm keep-alive / HTTP/2 connections instead of paying TCP+TLS setup.
+    Both clients go through ct_client's retry transports, which pace requests
+    with a shared token bucket and retry idempotent requests on 429/5xx, and
+    study endpoint responses are kept in an on-disk cache until ClinicalTrials.gov
+    publishes a new data version.
+
+    The `FieldIndex` that turns a `Projection` into piece names is loaded from
+    /studies/metadata in the background at startup; until it arrives, projections
+    are sent as dotted JSON paths, which the API accepts as well.
+    """
+    client: Optional[Client] = None
+    rate_limiter = None
+    response_cache: Optional[SQLiteResponseCache] = None
+    transport_stats = TransportStats()
+    field_index: Optional[FieldIndex] = None
+    FIELD_INDEX_RETRY_INTERVAL = 300.0  # seconds between /studies/metadata attempts until one succeeds
+    _field_index_task: Optional[asyncio.Task] = None
+
+    @classmethod
+    def _build_client(cls) -> Client:
+        http2 = settings.CTGOV_HTTP2
+        if http2 and importlib.util.find_spec("h2") is None:
+            logger.warning("HTTP/2 requested for ClinicalTrials.gov but 'h2' is not installed, using HTTP/1.1")
+            http2 = False
+
+        limits = httpx.Limits(
+            max_connections=settings.CTGOV_MAX_CONNECTIONS,
+            max_keepalive_connections=settings.CTGOV_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=settings.CTGOV_KEEPALIVE_EXPIRY,
+        )
+        common = {
+            "base_url": settings.CTGOV_BASE_URL,
+            "timeout": httpx.Timeout(
+                settings.CTGOV_READ_TIMEOUT,
+                connect=settings.CTGOV_CONNECT_TIMEOUT,
+                pool=settings.CTGOV_POOL_TIMEOUT,
+            ),
+        }
+        retry = {
+            "max_retries": settings.CTGOV_MAX_RETRIES,
+            "backoff": settings.CTGOV_RETRY_BACKOFF,
+            "max_backoff": settings.CTGOV_RETRY_MAX_BACKOFF,
+            "stats": cls.transport_stats,
+        }
+
+        # One bucket per process; optionally the async side is paced across workers through Redis
+        cls.rate_limiter = None
+        local_limiter = None
+        if settings.CTGOV_RATE_LIMIT > 0:
+            local_limiter = TokenBucket(settings.CTGOV_RATE_LIMIT, settings.CTGOV_RATE_BURST)
+            cls.rate_limiter = local_limiter
+            if settings.CTGOV_RATE_LIMIT_REDIS:
+                cls.rate_limiter = RedisTokenBucket(settings.CTGOV_RATE_LIMIT, settings.CTGOV_RATE_BURST)
+
+        transport = RetryTransport(httpx.HTTPTransport(http2=http2, limits=limits), limiter=local_limiter, **retry)
+        async_transport = AsyncRetryTransport(
+            httpx.AsyncHTTPTransport(http2=http2, limits=limits), limiter=cls.rate_limiter, **retry
+        )
+
+        # The response cache sits outermost so cache hits never spend rate-limit tokens
+        cls.response_cache = None
+        if settings.CTGOV_CACHE_PATH:
+            cls.response_cache = SQLiteResponseCache(settings.CTGOV_CACHE_PATH)
+            transport = CachingTransport(transport, cls.response_cache, settings.CTGOV_CACHE_VERSION_TTL)
+            async_transport = AsyncCachingTransport(
+                async_transport, cls.response_cache, settings.CTGOV_CACHE_VERSION_TTL
+            )
+
+        client = Client(base_url=settings.CTGOV_BASE_URL)
+        client.set_httpx_client(httpx.Client(transport=transport, **common))
+        client.set_async_httpx_client(httpx.AsyncClient(transport=async_transport, **common))
+        return client
+
+    @classmethod
+    def get_client(cls) -> Client:
+        """Get the shared client, creating it on first use (e.g. outside the app lifecycle)."""
+        if cls.client is None:
+            cls.client = cls._build_client()
+        return cls.client
+
+    @classmethod
+    async def connect(cls):
+        logger.info("Opening ClinicalTrials.gov client pool")
+        cls.get_client()
+        if cls.field_index is None and cls._field_index_task is None:
+            cls._field_index_task = asyncio.create_task(cls._load_field_index())
+
+    @classmethod
+    async def _load_field_index(cls):
+        while cls.field_index is None:
+            try:
+                cls.field_index = await load_field_index(cls.get_client())
+                logger.info("Loaded ClinicalTrials.gov field metadata")
+            except Exception as e:
+                logger.warning(f"Could not load ClinicalTrials.gov field metadata: {str(e)}")
+                await asyncio.sleep(cls.FIELD_INDEX_RETRY_INTERVAL)
+
+    @classmethod
+    async def close(cls):
+        if cls._field_index_task is not None:
+            cls._field_index_task.cancel()
+            try:
+                await cls._field_index_task
+            except asyncio.CancelledError:
+                pass
+            cls._field_index_task = None
+        if cls.client:
+            try:
+                logger.info("Closing ClinicalTrials.gov client pool")
+                await cls.client.get_async_httpx_client().aclose()
+                cls.client.get_httpx_client().close()
+                if isinstance(cls.rate_limiter, RedisTokenBucket):
+                    await cls.rate_limiter.close()
+                if cls.response_cache is not None:
+                    cls.response_cache.close()
+            except Exception as e:
+                logger.error(f"Error closing ClinicalTrials.gov client pool: {str(e)}")
+            finally:
+                cls.client = None
+
+    @classmethod
+    def pool_stats(cls) -> Dict[str, Any]:
+        """Connection pool utilisation of the shared async client."""
+        stats = {
+            "connections": 0,
+            "active": 0,
+            "idle": 0,
+            "queued_requests": 0,
+            "max_connections": settings.CTGOV_MAX_CONNECTIONS,
+        }
+        if cls.client is None:
+            return stats
+
+        # httpx does not expose pool state publicly; read it from the httpcore pool behind the wrapping transports
+        transport = getattr(cls.client.get_async_httpx_client(), "_transport", None)
+        while transport is not None and not hasattr(transport, "_pool"):
+            transport = getattr(transport, "transport", None)
+        pool = getattr(transport, "_pool", None)
+        if pool is None:
+            return stats
+
+        connections = list(pool.connections)
+        idle = sum(1 for connection in connections if connection.is_idle())
+        stats.update(
+            connections=len(connections),
+            active=len(connections) - idle,
+            idle=idle,
+            queued_requests=sum(1 for request in getattr(pool, "_requests", []) if request.is_queued()),
+        )
+        return stats
@@ -0,0 +1,51 @@
+"""
+Declared MongoDB indexes, applied by IndexService at startup and by scripts/manage_indexes.py.
+
+Each collection lists its indexes as dicts:
+- keys: [(field, direction), ...]
+- name: index name, used to match the declaration against the server
+- unique, partial (partialFilterExpression) and ttl (expireAfterSeconds): optional
+
+QUERIES are representative shapes of the services' hot queries; ``manage_indexes.py check``
+explains each one and fails if any plan scans the collection or sorts in memory.
+"""
+
+from bson import ObjectId
+
+INDEXES = {
+    "trials": [
+        # get_trial_by_nct_id and the save_trial_data / bulk_save_trials upsert key
+        {"keys": [("nct_id", 1)], "name": "nct_id_unique", "unique": True,
+         "partial": {"nct_id": {"$exists": True}}},
+        # get_company_trials, get_trials_for_companies
+        {"keys": [("company_id", 1)], "name": "company_id"},
+    ],
+    "companies": [
+        # create_company upserts by name; companies written by the Node.js backend may have none
+        {"keys": [("name", 1)], "name": "name_unique", "unique": True,
+         "partial": {"name": {"$exists": True}}},
+        # get_current_company, CacheWarmer.rank_companies
+        {"keys": [("updated_at", -1)], "name": "updated_at_desc"},
+    ],
+    "company_trial_links": [
+        # The link upserts, and get_trial_details (any field)
+        {"keys": [("company_id", 1), ("field", 1), ("nct_id", 1)], "name": "company_field_nct_id_unique",
+         "unique": True},
+        # CompanyTrialService.linked_trials
+        {"keys": [("company_id", 1), ("field", 1), ("position", 1)], "name": "company_field_position"},
+    ],
+}
+
+# (collection, filter, sort, description)
+QUERIES = [
+    ("trials", {"nct_id": "NCT00000000"}, None, "TrialService.get_trial_by_nct_id"),
+    ("trials", {"company_id": "000000000000000000000000"}, None, "TrialService.get_company_trials"),
+    ("trials", {"company_id": {"$in": ["000000000000000000000000"]}}, None, "TrialService.get_trials_for_companies"),
+    ("companies", {"_id": ObjectId("000000000000000000000000")}, None, "CompanyService.get_company"),
+    ("companies", {"name": "Acme"}, None, "CompanyService.create_company"),
+    ("companies", {}, [("updated_at", -1)], "CompanyService.get_current_company"),
+    ("company_trial_links", {"company_id": "000000000000000000000000", "field": "trials"},
+     [("field", 1), ("position", 1)], "CompanyTrialService.linked_trials"),
+    ("company_trial_links", {"company_id": "000000000000000000000000", "nct_id": "NCT00000000"}, None,
+     "CompanyTrialService.get_trial_details"),
+]
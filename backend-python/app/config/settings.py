@@ -25,6 +25,58 @@ class Settings(BaseSettings):
     REDIS_PORT: int = 6379
     REDIS_DB: int = 0
     REDIS_PASSWORD: str = ""  # Optional, for production
+
+    # Cache
+    CACHE_DEFAULT_TTL: int = 6 * 3600  # seconds; writes invalidate their company's keys, so this can be long
+    CACHE_L1_MAX_BYTES: int = 64 * 1024 * 1024  # Per-worker in-process cache; 0 disables it
+    CACHE_L1_TTL: float = 60.0  # seconds, upper bound on L1 staleness if an invalidation is missed
+    CACHE_NAMESPACE_TTL: float = 5.0  # seconds a worker without L1 reuses a cache namespace it read
+    CACHE_INVALIDATION_CHANNEL: str = "cache:invalidate"
+    CACHE_SERIALIZER: str = "orjson"  # json, orjson or msgpack
+    CACHE_COMPRESSION: str = "zstd"  # none, zlib, zstd or lz4; falls back to zlib when not installed
+    CACHE_COMPRESS_THRESHOLD: int = 1024  # bytes; smaller payloads are stored uncompressed
+    CACHE_STALE_TTL: int = 300  # seconds an expired value may still be served while it is refreshed; 0 disables
+    CACHE_LOCK_TIMEOUT: float = 30.0  # seconds; cross-worker refresh lock
+    CACHE_LOCK_WAIT: float = 2.0  # seconds a miss waits at most for another worker's load before loading itself
+    CACHE_WARM_TOP_N: int = 100  # companies warmed after startup; 0 disables warming
+    CACHE_WARM_DELAY: float = 5.0  # seconds after startup before the first round
+    CACHE_WARM_INTERVAL: float = 0.0  # seconds between rounds; 0 warms once per start
+    CACHE_WARM_BATCH_SIZE: int = 20  # companies per MongoDB query
+    CACHE_WARM_CONCURRENCY: int = 4  # queries in flight at once
+    CACHE_NEGATIVE_TTL: int = 60  # seconds an unknown NCT ID or company id is answered without MongoDB; 0 disables
+    KNOWN_IDS_BLOOM_ENABLED: bool = False  # Per-worker Bloom filters of existing ids, rebuilt from MongoDB
+    KNOWN_IDS_REBUILD_INTERVAL: float = 600.0  # seconds; bounds how long ids inserted outside the services go unseen
+    KNOWN_IDS_ERROR_RATE: float = 0.01  # Bloom false-positive rate; false positives just fall through to MongoDB
+    SCHEMA_VALIDATION_CHUNK: int = 250  # documents validated per worker-thread task in bulk writes
+    TRIAL_BULK_BATCH_SIZE: int = 500  # upserts per unordered bulk_write in TrialService.bulk_save_trials
+    TRIAL_BULK_CONCURRENCY: int = 4  # bulk_write batches in flight at once
+    COMPANY_TRIALS_STORAGE: str = "embedded"  # embedded (arrays on companies) or normalized (trials + company_trial_links)
+    COMPANY_TRIALS_MIGRATION_BATCH: int = 20  # companies per batch in CompanyTrialService.normalize_all
+    TRIAL_ANALYTICS_ENGINE: str = "aggregation"  # aggregation ($facet in MongoDB) or python, for company analytics
+    READ_BATCH_SIZE: int = 200  # documents per cursor round trip in streamed reads (iter_company_trials, iter_companies)
+    INDEXES_APPLY_ON_STARTUP: bool = True  # Create missing indexes from config/indexes.py in the background
+    CHANGE_STREAM_ENABLED: bool = True  # Invalidate caches on writes made outside this service; needs a replica set
+    CHANGE_STREAM_BATCH_SIZE: int = 500  # changes folded into one invalidation round and resume-token checkpoint
+    
+    # ClinicalTrials.gov
+    CTGOV_BASE_URL: str = "https://clinicaltrials.gov/api/v2"
+    CTGOV_HTTP2: bool = True
+    CTGOV_MAX_CONNECTIONS: int = 20
+    CTGOV_MAX_KEEPALIVE_CONNECTIONS: int = 10
+    CTGOV_KEEPALIVE_EXPIRY: float = 30.0  # seconds
+    CTGOV_CONNECT_TIMEOUT: float = 5.0  # seconds
+    CTGOV_READ_TIMEOUT: float = 30.0  # seconds
+    CTGOV_POOL_TIMEOUT: float = 10.0  # seconds to wait for a free pooled connection
+    CTGOV_RATE_LIMIT: float = 0.8  # requests/second, ~50/min; 0 disables pacing
+    CTGOV_RATE_BURST: int = 10
+    CTGOV_RATE_LIMIT_REDIS: bool = False  # Share the rate limit across workers via Redis
+    CTGOV_MAX_RETRIES: int = 3
+    CTGOV_RETRY_BACKOFF: float = 0.5  # seconds, doubled per attempt with full jitter
+    CTGOV_RETRY_MAX_BACKOFF: float = 30.0  # seconds, also caps Retry-After
+    CTGOV_CACHE_PATH: str = ".ctgov_cache/responses.sqlite3"  # Empty disables the response cache
+    CTGOV_CACHE_VERSION_TTL: float = 300.0  # seconds between /version checks
+    CTGOV_MAX_CONCURRENCY: int = 10  # Concurrent detail requests per batch
+    CTGOV_BATCH_DETAILS: bool = True  # Collapse detail fetches into filter.ids list calls
     
     # Logging
     LOG_LEVEL: str = "INFO"
@@ -2,12 +2,20 @@ from app.system_specs.schema_manager import schema_manager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from .config.database import MongoDB
+from .config.ctgov import CTGovClient
 from .config.settings import get_settings
 from .config.logging_config import setup_logging
 from .middleware.logging import logging_middleware
-from .routes import company_routes, trial_routes, schema_routes, chat_copilot_routes, gpt_copilot_routes
+from .routes import company_routes, trial_routes, schema_routes, chat_copilot_routes, gpt_copilot_routes, cache_routes
 from .services.cache_service import CacheService# Import the new router
+from .services.change_stream_service import ChangeStreamService
+from .services.cache_warmer import CacheWarmer
+from .services.known_ids import KnownIds
+from .services.index_service import IndexService
 from .services.chat_copilot_services import refine_query, fetch_trials
+from .monitoring import metrics
+from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
+from fastapi import Response
 
 import logging
 import asyncio
@@ -50,7 +58,13 @@ async def startup_db_client():
     logger.info("Starting up FastAPI application")
     try:
         await MongoDB.connect()
+        await IndexService.start()
         await schema_manager.initialize_schemas()
+        await CTGovClient.connect()
+        await CacheService.start_invalidation_listener()
+        await ChangeStreamService.start()
+        await CacheWarmer.start()
+        await KnownIds.start()
     except Exception as e:
         logger.error(f"Failed to connect to MongoDB: {e}")
         raise
@@ -59,8 +73,14 @@ async def startup_db_client():
 async def shutdown_db_client():
     logger.info("Shutting down FastAPI application")
     try:
+        await KnownIds.stop()
+        await IndexService.stop()
+        await CacheWarmer.stop()
+        await ChangeStreamService.stop()
         await MongoDB.close()
+        await CacheService.stop_invalidation_listener()
         await cache_service.close()
+        await CTGovClient.close()
         logger.info("All connections closed")
     except Exception as e:
         logger.error(f"Error during shutdown: {e}")
@@ -70,12 +90,17 @@ async def shutdown_db_client():
 async def health_check():
     return {"status": "healthy", "version": "1.0.0"}
 
+@app.get("/metrics")
+async def prometheus_metrics():
+    return Response(generate_latest(), media_type=CONTENT_TYPE_LATEST)
+
 # Include current production routers
 app.include_router(company_routes.router, prefix=settings.API_V1_PREFIX)
 app.include_router(trial_routes.router, prefix=settings.API_V1_PREFIX)
 app.include_router(schema_routes.router, prefix=settings.API_V1_PREFIX)
 app.include_router(chat_copilot_routes.router, prefix=settings.API_V1_PREFIX)
 app.include_router(gpt_copilot_routes.router, prefix=settings.API_V1_PREFIX)
+app.include_router(cache_routes.router, prefix=settings.API_V1_PREFIX)
 
 
 # Future advanced analysis endpoints (commented out until ready for use)
@@ -66,6 +66,7 @@ class TrialAnalytics(BaseModel):
     therapeutic_areas: Dict[str, Any] = Field(..., description="Analysis of therapeutic areas")
     total_trials: int = Field(..., ge=0)
     enrollment_stats: Dict[str, Any] = Field(..., description="Enrollment statistics")
+    timeline: Dict[str, Any] = Field(default_factory=dict, description="Start years and trial durations")
 
     @validator('enrollment_stats')
     def validate_enrollment_stats(cls, v):
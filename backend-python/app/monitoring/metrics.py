@@ -1,13 +1,53 @@
-from prometheus_client import Counter, Histogram
+from prometheus_client import REGISTRY, Counter, Gauge, Histogram
+from prometheus_client.core import CounterMetricFamily
+from fastapi import Request
+from ..config.ctgov import CTGovClient
 import time
 
 request_count = Counter('http_requests_total', 'Total HTTP requests')
 request_latency = Histogram('http_request_duration_seconds', 'HTTP request latency')
 
+# ClinicalTrials.gov connection pool utilisation, sampled on scrape
+ctgov_pool_connections = Gauge('ctgov_pool_connections', 'Open connections to ClinicalTrials.gov')
+ctgov_pool_connections.set_function(lambda: CTGovClient.pool_stats()["connections"])
+ctgov_pool_active = Gauge('ctgov_pool_active_connections', 'ClinicalTrials.gov connections serving a request')
+ctgov_pool_active.set_function(lambda: CTGovClient.pool_stats()["active"])
+ctgov_pool_idle = Gauge('ctgov_pool_idle_connections', 'Idle keep-alive connections to ClinicalTrials.gov')
+ctgov_pool_idle.set_function(lambda: CTGovClient.pool_stats()["idle"])
+ctgov_pool_queued = Gauge('ctgov_pool_queued_requests', 'Requests waiting for a pooled ClinicalTrials.gov connection')
+ctgov_pool_queued.set_function(lambda: CTGovClient.pool_stats()["queued_requests"])
+
+class CTGovTransportCollector:
+    """Exposes the ClinicalTrials.gov retry, rate-limit and cache counters kept by the client transports"""
+    COUNTERS = {
+        "requests": "Request attempts sent to ClinicalTrials.gov",
+        "throttled": "Requests delayed by the ClinicalTrials.gov rate limiter",
+        "throttle_wait_seconds": "Seconds spent waiting on the ClinicalTrials.gov rate limiter",
+        "rate_limited": "429 responses from ClinicalTrials.gov",
+        "retries": "Retried ClinicalTrials.gov requests",
+        "failures": "ClinicalTrials.gov requests that failed after exhausting retries",
+    }
+
+    def collect(self):
+        stats = CTGovClient.transport_stats
+        for name, documentation in self.COUNTERS.items():
+            counter = CounterMetricFamily(f"ctgov_{name}", documentation)
+            counter.add_metric([], getattr(stats, name))
+            yield counter
+
+        cache = CTGovClient.response_cache
+        if cache is not None:
+            for name in ("hits", "misses"):
+                counter = CounterMetricFamily(f"ctgov_cache_{name}", f"ClinicalTrials.gov response cache {name}")
+                counter.add_metric([], getattr(cache, name))
+                yield counter
+
+REGISTRY.register(CTGovTransportCollector())
+
 class MetricsMiddleware:
     async def __call__(self, request: Request, call_next):
         request_count.inc()
         start_time = time.time()
         response = await call_next(request)
         request_latency.observe(time.time() - start_time)
-        return response 
\ No newline at end of file
+        return response 
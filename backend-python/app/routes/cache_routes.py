@@ -0,0 +1,9 @@
+from fastapi import APIRouter, Query
+from ..services.cache_service import CacheService
+
+router = APIRouter(prefix="/cache", tags=["cache"])
+
+@router.get("/stats")
+async def get_cache_stats(limit: int = Query(20, ge=1, le=500)):
+    """Cache statistics for the worker serving the request; each worker keeps its own."""
+    return CacheService.stats(limit)
@@ -12,6 +12,7 @@ from fastapi import APIRouter, HTTPException, Response, status
 from typing import Optional, List, Dict, Any
 from ..models.company import Company
 from ..services.company_service import CompanyService
+from .streaming import projection, stream_json
 from bson.errors import InvalidId
 from bson.objectid import ObjectId
 from ..config.database import MongoDB
@@ -25,17 +26,22 @@ logger = logging.getLogger(__name__)
 
 # List Operations - Should come first
 @router.get("/all", response_model=List[Company])
-async def get_all_companies(schema_name: str = "Enhanced"):
-    """Get all companies."""
+async def get_all_companies(schema_name: str = "Enhanced", fields: Optional[str] = None, batch_size: Optional[int] = None):
+    """
+    Get all companies, streamed as a JSON array straight from the cursor.
+
+    Each company is validated against ``schema_name`` and returned in the ``Company`` shape, as
+    ``response_model`` would; ``fields`` (comma-separated paths) returns only those fields, unvalidated.
+    """
     logger.info(f"API call to get all companies using schema: {schema_name}")
     try:
-        async with MongoDB.get_collection(CompanyService.COLLECTION) as collection:
-            companies = []
-            cursor = collection.find({})
-            async for doc in cursor:
-                doc["_id"] = str(doc["_id"])
-                companies.append(schema_manager.get_schema(schema_name)(**doc))
-            return companies
+        transform = None
+        if not fields:
+            schema = schema_manager.get_schema(schema_name)
+            transform = lambda doc: Company.model_validate(
+                schema(**doc).model_dump(by_alias=True)
+            ).model_dump(mode="json", by_alias=True)
+        return await stream_json(CompanyService.iter_companies(projection(fields), batch_size), transform=transform)
     except Exception as e:
         logger.error(f"Error retrieving all companies: {str(e)}")
         raise HTTPException(
@@ -88,7 +88,7 @@ async def process_gpt_query(request: QueryRequest):
         logger.info(f"Refined Query: {refined_query}")
 
         # Step 3: Fetch clinical trial data
-        trial_results = trials_service.fetch_trials(refined_query, filters)
+        trial_results = await trials_service.fetch_trials(refined_query, filters)
         
         if not trial_results:
             trial_results = [{"message": "No trials found for the given query."}]
@@ -0,0 +1,66 @@
+"""
+Streaming JSON responses for the read APIs.
+
+Documents from an async generator (TrialService.iter_company_trials, CompanyService.iter_companies) are
+written to the client as they come off the cursor, so a response never holds the whole result in memory.
+"""
+
+from typing import Any, AsyncIterator, Callable, Dict, Optional
+import json
+import logging
+from bson import ObjectId
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import StreamingResponse
+
+logger = logging.getLogger(__name__)
+
+
+def projection(fields: Optional[str]) -> Optional[Dict[str, int]]:
+    """A find() projection from a ``?fields=name,protocolSection.statusModule`` query value; None reads whole documents."""
+    if not fields:
+        return None
+    return {field.strip(): 1 for field in fields.split(",") if field.strip()}
+
+
+def _encode(document: Any) -> bytes:
+    return json.dumps(jsonable_encoder(document, custom_encoder={ObjectId: str})).encode()
+
+
+async def stream_json(
+    documents: AsyncIterator[Any],
+    prefix: str = "[",
+    suffix: str = "]",
+    transform: Optional[Callable[[Any], Any]] = None
+) -> StreamingResponse:
+    """
+    A JSON array response written one document at a time, between ``prefix`` and ``suffix``
+    (e.g. ``{"data": [`` and ``]}`` to keep an envelope).
+
+    The first document is read and transformed before the response starts, so connection, query
+    and validation errors on it still surface as an HTTP error. Once the status has been sent a
+    failure can no longer change it: the array is closed with a final ``{"error": ...}`` element
+    instead of being cut off.
+    """
+    transform = transform or (lambda document: document)
+    try:
+        first = await anext(documents, None)
+        encoded = _encode(transform(first)) if first is not None else None
+    except Exception:
+        await documents.aclose()
+        raise
+
+    async def body():
+        yield prefix.encode()
+        if encoded is not None:
+            yield encoded
+            try:
+                async for document in documents:
+                    yield b"," + _encode(transform(document))
+            except Exception as e:
+                logger.error(f"Streamed response failed after it started: {str(e)}")
+                yield b"," + _encode({"error": str(e)})
+            finally:
+                await documents.aclose()
+        yield suffix.encode()
+
+    return StreamingResponse(body(), media_type="application/json")
@@ -8,6 +8,7 @@ from ..config.database import MongoDB
 from bson import ObjectId
 from ..services.background_service import BackgroundService
 from ..services.cache_service import CacheService
+from .streaming import projection, stream_json
 import logging
 
 # Current production endpoints
@@ -106,32 +107,31 @@ async def analyze_trials_background(
         )
 
 @router.get("/{company_id}/trials")
-async def get_company_trials(company_id: str):
-    """Get all trials for a company with caching and schema validation."""
+async def get_company_trials(
+    company_id: str,
+    stream: bool = False,
+    fields: Optional[str] = None,
+    batch_size: Optional[int] = None
+):
+    """
+    Get all trials for a company with caching and schema validation.
+
+    With ``stream`` or ``fields`` (comma-separated paths) the same ``{"data": [...]}`` body is streamed
+    from the cursor instead, bypassing the cache, so large portfolios are never held in memory.
+    """
     try:
-        # Try cache first
-        cached_trials = await cache_service.get_trials(company_id)
-        if cached_trials:
-            return {"data": cached_trials, "cached": True}
+        if stream or fields:
+            trials = TrialService.iter_company_trials(company_id, projection(fields), batch_size)
+            return await stream_json(trials, prefix='{"data": [', suffix="]}")
 
-        # Get current context
-        context = await SchemaService.get_collection_context(TrialService.COLLECTION)
-        
-        # Get from database
-        trials = await TrialService.get_company_trials(company_id)
-        
-        # Validate trials against schema
-        for trial in trials:
-            if not await SchemaService.validate_document(TrialService.COLLECTION, trial, context):
-                trial = await SchemaService.migrate_document(
-                    collection_name=TrialService.COLLECTION,
-                    document=trial,
-                    from_context=SchemaContext.LEGACY,
-                    to_context=context
-                )
-        
-        # Cache the results
-        await cache_service.set_trials(company_id, trials)
+        async def load_trials():
+            # Validated and migrated as they are read
+            return await TrialService.get_company_trials(company_id)
+
+        # Concurrent misses share one load; an expired entry is served while it refreshes
+        trials, cached = await cache_service.get_or_load_trials(company_id, load_trials)
+        if cached:
+            return {"data": trials, "cached": True}
         
         return {"data": trials}
     except ValueError as e:
@@ -143,6 +143,22 @@ async def get_company_trials(company_id: str):
             detail=str(e)
         )
 
+@router.get("/{company_id}/trials/analytics")
+async def get_company_trial_analytics(company_id: str):
+    """Analytics of a company's trials, computed from the trials collection and cached."""
+    try:
+        async def load_analytics():
+            return (await TrialAnalysisService.analyze_company(company_id)).model_dump()
+
+        analytics, _ = await cache_service.get_or_load_trial_analytics(company_id, load_analytics)
+        return {"data": analytics}
+    except Exception as e:
+        logger.error(f"Error in get_company_trial_analytics: {str(e)}", exc_info=True)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=str(e)
+        )
+
 @router.post("/{company_id}/trials")
 async def save_company_trials(
     company_id: str,
@@ -179,6 +195,22 @@ async def save_company_trials(
             detail=str(e)
         )
 
+@router.post("/{company_id}/trials/bulk")
+async def bulk_save_trials(
+    company_id: str,
+    trials: List[Dict[str, Any]]
+):
+    """Upsert a large trial portfolio; invalid or failed trials are listed in errors instead of failing the call."""
+    try:
+        result = await TrialService.bulk_save_trials(company_id, trials)
+        return {"data": result}
+    except Exception as e:
+        logger.error(f"Error in bulk_save_trials: {str(e)}", exc_info=True)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=str(e)
+        )
+
 @router.get("/{nct_id}")
 async def get_trial(nct_id: str):
     """Get trial by NCT ID with schema validation."""
@@ -0,0 +1,136 @@
+from typing import Any, Callable, Dict, Tuple
+import json
+import logging
+import zlib
+
+logger = logging.getLogger(__name__)
+
+# Optional speedups; each falls back to the standard library when missing
+try:
+    import orjson
+except ImportError:  # pragma: no cover - depends on the environment
+    orjson = None
+try:
+    import msgpack
+except ImportError:  # pragma: no cover
+    msgpack = None
+try:
+    import zstandard
+except ImportError:  # pragma: no cover
+    zstandard = None
+try:
+    import lz4.frame as lz4_frame
+except ImportError:  # pragma: no cover
+    lz4_frame = None
+
+# Header byte: 000SSCCC. Serializer in bits 3-4, compression in bits 0-2, the top three bits are the format
+# version (0). Keeping the header below 0x20 means it can never be the first byte of a JSON document, so values
+# written before the codec existed are still read as plain JSON.
+SERIALIZERS = {"json": 0, "orjson": 1, "msgpack": 2}
+COMPRESSIONS = {"none": 0, "zlib": 1, "zstd": 2, "lz4": 3}
+_HEADER_LIMIT = 0x20
+
+
+def _json_dumps(value: Any) -> bytes:
+    return json.dumps(value, default=str).encode()
+
+
+def _orjson_dumps(value: Any) -> bytes:
+    return orjson.dumps(value, default=str, option=orjson.OPT_NON_STR_KEYS)
+
+
+def _msgpack_dumps(value: Any) -> bytes:
+    return msgpack.packb(value, default=str, use_bin_type=True)
+
+
+def _msgpack_loads(data: bytes) -> Any:
+    return msgpack.unpackb(data, raw=False, strict_map_key=False)
+
+
+def _serializers() -> Dict[int, Tuple[Callable[[Any], bytes], Callable[[bytes], Any]]]:
+    available = {SERIALIZERS["json"]: (_json_dumps, json.loads)}
+    if orjson is not None:
+        available[SERIALIZERS["orjson"]] = (_orjson_dumps, orjson.loads)
+    if msgpack is not None:
+        available[SERIALIZERS["msgpack"]] = (_msgpack_dumps, _msgpack_loads)
+    return available
+
+
+def _identity(data: bytes) -> bytes:
+    return data
+
+
+def _compressions(level: int) -> Dict[int, Tuple[Callable[[bytes], bytes], Callable[[bytes], bytes]]]:
+    available = {
+        COMPRESSIONS["none"]: (_identity, _identity),
+        COMPRESSIONS["zlib"]: (lambda data: zlib.compress(data, level), zlib.decompress),
+    }
+    if zstandard is not None:
+        compressor = zstandard.ZstdCompressor(level=level)
+        decompressor = zstandard.ZstdDecompressor()
+        available[COMPRESSIONS["zstd"]] = (compressor.compress, decompressor.decompress)
+    if lz4_frame is not None:
+        available[COMPRESSIONS["lz4"]] = (lz4_frame.compress, lz4_frame.decompress)
+    return available
+
+
+class CacheCodec:
+    """
+    Serializes cache values to bytes prefixed with a codec header byte.
+
+    Payloads of at least ``compress_threshold`` bytes are compressed. The
+    header records how each value was written, so values can always be
+    read back after the configured serializer or compression changes.
+    Unavailable choices fall back to orjson/json and zlib.
+    """
+    def __init__(
+        self,
+        serializer: str = "orjson",
+        compression: str = "zstd",
+        compress_threshold: int = 1024,
+        level: int = 3
+    ):
+        self._serializers = _serializers()
+        self._compressions = _compressions(level)
+        self.serializer = self._pick(serializer, SERIALIZERS, self._serializers, ["orjson", "json"])
+        self.compression = self._pick(compression, COMPRESSIONS, self._compressions, ["zlib"])
+        self.compress_threshold = compress_threshold
+
+    @staticmethod
+    def _pick(name: str, ids: Dict[str, int], available: Dict[int, Any], fallbacks: list) -> int:
+        if name not in ids:
+            raise ValueError(f"Unknown cache codec option: {name}")
+        for candidate in [name, *fallbacks]:
+            if ids[candidate] in available:
+                if candidate != name:
+                    logger.warning(f"Cache codec {name} is not installed, using {candidate}")
+                return ids[candidate]
+        raise ValueError(f"No cache codec available for {name}")
+
+    def dumps(self, value: Any) -> Tuple[bytes, int]:
+        """Encode ``value``; returns the stored bytes and the uncompressed payload size."""
+        payload = self._serializers[self.serializer][0](value)
+        compression = COMPRESSIONS["none"]
+        if self.compression != compression and len(payload) >= self.compress_threshold:
+            compression = self.compression
+        header = (self.serializer << 3) | compression
+        return bytes([header]) + self._compressions[compression][0](payload), len(payload)
+
+    def loads(self, data: bytes) -> Tuple[Any, int]:
+        """Decode stored bytes; returns the value and the uncompressed payload size."""
+        if isinstance(data, str):
+            data = data.encode()
+        if not data or data[0] >= _HEADER_LIMIT:
+            # Written before the codec header existed
+            return json.loads(data), len(data)
+        serializer, compression = data[0] >> 3, data[0] & 0b111
+        if serializer not in self._serializers or compression not in self._compressions:
+            raise ValueError(f"Cached value uses an unavailable codec (header {data[0]:#04x})")
+        payload = self._compressions[compression][1](data[1:])
+        return self._serializers[serializer][1](payload), len(payload)
+
+    def encode(self, value: Any) -> bytes:
+        return self.dumps(value)[0]
+
+    def decode(self, data: bytes) -> Any:
+        return self.loads(data)[0]
@@ -1,73 +1,629 @@
-from typing import Optional, Any, List, Dict
-import json
+from typing import Optional, Any, List, Dict, Awaitable, Callable, Iterable, Sequence, Tuple
+import asyncio
+import logging
+import time
+import uuid
 from datetime import datetime, timedelta
 from redis.asyncio import Redis
+from redis.exceptions import LockError, RedisError
 from ..config.settings import get_settings
+from .cache_codec import CacheCodec
+from .known_ids import KnownIds
+from .cache_stats import (
+    CacheKeyStats,
+    cache_codec_seconds,
+    cache_l1_bytes,
+    cache_l1_entries,
+    cache_payload_bytes,
+    cache_redis_seconds,
+    cache_requests,
+    key_family
+)
+from .local_cache import LocalCache
+from .single_flight import SingleFlight
 
 settings = get_settings()
+logger = logging.getLogger(__name__)
 
 class CacheService:
+    """
+    Two-tier cache: a per-process LocalCache (L1) in front of Redis (L2).
+
+    Values are stored in Redis as CacheCodec bytes. The L1 tier is shared
+    by every CacheService in the worker and is only consulted while the
+    invalidation listener is subscribed; writes and deletes publish the key
+    on CACHE_INVALIDATION_CHANNEL so every other worker drops its copy.
+
+    Redis keys outlive their TTL by CACHE_STALE_TTL. ``get_or_load`` serves
+    such stale values immediately while a single task refreshes them, and
+    coalesces concurrent misses: one load per key per worker (SingleFlight)
+    and one per key across workers (a short Redis lock).
+
+    Per-company keys are ``<family>:<namespace>:<company_id>``. The namespace
+    of the collection a family is read from records its schema context,
+    schema version and a generation; ``bump_namespace`` switches it in O(1)
+    when the context changes, leaving old-shape values to expire unread.
+
+    Keys are grouped under tags (``company:<id>`` covers every value derived
+    from that company). Write paths call ``invalidate_company`` after they
+    commit, so TTLs only bound how long an unexpected change goes unseen.
+
+    Lookups of ids that do not exist are remembered for CACHE_NEGATIVE_TTL
+    under ``missing:<kind>:<id>`` (and ruled out up front by KnownIds when
+    its Bloom filters are enabled); ``clear_missing`` undoes both when the
+    id is created.
+    """
+    # Key prefixes for the per-company values, as used by the batch methods
+    TRIALS = "company_trials"
+    TRIAL_ANALYTICS = "trial_analytics"
+    ANALYSIS = "analysis"
+    # Collection whose schema context shapes each family's values
+    FAMILY_COLLECTIONS = {TRIALS: "trials", TRIAL_ANALYTICS: "companies", ANALYSIS: "companies"}
+    DEFAULT_NAMESPACE = "0"
+
+    # One L1 per process, kept coherent by the invalidation listener
+    local = LocalCache(settings.CACHE_L1_MAX_BYTES, settings.CACHE_L1_TTL)
+    codec = CacheCodec(
+        settings.CACHE_SERIALIZER,
+        settings.CACHE_COMPRESSION,
+        settings.CACHE_COMPRESS_THRESHOLD
+    )
+    flights = SingleFlight()
+    key_stats = CacheKeyStats()
+    instance_id = uuid.uuid4().hex
+    _listener: Optional[asyncio.Task] = None
+    _l1_active = False
+    # Namespaces memoized for up to CACHE_L1_TTL while the listener keeps them coherent, like L1,
+    # and for CACHE_NAMESPACE_TTL without it
+    _namespaces: Dict[str, Tuple[str, float]] = {}
+    # Per-collection count of namespace changes seen, so a read that overlaps one is not memoized
+    _namespace_changes: Dict[str, int] = {}
+    # Recent load time per key family, which bounds how long a miss waits on another worker's load
+    _load_seconds: Dict[str, float] = {}
+    LOCK_WAIT_LOADS = 3
+
     def __init__(self):
+        # Raw bytes: values carry a binary codec header
         self.redis = Redis(
+            host=settings.REDIS_HOST,
+            port=settings.REDIS_PORT,
+            db=settings.REDIS_DB,
+            password=settings.REDIS_PASSWORD if settings.REDIS_PASSWORD else None,
+            decode_responses=False
+        )
+        self.default_ttl = settings.CACHE_DEFAULT_TTL
+
+    @classmethod
+    async def start_invalidation_listener(cls):
+        """Subscribe to invalidation messages; enables the L1 tier while subscribed."""
+        if cls._listener is None and settings.CACHE_L1_MAX_BYTES > 0:
+            cls._listener = asyncio.create_task(cls._listen())
+
+    @classmethod
+    async def stop_invalidation_listener(cls):
+        if cls._listener is not None:
+            cls._listener.cancel()
+            try:
+                await cls._listener
+            except asyncio.CancelledError:
+                pass
+            cls._listener = None
+
+    @classmethod
+    async def _listen(cls):
+        redis = Redis(
             host=settings.REDIS_HOST,
             port=settings.REDIS_PORT,
             db=settings.REDIS_DB,
             password=settings.REDIS_PASSWORD if settings.REDIS_PASSWORD else None,
             decode_responses=True
         )
-        self.default_ttl = 3600  # 1 hour
+        try:
+            while True:
+                pubsub = redis.pubsub()
+                try:
+                    await pubsub.subscribe(settings.CACHE_INVALIDATION_CHANNEL)
+                    cls._l1_active = True
+                    logger.info("Cache invalidation listener subscribed")
+                    async for message in pubsub.listen():
+                        if message["type"] == "message":
+                            cls._handle_invalidation(message["data"])
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    logger.warning(f"Cache invalidation listener disconnected: {str(e)}")
+                    await asyncio.sleep(1)
+                finally:
+                    # Missed messages can't be replayed, so start over with an empty L1
+                    cls._l1_active = False
+                    cls.local.clear()
+                    cls._namespaces.clear()
+                    await pubsub.aclose()
+        finally:
+            await redis.aclose()
+
+    @classmethod
+    def _handle_invalidation(cls, data: str):
+        sender, _, key = data.partition(" ")
+        if sender != cls.instance_id:
+            if key.startswith("ns:"):
+                cls._forget_namespace(key[len("ns:"):])
+            else:
+                cls.local.delete(key)
+                if key.startswith("missing:"):
+                    # The id now exists
+                    _, kind, item_id = key.split(":", 2)
+                    KnownIds.add(kind, item_id)
+
+    async def _lookup(self, key: str) -> Tuple[Optional[Any], bool]:
+        """Return the cached value and whether it is still fresh."""
+        if CacheService._l1_active:
+            value = CacheService.local.get(key)
+            if value is not None:
+                self._record(key, "l1", "hit")
+                return value, True
+        started = time.perf_counter()
+        async with self.redis.pipeline(transaction=False) as pipe:
+            data, pttl = await pipe.get(key).pttl(key).execute()
+        cache_redis_seconds.labels("get").observe(time.perf_counter() - started)
+        return self._decode(key, data, pttl)
+
+    @staticmethod
+    def _record(key: str, tier: str, result: str, size: int = 0):
+        cache_requests.labels(key_family(key), tier, result).inc()
+        CacheService.key_stats.record(key, result != "miss", size)
+
+    def _decode(self, key: str, data: Optional[bytes], pttl: int) -> Tuple[Optional[Any], bool]:
+        if not data:
+            self._record(key, "redis", "miss")
+            return None, False
+        family = key_family(key)
+        started = time.perf_counter()
+        value, size = CacheService.codec.loads(data)
+        cache_codec_seconds.labels(family, "decode").observe(time.perf_counter() - started)
+        cache_payload_bytes.labels(family, "read").observe(size)
+        # Keys without an expiry (pttl -1) never go stale
+        fresh_for = (pttl / 1000 - settings.CACHE_STALE_TTL) if pttl >= 0 else settings.CACHE_L1_TTL
+        if fresh_for <= 0:
+            self._record(key, "redis", "stale", size)
+            return value, False
+        self._record(key, "redis", "hit", size)
+        if CacheService._l1_active:
+            CacheService.local.set(key, value, size, min(fresh_for, settings.CACHE_L1_TTL))
+        return value, True
+
+    async def _get_values(self, keys: Sequence[str]) -> Dict[str, Any]:
+        """Read the fresh values among ``keys``: L1 first, the rest in one round trip."""
+        values = {}
+        remote = []
+        for key in keys:
+            value = CacheService.local.get(key) if CacheService._l1_active else None
+            if value is not None:
+                self._record(key, "l1", "hit")
+                values[key] = value
+            else:
+                remote.append(key)
+        if remote:
+            started = time.perf_counter()
+            async with self.redis.pipeline(transaction=False) as pipe:
+                pipe.mget(remote)
+                for key in remote:
+                    pipe.pttl(key)
+                data, *pttls = await pipe.execute()
+            cache_redis_seconds.labels("mget").observe(time.perf_counter() - started)
+            for key, item, pttl in zip(remote, data, pttls):
+                value, fresh = self._decode(key, item, pttl)
+                if fresh:
+                    values[key] = value
+        return values
+
+    async def _get_value(self, key: str) -> Optional[Any]:
+        """Read a fresh cached value, from L1 when possible."""
+        value, fresh = await self._lookup(key)
+        return value if fresh else None
+
+    async def _set_value(self, key: str, value: Any, ttl: int, tags: Iterable[str] = ()):
+        await self._set_values([(key, value, tags)], ttl)
+
+    async def _set_values(self, entries: Sequence[Tuple[str, Any, Iterable[str]]], ttl: int):
+        """Write ``(key, value, tags)`` entries in one pipelined round trip."""
+        sizes = []
+        async with self.redis.pipeline(transaction=False) as pipe:
+            for key, value, tags in entries:
+                family = key_family(key)
+                started = time.perf_counter()
+                data, size = CacheService.codec.dumps(value)
+                cache_codec_seconds.labels(family, "encode").observe(time.perf_counter() - started)
+                cache_payload_bytes.labels(family, "write").observe(size)
+                CacheService.key_stats.record_size(key, size)
+                sizes.append(size)
+                # Kept past its TTL so get_or_load can serve it while refreshing
+                pipe.setex(key, ttl + settings.CACHE_STALE_TTL, data)
+                for tag in tags:
+                    # One small set per tag; members left behind by expired keys are harmless
+                    pipe.sadd(f"tag:{tag}", key)
+                pipe.publish(settings.CACHE_INVALIDATION_CHANNEL, f"{CacheService.instance_id} {key}")
+            started = time.perf_counter()
+            await pipe.execute()
+            cache_redis_seconds.labels("set").observe(time.perf_counter() - started)
+        if CacheService._l1_active:
+            for (key, value, _), size in zip(entries, sizes):
+                CacheService.local.set(key, value, size, min(ttl, settings.CACHE_L1_TTL))
+
+    async def get_or_load(
+        self,
+        key: str,
+        loader: Callable[[], Awaitable[Any]],
+        ttl: Optional[int] = None,
+        tags: Iterable[str] = ()
+    ) -> Tuple[Any, bool]:
+        """
+        Return the value for ``key`` and whether it was served from the cache,
+        calling ``loader`` to fill it.
+
+        A stale value is returned as-is while one background task refreshes
+        it. On a miss, concurrent callers share a single ``loader`` call, and
+        all of them get ``False``: the value was loaded for them, here or by
+        another worker holding the load lock. A ``None`` result is returned
+        but not cached.
+        """
+        tags = tuple(tags)
+        value, fresh = await self._lookup(key)
+        if value is not None:
+            if not fresh and key not in CacheService.flights:
+                refresh = CacheService.flights.start(key, lambda: self._load(key, loader, ttl, tags))
+                refresh.add_done_callback(self._log_refresh_failure)
+            return value, True
+        return await CacheService.flights.do(key, lambda: self._load(key, loader, ttl, tags)), False
+
+    async def _load(
+        self,
+        key: str,
+        loader: Callable[[], Awaitable[Any]],
+        ttl: Optional[int],
+        tags: Tuple[str, ...]
+    ) -> Any:
+        lock = self.redis.lock(f"lock:{key}", timeout=settings.CACHE_LOCK_TIMEOUT)
+        if not await lock.acquire(blocking=False):
+            # Another worker is loading this key; use its result if it arrives soon, else load it here too
+            value = await self._wait_for_fresh(key)
+            if value is not None:
+                return value
+            lock = None
+        try:
+            versions = await self.tag_versions(tags)
+            started = time.perf_counter()
+            value = await loader()
+            self._record_load_time(key, time.perf_counter() - started)
+            if value is not None:
+                if await self.tag_versions(tags) != versions:
+                    # A write invalidated the tag mid-load; this value may predate it
+                    return value
+                await self._set_value(key, value, ttl or self.default_ttl, tags)
+            return value
+        finally:
+            if lock is not None:
+                try:
+                    await lock.release()
+                except LockError:
+                    # Expired while loading; another worker may already hold it
+                    pass
+
+    @classmethod
+    def _record_load_time(cls, key: str, seconds: float):
+        family = key_family(key)
+        previous = cls._load_seconds.get(family)
+        cls._load_seconds[family] = seconds if previous is None else 0.8 * previous + 0.2 * seconds
+
+    @classmethod
+    def _lock_wait(cls, key: str, interval: float) -> float:
+        """How long to wait for another worker's load: a few typical loads, at most CACHE_LOCK_WAIT."""
+        typical = cls._load_seconds.get(key_family(key))
+        if typical is None:
+            return settings.CACHE_LOCK_WAIT
+        return min(settings.CACHE_LOCK_WAIT, max(cls.LOCK_WAIT_LOADS * typical, 2 * interval))
+
+    async def _wait_for_fresh(self, key: str, interval: float = 0.05) -> Optional[Any]:
+        deadline = asyncio.get_running_loop().time() + self._lock_wait(key, interval)
+        while asyncio.get_running_loop().time() < deadline:
+            await asyncio.sleep(interval)
+            value = await self._get_value(key)
+            if value is not None:
+                return value
+        return None
+
+    @staticmethod
+    def _log_refresh_failure(task: asyncio.Future):
+        if not task.cancelled() and task.exception() is not None:
+            logger.warning(f"Background cache refresh failed: {str(task.exception())}")
+
+    async def tag_versions(self, tags: Sequence[str]) -> List[Optional[bytes]]:
+        """Invalidation counters of ``tags``; compare before and after a load to detect a racing write."""
+        if not tags:
+            return []
+        return await self.redis.mget([f"tagver:{tag}" for tag in tags])
+
+    async def invalidate_tags(self, *tags: str):
+        """
+        Delete every key cached under ``tags``, in Redis and in every worker's L1.
+
+        The tag versions are bumped before the members are read, so a load that
+        started earlier does not cache its result. Only the members read here
+        are removed from the tag sets: a key tagged after the read stays in its
+        set and is found by the next invalidation.
+        """
+        started = time.perf_counter()
+        async with self.redis.pipeline(transaction=False) as pipe:
+            for tag in tags:
+                pipe.incr(f"tagver:{tag}")
+                pipe.smembers(f"tag:{tag}")
+            results = await pipe.execute()
+        members = dict(zip(tags, results[1::2]))
+        keys = {member.decode() for tag_members in members.values() for member in tag_members}
+        async with self.redis.pipeline(transaction=False) as pipe:
+            if keys:
+                pipe.delete(*keys)
+            for tag, tag_members in members.items():
+                if tag_members:
+                    pipe.srem(f"tag:{tag}", *tag_members)
+            for key in keys:
+                pipe.publish(settings.CACHE_INVALIDATION_CHANNEL, f"{CacheService.instance_id} {key}")
+            await pipe.execute()
+        cache_redis_seconds.labels("invalidate").observe(time.perf_counter() - started)
+        for key in keys:
+            CacheService.local.delete(key)
+
+    @staticmethod
+    def company_tag(company_id: str) -> str:
+        return f"company:{company_id}"
+
+    async def company_tags(self) -> List[str]:
+        """Every company tag that currently has keys cached under it."""
+        return [key.decode()[len("tag:"):] async for key in self.redis.scan_iter(match="tag:company:*")]
+
+    async def invalidate_company(self, company_id: str):
+        """
+        Drop everything cached for a company after one of its writes.
+
+        Redis errors are logged rather than raised: the write has already
+        been committed and should not be reported as failed.
+        """
+        try:
+            await self.invalidate_tags(self.company_tag(company_id))
+        except RedisError as e:
+            logger.error(f"Cache invalidation failed for company {company_id}: {str(e)}")
+
+    async def _delete(self, key: str):
+        await self.redis.delete(key)
+        CacheService.local.delete(key)
+        await self._publish_invalidation(key)
+
+    async def _publish_invalidation(self, key: str):
+        await self.redis.publish(settings.CACHE_INVALIDATION_CHANNEL, f"{CacheService.instance_id} {key}")
+
+    async def is_missing(self, kind: str, item_id: str) -> bool:
+        """
+        Whether ``item_id`` is known not to exist, so its lookup can skip MongoDB.
+
+        ``kind`` is ``trial`` (NCT IDs) or ``company``. Redis errors count as
+        "not known missing" so the caller falls through to the database.
+        """
+        key = f"missing:{kind}:{item_id}"
+        if not KnownIds.might_exist(kind, item_id):
+            self._record(key, "bloom", "hit")
+            return True
+        if CacheService._l1_active and CacheService.local.get(key) is not None:
+            self._record(key, "l1", "hit")
+            return True
+        try:
+            missing = bool(await self.redis.exists(key))
+        except RedisError as e:
+            logger.warning(f"Negative cache lookup failed for {key}: {str(e)}")
+            return False
+        self._record(key, "redis", "hit" if missing else "miss")
+        if missing and CacheService._l1_active:
+            CacheService.local.set(key, True, 1, settings.CACHE_NEGATIVE_TTL)
+        return missing
+
+    async def set_missing(self, kind: str, item_id: str):
+        """Remember for CACHE_NEGATIVE_TTL that a lookup of ``item_id`` found nothing."""
+        if settings.CACHE_NEGATIVE_TTL <= 0:
+            return
+        key = f"missing:{kind}:{item_id}"
+        try:
+            await self.redis.setex(key, settings.CACHE_NEGATIVE_TTL, b"1")
+        except RedisError as e:
+            logger.warning(f"Negative cache write failed for {key}: {str(e)}")
+            return
+        if CacheService._l1_active:
+            CacheService.local.set(key, True, 1, settings.CACHE_NEGATIVE_TTL)
+
+    async def clear_missing(self, kind: str, *item_ids: str):
+        """
+        Record that ``item_ids`` now exist, in Redis and in every worker's L1 and KnownIds.
+
+        Called after the write commits; like ``invalidate_company``, Redis
+        errors are logged rather than raised.
+        """
+        if not item_ids:
+            return
+        keys = [f"missing:{kind}:{item_id}" for item_id in item_ids]
+        for item_id, key in zip(item_ids, keys):
+            KnownIds.add(kind, item_id)
+            CacheService.local.delete(key)
+        try:
+            async with self.redis.pipeline(transaction=False) as pipe:
+                pipe.delete(*keys)
+                for key in keys:
+                    pipe.publish(settings.CACHE_INVALIDATION_CHANNEL, f"{CacheService.instance_id} {key}")
+                await pipe.execute()
+        except RedisError as e:
+            logger.error(f"Negative cache clear failed for {len(keys)} {kind} ids: {str(e)}")
+
+    @classmethod
+    def _forget_namespace(cls, collection: str):
+        cls._namespaces.pop(collection, None)
+        cls._namespace_changes[collection] = cls._namespace_changes.get(collection, 0) + 1
+
+    async def namespace(self, collection: str) -> str:
+        """
+        The current cache namespace of ``collection``.
+
+        Without the invalidation listener another worker's bump goes unseen,
+        so the namespace read is only reused for CACHE_NAMESPACE_TTL.
+        """
+        namespace, expires_at = CacheService._namespaces.get(collection, (None, 0.0))
+        if namespace is not None and time.monotonic() < expires_at:
+            return namespace
+        changes = CacheService._namespace_changes.get(collection, 0)
+        value = await self.redis.get(f"ns:{collection}")
+        namespace = value.decode() if value else self.DEFAULT_NAMESPACE
+        # A change announced while the GET was in flight may postdate the value read
+        if CacheService._namespace_changes.get(collection, 0) == changes:
+            ttl = settings.CACHE_L1_TTL if CacheService._l1_active else settings.CACHE_NAMESPACE_TTL
+            CacheService._namespaces[collection] = (namespace, time.monotonic() + ttl)
+        return namespace
+
+    async def bump_namespace(self, collection: str, context: str, schema_version: str) -> str:
+        """
+        Move ``collection`` to a new namespace after a schema context change.
+
+        Every key derived from the collection changes at once, in every
+        worker, without scanning or deleting anything; values written in the
+        old shape are simply never read again and expire on their TTL.
+        """
+        generation = await self.redis.incr(f"nsgen:{collection}")
+        namespace = f"{context}.{schema_version}.{generation}"
+        async with self.redis.pipeline(transaction=False) as pipe:
+            pipe.set(f"ns:{collection}", namespace)
+            pipe.publish(settings.CACHE_INVALIDATION_CHANNEL, f"{CacheService.instance_id} ns:{collection}")
+            await pipe.execute()
+        CacheService._forget_namespace(collection)
+        logger.info(f"Cache namespace for {collection} is now {namespace}")
+        return namespace
+
+    async def key(self, family: str, company_id: str) -> str:
+        """The Redis key of ``family``'s value for a company, in the current namespace."""
+        return f"{family}:{await self.namespace(self.FAMILY_COLLECTIONS[family])}:{company_id}"
 
     async def get_trial_analytics(self, company_id: str) -> Optional[dict]:
         """Get cached trial analytics."""
-        key = f"trial_analytics:{company_id}"
-        data = await self.redis.get(key)
-        return json.loads(data) if data else None
+        return await self._get_value(await self.key(self.TRIAL_ANALYTICS, company_id))
 
     async def set_trial_analytics(self, company_id: str, analytics: dict, ttl: int = None):
         """Cache trial analytics."""
-        key = f"trial_analytics:{company_id}"
-        await self.redis.setex(
-            key,
-            ttl or self.default_ttl,
-            json.dumps(analytics)
-        )
+        key = await self.key(self.TRIAL_ANALYTICS, company_id)
+        await self._set_value(key, analytics, ttl or self.default_ttl, [self.company_tag(company_id)])
+
+    async def get_or_load_trial_analytics(
+        self,
+        company_id: str,
+        loader: Callable[[], Awaitable[Optional[dict]]],
+        ttl: Optional[int] = None
+    ) -> Tuple[Optional[dict], bool]:
+        """Get trial analytics and whether they were cached, computing them with ``loader`` when not."""
+        key = await self.key(self.TRIAL_ANALYTICS, company_id)
+        return await self.get_or_load(key, loader, ttl, [self.company_tag(company_id)])
 
     async def get_trials(self, company_id: str) -> Optional[List[Dict[str, Any]]]:
         """Get cached trials for company."""
-        key = f"company_trials:{company_id}"
-        data = await self.redis.get(key)
-        return json.loads(data) if data else None
+        return await self._get_value(await self.key(self.TRIALS, company_id))
 
     async def set_trials(self, company_id: str, trials: List[Dict[str, Any]]):
         """Cache trials for company."""
-        key = f"company_trials:{company_id}"
-        await self.redis.setex(key, self.default_ttl, json.dumps(trials))
+        key = await self.key(self.TRIALS, company_id)
+        await self._set_value(key, trials, self.default_ttl, [self.company_tag(company_id)])
+
+    async def get_or_load_trials(
+        self,
+        company_id: str,
+        loader: Callable[[], Awaitable[Optional[List[Dict[str, Any]]]]]
+    ) -> Tuple[Optional[List[Dict[str, Any]]], bool]:
+        """Get trials for company and whether they were cached, loading them with ``loader`` when not."""
+        key = await self.key(self.TRIALS, company_id)
+        return await self.get_or_load(key, loader, tags=[self.company_tag(company_id)])
 
     async def get_analysis(self, company_id: str) -> Optional[Dict[str, Any]]:
         """Get cached analysis data."""
-        key = f"analysis:{company_id}"
-        data = await self.redis.get(key)
-        return json.loads(data) if data else None
+        return await self._get_value(await self.key(self.ANALYSIS, company_id))
 
     async def set_analysis(
-        self, 
-        company_id: str, 
+        self,
+        company_id: str,
         analysis_data: Dict[str, Any],
         ttl: Optional[int] = None
     ):
         """Cache analysis data with TTL."""
-        key = f"analysis:{company_id}"
-        await self.redis.setex(
-            key,
-            ttl or self.default_ttl,
-            json.dumps(analysis_data)
-        )
+        key = await self.key(self.ANALYSIS, company_id)
+        await self._set_value(key, analysis_data, ttl or self.default_ttl, [self.company_tag(company_id)])
+
+    async def get_many(self, prefix: str, company_ids: Sequence[str]) -> Tuple[Dict[str, Any], List[str]]:
+        """
+        Read ``<prefix>:<namespace>:<company_id>`` for many companies in one round trip.
+
+        Returns the hits keyed by company id and the ids that missed, in
+        input order, so callers can load the misses in a single query and
+        write them back with ``set_many``.
+        """
+        namespace = await self.namespace(self.FAMILY_COLLECTIONS[prefix])
+        keys = {company_id: f"{prefix}:{namespace}:{company_id}" for company_id in company_ids}
+        values = await self._get_values(list(keys.values()))
+        hits, misses = {}, []
+        for company_id in company_ids:
+            value = values.get(keys[company_id])
+            if value is None:
+                misses.append(company_id)
+            else:
+                hits[company_id] = value
+        return hits, misses
+
+    async def get_many_trials(self, company_ids: Sequence[str]) -> Tuple[Dict[str, List[Dict[str, Any]]], List[str]]:
+        """Get cached trials for many companies; returns (hits, misses)."""
+        return await self.get_many(self.TRIALS, company_ids)
+
+    async def get_many_analytics(self, company_ids: Sequence[str]) -> Tuple[Dict[str, dict], List[str]]:
+        """Get cached trial analytics for many companies; returns (hits, misses)."""
+        return await self.get_many(self.TRIAL_ANALYTICS, company_ids)
+
+    async def set_many(self, prefix: str, values: Dict[str, Any], ttl: Optional[int] = None):
+        """Cache ``<prefix>:<namespace>:<company_id>`` for every company in ``values`` with one pipelined write."""
+        if values:
+            namespace = await self.namespace(self.FAMILY_COLLECTIONS[prefix])
+            await self._set_values(
+                [
+                    (f"{prefix}:{namespace}:{company_id}", value, [self.company_tag(company_id)])
+                    for company_id, value in values.items()
+                ],
+                ttl or self.default_ttl
+            )
+
+    @classmethod
+    def stats(cls, limit: int = 20) -> Dict[str, Any]:
+        """This worker's cache statistics: L1 usage, per-family hit ratios and the top keys."""
+        return {
+            "instance_id": cls.instance_id,
+            "l1": {
+                "active": cls._l1_active,
+                "entries": len(cls.local),
+                "bytes": cls.local.bytes,
+                "max_bytes": cls.local.max_bytes,
+                "hits": cls.local.hits,
+                "misses": cls.local.misses,
+                "evictions": cls.local.evictions,
+            },
+            "families": cls.key_stats.families(),
+            "top_by_size": cls.key_stats.top("bytes", limit),
+            "top_by_access": cls.key_stats.top("accesses", limit),
+        }
 
     async def invalidate_analysis(self, company_id: str):
         """Invalidate cached analysis."""
-        key = f"analysis:{company_id}"
-        await self.redis.delete(key)
+        await self._delete(await self.key(self.ANALYSIS, company_id))
 
     async def close(self):
         """Close Redis connection."""
-        await self.redis.close() 
\ No newline at end of file
+        await self.redis.close()
+
+
+cache_l1_bytes.set_function(lambda: CacheService.local.bytes)
+cache_l1_entries.set_function(lambda: len(CacheService.local))
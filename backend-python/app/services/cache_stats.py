@@ -0,0 +1,99 @@
+from typing import Any, Dict, List
+import threading
+from prometheus_client import Counter, Gauge, Histogram
+
+# Labelled by key family, the prefix before the first ":" (company_trials, trial_analytics, analysis,
+# missing).
+# Hit ratio per family: sum by (family) (rate(cache_requests_total{result="hit"}[5m])) / sum by (family)
+# (rate(cache_requests_total[5m])).
+cache_requests = Counter(
+    'cache_requests_total', 'CacheService reads by key family, tier (l1, redis, bloom) and result (hit, stale, miss)',
+    ['family', 'tier', 'result']
+)
+cache_payload_bytes = Histogram(
+    'cache_payload_bytes', 'Serialized CacheService payload sizes before compression',
+    ['family', 'operation'], buckets=[2 ** n for n in range(8, 27, 2)]
+)
+cache_codec_seconds = Histogram(
+    'cache_codec_seconds', 'Time spent encoding and decoding CacheService values',
+    ['family', 'operation'], buckets=[0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5]
+)
+cache_redis_seconds = Histogram(
+    'cache_redis_seconds', 'CacheService Redis round-trip latency by command',
+    ['command'], buckets=[0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1.0]
+)
+
+# Sampled from CacheService.local on scrape
+cache_l1_bytes = Gauge('cache_l1_bytes', 'Payload bytes held in the in-process L1 cache')
+cache_l1_entries = Gauge('cache_l1_entries', 'Entries in the in-process L1 cache')
+
+
+def key_family(key: str) -> str:
+    return key.partition(":")[0]
+
+
+class CacheKeyStats:
+    """
+    Per-key access counts and sizes for this worker, for /api/cache/stats.
+
+    Holds at most ``max_keys`` keys; when full, the least accessed half is
+    dropped so the busiest keys survive.
+    """
+    def __init__(self, max_keys: int = 10000):
+        self.max_keys = max_keys
+        self._keys: Dict[str, List[int]] = {}  # key -> [hits, misses, payload size]
+        self._lock = threading.Lock()
+
+    def _entry(self, key: str) -> List[int]:
+        entry = self._keys.get(key)
+        if entry is None:
+            if len(self._keys) >= self.max_keys:
+                self._prune()
+            entry = self._keys[key] = [0, 0, 0]
+        return entry
+
+    def record(self, key: str, hit: bool, size: int = 0):
+        """Count a read; ``size`` (when known) is the payload size in bytes."""
+        with self._lock:
+            entry = self._entry(key)
+            entry[0 if hit else 1] += 1
+            if size:
+                entry[2] = size
+
+    def record_size(self, key: str, size: int):
+        with self._lock:
+            self._entry(key)[2] = size
+
+    def _prune(self):
+        by_access = sorted(self._keys, key=lambda key: self._keys[key][0] + self._keys[key][1])
+        for key in by_access[:len(by_access) // 2]:
+            del self._keys[key]
+
+    def _rows(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            items = list(self._keys.items())
+        return [
+            {"key": key, "hits": hits, "misses": misses, "accesses": hits + misses, "bytes": size}
+            for key, (hits, misses, size) in items
+        ]
+
+    def top(self, by: str, limit: int = 20) -> List[Dict[str, Any]]:
+        """The ``limit`` keys with the most ``bytes`` or ``accesses``."""
+        return sorted(self._rows(), key=lambda row: row[by], reverse=True)[:limit]
+
+    def families(self) -> Dict[str, Dict[str, Any]]:
+        summary: Dict[str, Dict[str, Any]] = {}
+        for row in self._rows():
+            family = summary.setdefault(key_family(row["key"]), {"keys": 0, "hits": 0, "misses": 0, "bytes": 0})
+            family["keys"] += 1
+            family["hits"] += row["hits"]
+            family["misses"] += row["misses"]
+            family["bytes"] += row["bytes"]
+        for family in summary.values():
+            accesses = family["hits"] + family["misses"]
+            family["hit_ratio"] = family["hits"] / accesses if accesses else None
+        return summary
+
+    def clear(self):
+        with self._lock:
+            self._keys.clear()
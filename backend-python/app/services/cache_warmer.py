@@ -0,0 +1,132 @@
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+import asyncio
+import logging
+from redis.exceptions import LockError
+from ..config.database import MongoDB
+from ..config.settings import get_settings
+from .cache_service import CacheService
+from .company_service import CompanyService
+from .trial_service import TrialAnalysisService, TrialService
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+
+class CacheWarmer:
+    """
+    Pre-populates ``company_trials:*`` and ``trial_analytics:*`` for the busiest companies.
+
+    Runs once shortly after startup and then every CACHE_WARM_INTERVAL
+    seconds (if set). Companies are ranked by this worker's access counts
+    and then by most recent ``updated_at``. Only keys that are missing are
+    loaded: CACHE_WARM_BATCH_SIZE companies per MongoDB query, with at most
+    CACHE_WARM_CONCURRENCY queries in flight so live traffic keeps its
+    share of the pool. A Redis lock lets one replica warm per round; the
+    others fill their L1 from Redis on first use.
+    """
+    LOCK_TIMEOUT = 600  # seconds; outlasts a warm-up round
+    _task: Optional[asyncio.Task] = None
+
+    @classmethod
+    async def start(cls):
+        if cls._task is None and settings.CACHE_WARM_TOP_N > 0:
+            cls._task = asyncio.create_task(cls._run(CacheService()))
+
+    @classmethod
+    async def stop(cls):
+        if cls._task is not None:
+            cls._task.cancel()
+            try:
+                await cls._task
+            except asyncio.CancelledError:
+                pass
+            cls._task = None
+
+    @classmethod
+    async def _run(cls, cache: CacheService):
+        try:
+            await asyncio.sleep(settings.CACHE_WARM_DELAY)
+            while True:
+                try:
+                    await cls.warm_once(cache)
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    logger.warning(f"Cache warm-up failed: {str(e)}")
+                if settings.CACHE_WARM_INTERVAL <= 0:
+                    return
+                await asyncio.sleep(settings.CACHE_WARM_INTERVAL)
+        finally:
+            await cache.close()
+
+    @classmethod
+    async def warm_once(cls, cache: CacheService) -> Optional[Dict[str, int]]:
+        """Warm one round unless another replica holds the lock; returns the keys written per family."""
+        lock = cache.redis.lock("lock:cache-warm", timeout=cls.LOCK_TIMEOUT)
+        if not await lock.acquire(blocking=False):
+            logger.info("Cache warm-up already running on another replica")
+            return None
+        try:
+            return await cls.warm(cache, await cls.rank_companies(settings.CACHE_WARM_TOP_N))
+        finally:
+            try:
+                await lock.release()
+            except LockError:
+                pass
+
+    @staticmethod
+    async def rank_companies(top_n: int) -> List[str]:
+        """Company ids to warm: this worker's most accessed first, then the most recently updated."""
+        ranked = []
+        for row in CacheService.key_stats.top("accesses", top_n * 3):
+            # <family>:<namespace>:<company_id>
+            family, company_id = row["key"].partition(":")[0], row["key"].rpartition(":")[2]
+            if family in (CacheService.TRIALS, CacheService.TRIAL_ANALYTICS) and company_id not in ranked:
+                ranked.append(company_id)
+        async with MongoDB.get_collection(CompanyService.COLLECTION) as collection:
+            cursor = collection.find({}, {"_id": 1}).sort("updated_at", -1).limit(top_n)
+            async for company in cursor:
+                company_id = str(company["_id"])
+                if company_id not in ranked:
+                    ranked.append(company_id)
+        return ranked[:top_n]
+
+    @classmethod
+    async def warm(cls, cache: CacheService, company_ids: List[str]) -> Dict[str, int]:
+        """Load and cache the missing trials and analytics for ``company_ids``."""
+        _, trial_misses = await cache.get_many_trials(company_ids)
+        _, analytics_misses = await cache.get_many_analytics(company_ids)
+        batch_size = settings.CACHE_WARM_BATCH_SIZE
+        semaphore = asyncio.Semaphore(settings.CACHE_WARM_CONCURRENCY)
+        warmed = {CacheService.TRIALS: 0, CacheService.TRIAL_ANALYTICS: 0}
+
+        async def warm_family(family: str, load: Callable[[List[str]], Awaitable[Dict[str, Any]]], batch: List[str]):
+            async with semaphore:
+                tags = [cache.company_tag(company_id) for company_id in batch]
+                before = await cache.tag_versions(tags)
+                values = await load(batch)
+                after = await cache.tag_versions(tags)
+                # Skip companies written (and invalidated) while loading; the values may predate the write
+                unchanged = {company_id for company_id, old, new in zip(batch, before, after) if old == new}
+                values = {company_id: value for company_id, value in values.items() if company_id in unchanged}
+                await cache.set_many(family, values)
+                warmed[family] += len(values)
+
+        await asyncio.gather(
+            *(
+                warm_family(CacheService.TRIALS, TrialService.get_trials_for_companies, trial_misses[i:i + batch_size])
+                for i in range(0, len(trial_misses), batch_size)
+            ),
+            *(
+                warm_family(CacheService.TRIAL_ANALYTICS, cls._load_analytics, analytics_misses[i:i + batch_size])
+                for i in range(0, len(analytics_misses), batch_size)
+            )
+        )
+        logger.info(f"Cache warm-up for {len(company_ids)} companies wrote {warmed}")
+        return warmed
+
+    @staticmethod
+    async def _load_analytics(company_ids: List[str]) -> Dict[str, dict]:
+        """Analytics computed from the trials collection, the same values GET /{company_id}/trials/analytics caches."""
+        analytics = await TrialAnalysisService.analyze_companies(company_ids)
+        return {company_id: value.model_dump() for company_id, value in analytics.items()}
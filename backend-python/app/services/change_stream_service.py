@@ -0,0 +1,264 @@
+from typing import Any, Dict, List, Optional, Set, Tuple
+from datetime import datetime
+import asyncio
+import logging
+from pymongo.errors import OperationFailure, PyMongoError
+from redis.exceptions import LockError, RedisError
+from ..config.database import MongoDB
+from ..config.settings import get_settings
+from .cache_service import CacheService
+from .company_service import CompanyService
+from .trial_service import CompanyTrialService, TrialService
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+# Server error codes
+NOT_A_REPLICA_SET = 40573
+CHANGE_STREAM_FATAL = 280
+CHANGE_STREAM_HISTORY_LOST = 286
+
+
+class ChangeStreamService:
+    """
+    Invalidates cached company data for writes that bypass the service layer.
+
+    The legacy Node.js backend and scripts such as migrate_data.py write to
+    ``companies`` and ``trials`` directly. This consumer watches both
+    collections and invalidates the ``company:<id>`` cache tag of every
+    company they touch, which covers its trials, analytics and analysis
+    keys. Invalidating is idempotent, so writes that already invalidated
+    through CacheService are harmless to see again. Inserted trials and
+    companies also clear their negative cache entries.
+
+    A trial change invalidates the company it belonged to before the
+    change (from its pre-image, where the server keeps them), the company
+    it belongs to after it, and every company linking it in normalized
+    storage. A deleted trial without a pre-image invalidates every company.
+
+    One replica consumes at a time, holding a Redis lock that the others
+    retry for. The resume token is saved in ``change_stream_state`` after
+    each batch that applied changes, and at most every
+    CHECKPOINT_INTERVAL while idle, so a restart replays anything not yet
+    applied.
+    """
+    STATE_COLLECTION = "change_stream_state"
+    STREAM_ID = "cache_invalidation"
+    WATCHED = (CompanyService.COLLECTION, TrialService.COLLECTION)
+    LOCK_NAME = "lock:change-stream"
+    LOCK_TIMEOUT = 30  # seconds; renewed every third of it while consuming
+    CHECKPOINT_INTERVAL = 60.0  # seconds between resume-token saves while no change arrives
+
+    _task: Optional[asyncio.Task] = None
+
+    @classmethod
+    async def start(cls):
+        if cls._task is None and settings.CHANGE_STREAM_ENABLED:
+            cls._task = asyncio.create_task(cls._run(CacheService()))
+
+    @classmethod
+    async def stop(cls):
+        if cls._task is not None:
+            cls._task.cancel()
+            try:
+                await cls._task
+            except asyncio.CancelledError:
+                pass
+            cls._task = None
+
+    @classmethod
+    async def _run(cls, cache: CacheService):
+        try:
+            while True:
+                lock = cache.redis.lock(cls.LOCK_NAME, timeout=cls.LOCK_TIMEOUT)
+                try:
+                    acquired = await lock.acquire(blocking=False)
+                except RedisError as e:
+                    logger.warning(f"Change stream lock unavailable: {str(e)}")
+                    acquired = False
+                if not acquired:
+                    # Another replica is consuming; take over if it stops renewing the lock
+                    await asyncio.sleep(cls.LOCK_TIMEOUT / 3)
+                    continue
+                logger.info("Change stream consumer running on this replica")
+                if await cls._consume_holding(cache, lock):
+                    return
+        finally:
+            await cache.close()
+
+    @classmethod
+    async def _consume_holding(cls, cache: CacheService, lock) -> bool:
+        """Consume while renewing ``lock``; True if the stream cannot be used, False if the lock was lost."""
+        consumer = asyncio.create_task(cls._consume_forever(cache))
+        try:
+            while True:
+                done, _ = await asyncio.wait({consumer}, timeout=cls.LOCK_TIMEOUT / 3)
+                if done:
+                    consumer.result()
+                    return True
+                try:
+                    await lock.reacquire()
+                except (LockError, RedisError) as e:
+                    logger.warning(f"Lost the change stream lock, stopping the consumer: {str(e)}")
+                    return False
+        finally:
+            if not consumer.done():
+                consumer.cancel()
+                try:
+                    await consumer
+                except asyncio.CancelledError:
+                    pass
+            try:
+                await lock.release()
+            except (LockError, RedisError):
+                pass
+
+    @classmethod
+    async def _consume_forever(cls, cache: CacheService):
+        """Consume, reopening the stream after errors; returns only when MongoDB cannot serve one."""
+        while True:
+            try:
+                await cls.consume(MongoDB.db, cache)
+            except asyncio.CancelledError:
+                raise
+            except OperationFailure as e:
+                if e.code == NOT_A_REPLICA_SET:
+                    logger.warning("MongoDB is not a replica set; change stream cache invalidation is disabled")
+                    return
+                if e.code not in (CHANGE_STREAM_FATAL, CHANGE_STREAM_HISTORY_LOST):
+                    logger.warning(f"Change stream failed: {str(e)}")
+                    await asyncio.sleep(1)
+                    continue
+                # The saved position is gone from the oplog; anything since may have been missed
+                logger.warning(f"Change stream cannot resume, invalidating all companies: {str(e)}")
+                await MongoDB.db[cls.STATE_COLLECTION].delete_one({"_id": cls.STREAM_ID})
+                await cache.invalidate_tags(*await cache.company_tags())
+            except Exception as e:
+                logger.warning(f"Change stream disconnected: {str(e)}")
+                await asyncio.sleep(1)
+
+    @classmethod
+    async def consume(cls, db, cache: CacheService, batch_size: Optional[int] = None):
+        """
+        Apply changes until the stream closes (e.g. on a collection drop).
+
+        Changes are folded into batches of up to ``batch_size``; each batch
+        is invalidated before its resume token is saved.
+        """
+        batch_size = batch_size or settings.CHANGE_STREAM_BATCH_SIZE
+        state = db[cls.STATE_COLLECTION]
+        saved = await state.find_one({"_id": cls.STREAM_ID})
+        token = saved["token"] if saved else None
+        pipeline = [{"$match": {"$or": [
+            {"ns.coll": {"$in": list(cls.WATCHED)}},
+            {"operationType": {"$in": ["dropDatabase", "invalidate"]}}
+        ]}}]
+        pre_images = await cls._enable_pre_images(db)
+        loop = asyncio.get_running_loop()
+        checkpointed_at = loop.time()
+
+        async with db.watch(
+            pipeline,
+            start_after=token,
+            full_document="updateLookup",
+            full_document_before_change="whenAvailable" if pre_images else None
+        ) as stream:
+            companies: Set[str] = set()
+            nct_ids: Set[str] = set()
+            created: Dict[str, Set[str]] = {}
+            everything = False
+            pending = 0
+            while stream.alive:
+                change = await stream.try_next()
+                if change is not None:
+                    affected = cls.affected_companies(change)
+                    if affected is None:
+                        everything = True
+                    else:
+                        companies |= affected
+                        nct_ids |= cls.trial_nct_ids(change)
+                    new = cls.created_id(change)
+                    if new is not None:
+                        created.setdefault(new[0], set()).add(new[1])
+                    pending += 1
+                    if pending < batch_size:
+                        continue
+
+                # Nothing else buffered (or the batch is full): apply, then checkpoint
+                if nct_ids and not everything:
+                    # Normalized storage: every company listing a changed trial
+                    companies |= set(await db[CompanyTrialService.LINKS].distinct(
+                        "company_id", {"nct_id": {"$in": list(nct_ids)}}
+                    ))
+                tags = await cache.company_tags() if everything else [cache.company_tag(c) for c in companies]
+                if tags:
+                    await cache.invalidate_tags(*tags)
+                for kind, ids in created.items():
+                    await cache.clear_missing(kind, *ids)
+                # An idle stream still advances its token on every poll; only save it now and then
+                idle = not pending and loop.time() - checkpointed_at < cls.CHECKPOINT_INTERVAL
+                if stream.resume_token is not None and stream.resume_token != token and not idle:
+                    token = stream.resume_token
+                    checkpointed_at = loop.time()
+                    await state.update_one(
+                        {"_id": cls.STREAM_ID},
+                        {"$set": {"token": token, "updated_at": datetime.utcnow()}},
+                        upsert=True
+                    )
+                if pending:
+                    logger.info(f"Change stream applied {pending} changes ({len(tags)} cache tags)")
+                companies, nct_ids, created, everything, pending = set(), set(), {}, False, 0
+
+    @staticmethod
+    async def _enable_pre_images(db) -> bool:
+        """Have the server keep trial pre-images (MongoDB 6.0+), so deletes and moves name their old company."""
+        try:
+            await db.command("collMod", TrialService.COLLECTION, changeStreamPreAndPostImages={"enabled": True})
+            return True
+        except PyMongoError as e:
+            logger.info(f"Trial pre-images unavailable, trial deletes will invalidate every company: {str(e)}")
+            return False
+
+    @staticmethod
+    def affected_companies(change: Dict[str, Any]) -> Optional[Set[str]]:
+        """Company ids a change touches, or None when that cannot be told and everything must go."""
+        collection = change.get("ns", {}).get("coll")
+        if change["operationType"] not in ("insert", "update", "replace", "delete"):
+            # drop, rename, dropDatabase, invalidate
+            return None
+        if collection == CompanyService.COLLECTION:
+            return {str(change["documentKey"]["_id"])}
+
+        documents = ChangeStreamService._trial_documents(change)
+        if not documents:
+            # A deleted trial without a pre-image no longer says whose it was
+            return None
+        return {str(document["company_id"]) for document in documents if document.get("company_id")}
+
+    @staticmethod
+    def trial_nct_ids(change: Dict[str, Any]) -> Set[str]:
+        """NCT IDs of the trial a change touches, before and after it, to look up in company_trial_links."""
+        if change.get("ns", {}).get("coll") != TrialService.COLLECTION:
+            return set()
+        return {document["nct_id"] for document in ChangeStreamService._trial_documents(change) if document.get("nct_id")}
+
+    @staticmethod
+    def _trial_documents(change: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """The trial as it was before the change (if the pre-image was kept) and as it is after it."""
+        return [
+            document for document in (change.get("fullDocumentBeforeChange"), change.get("fullDocument"))
+            if document is not None
+        ]
+
+    @staticmethod
+    def created_id(change: Dict[str, Any]) -> Optional[Tuple[str, str]]:
+        """The (negative cache kind, id) of a trial or company a change may have created."""
+        if change["operationType"] not in ("insert", "replace"):
+            return None
+        collection = change.get("ns", {}).get("coll")
+        if collection == CompanyService.COLLECTION:
+            return "company", str(change["documentKey"]["_id"])
+        document = change.get("fullDocument")
+        if collection == TrialService.COLLECTION and document and document.get("nct_id"):
+            return "trial", document["nct_id"]
+        return None
@@ -5,7 +5,8 @@ from openai import OpenAI
 import json
 import logging
 from ct_client.clinical_trials_gov_rest_api_client.api.studies.fetch_study import sync as fetch_study_sync
-from ct_client.clinical_trials_gov_rest_api_client.client import Client
+from ct_client.clinical_trials_gov_rest_api_client.projection import Projection
+from ..config.ctgov import CTGovClient
 from pydantic import BaseModel
 
 logging.basicConfig(level=logging.INFO)  # And this
@@ -68,6 +69,14 @@ def refine_query(user_input: str) -> dict:
 # Logging setup
 logger = logging.getLogger(__name__)
 
+# The study fields fetch_trials returns
+TRIAL_LIST_PROJECTION = Projection(
+    "protocolSection.identificationModule.briefTitle",
+    "protocolSection.statusModule.overallStatus",
+    "protocolSection.conditionsModule.conditions",
+    "protocolSection.contactsLocationsModule.locations",
+)
+
 def fetch_trials(refined_query: str, filters: dict = None):
     """
     Fetch clinical trials from ClinicalTrials.gov based on a refined query and filters.
@@ -79,8 +88,8 @@ def fetch_trials(refined_query: str, filters: dict = None):
     Returns:
         list: List of clinical trial data.
     """
-    # Initialize the client (replace with AuthenticatedClient if required)
-    client = Client(base_url="https://clinicaltrials.gov/api/v2")
+    # Shared pooled client (see app.config.ctgov)
+    client = CTGovClient.get_client()
     filters = filters or {}
 
     # Initialize ClinicalTrials.gov client
@@ -89,7 +98,10 @@ def fetch_trials(refined_query: str, filters: dict = None):
     # ct_api = ClinicalTrialsApi(client)
 
     # Build API parameters
-    params = {"query.term": refined_query}  # Basic query
+    params = {
+        "query.term": refined_query,  # Basic query
+        "fields": TRIAL_LIST_PROJECTION.param(CTGovClient.field_index)[0],
+    }
     if "phase" in filters:
         params["filter.phase"] = filters["phase"]
     if "condition" in filters:
@@ -115,7 +127,7 @@ def fetch_trials(refined_query: str, filters: dict = None):
                 "Title": study.get("protocolSection", {}).get("identificationModule", {}).get("briefTitle"),
                 "Status": study.get("protocolSection", {}).get("statusModule", {}).get("overallStatus"),
                 "Conditions": study.get("protocolSection", {}).get("conditionsModule", {}).get("conditions", []),
-                "Locations": study.get("protocolSection", {}).get("locationModule", {}).get("locations", [])
+                "Locations": study.get("protocolSection", {}).get("contactsLocationsModule", {}).get("locations", [])
             }
             for study in response.json().get("studies", [])
         ]
@@ -1,29 +1,41 @@
-from ct_client import ClinicalTrialsApi, Configuration, ApiClient
+from typing import Optional
+from ct_client.clinical_trials_gov_rest_api_client.api.studies import fetch_study, list_studies
+from ct_client.clinical_trials_gov_rest_api_client.projection import Projection
+from ..config.ctgov import CTGovClient
 
 class ClinicalTrialsService:
     def __init__(self):
-        # Initialize the client with the correct configuration
-        config = Configuration(host="https://clinicaltrials.gov/api/v2")
-        self.client = ApiClient(config)
-        self.api = ClinicalTrialsApi(self.client)
+        # Use the application-wide pooled client instead of building one per service
+        self.client = CTGovClient.get_client()
 
-    def fetch_studies(self, query_params):
+    @staticmethod
+    def _fields(projection: Projection) -> list:
+        """`fields` parameter for a projection, using piece names once the startup field index load is done"""
+        return projection.param(CTGovClient.field_index)
+
+    def fetch_studies(self, query_params, projection: Optional[Projection] = None):
         """
         Fetch studies based on query parameters.
+
+        With a ``projection`` only the declared fields are downloaded; the
+        returned models leave everything else UNSET.
         """
         try:
-            response = self.api.search_studies(**query_params)
+            if projection is not None:
+                query_params = {**query_params, "fields": self._fields(projection)}
+            response = list_studies.sync(client=self.client, **query_params)
             return response
         except Exception as e:
             print(f"Error fetching studies: {e}")
             raise
 
-    def fetch_study_details(self, study_id):
+    def fetch_study_details(self, study_id, projection: Optional[Projection] = None):
         """
         Fetch detailed information for a specific study by ID.
         """
         try:
-            response = self.api.get_study_by_id(study_id=study_id)
+            kwargs = {"fields": self._fields(projection)} if projection is not None else {}
+            response = fetch_study.sync(nct_id=study_id, client=self.client, **kwargs)
             return response
         except Exception as e:
             print(f"Error fetching study details: {e}")
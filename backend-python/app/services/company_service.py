@@ -1,14 +1,18 @@
-from typing import Optional, List
+from typing import Any, AsyncIterator, Dict, Optional, List
 from bson import ObjectId
 from ..models.company import Company
 from ..config.database import MongoDB
+from ..config.settings import get_settings
 from datetime import datetime
 import logging
 from fastapi import HTTPException, status
 import asyncio
 from app.system_specs.schema_manager import schema_manager, SchemaContext
+from .cache_service import CacheService
 
+settings = get_settings()
 logger = logging.getLogger(__name__)
+cache_service = CacheService()
 
 class CompanyService:
     COLLECTION = "companies"
@@ -28,6 +32,9 @@ class CompanyService:
             if result:
                 logger.info(f"Company created with ID: {result['_id']}")
                 result["_id"] = str(result["_id"])
+                # Upserting by name may have overwritten an existing company
+                await cache_service.invalidate_company(result["_id"])
+                await cache_service.clear_missing("company", result["_id"])
                 return result
             logger.error("Failed to create/update company")
             raise HTTPException(status_code=500, detail="Failed to create/update company")
@@ -35,6 +42,8 @@ class CompanyService:
     @staticmethod
     async def get_company(company_id: str, schema_name: str = "Enhanced") -> dict:
         logger.info(f"Retrieving company with ID: {company_id} using schema: {schema_name}")
+        if await cache_service.is_missing("company", company_id):
+            raise HTTPException(status_code=404, detail="Company not found")
         async with MongoDB.get_collection(CompanyService.COLLECTION) as collection:
             result = await collection.find_one({"_id": ObjectId(company_id)})
             if result:
@@ -42,6 +51,7 @@ class CompanyService:
                 result["_id"] = str(result["_id"])
                 return result
             logger.warning(f"Company not found with ID: {company_id}")
+            await cache_service.set_missing("company", company_id)
             raise HTTPException(status_code=404, detail="Company not found")
 
     @staticmethod
@@ -71,6 +81,19 @@ class CompanyService:
             logger.error(f"Error in get_current_company: {str(e)}")
             raise
 
+    @staticmethod
+    async def iter_companies(
+        projection: Optional[Dict[str, Any]] = None,
+        batch_size: Optional[int] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Yield company documents, optionally projected, one cursor batch in memory at a time."""
+        async with MongoDB.get_collection(CompanyService.COLLECTION) as collection:
+            cursor = collection.find({}, projection).batch_size(batch_size or settings.READ_BATCH_SIZE)
+            async for company in cursor:
+                if "_id" in company:
+                    company["_id"] = str(company["_id"])
+                yield company
+
     @staticmethod
     async def update_company(company_id: str, company_data: dict, schema_name: str = "Enhanced") -> Optional[Company]:
         logger.info(f"Updating company with ID: {company_id} using schema: {schema_name}")
@@ -83,6 +106,7 @@ class CompanyService:
             )
             if result:
                 logger.info(f"Company updated: {result}")
+                await cache_service.invalidate_company(company_id)
                 result["_id"] = str(result["_id"])
                 return schema_manager.get_schema(schema_name)(**result)
             logger.warning(f"Company not found with ID: {company_id}")
@@ -1,9 +1,20 @@
 from fastapi import FastAPI, HTTPException
 from pydantic import BaseModel
+from http import HTTPStatus
+from typing import Any, Dict, List, Optional
 import openai
 import requests
-from ct_client.clinical_trials_gov_rest_api_client.api.studies.fetch_study import sync as fetch_study_sync
+import asyncio
+import json
+from ct_client.clinical_trials_gov_rest_api_client.api.studies import fetch_study
+from ct_client.clinical_trials_gov_rest_api_client.bulk import bulk_fetch_studies
 from ct_client.clinical_trials_gov_rest_api_client.client import Client
+from ct_client.clinical_trials_gov_rest_api_client.models.fetch_study_format import FetchStudyFormat
+from ct_client.clinical_trials_gov_rest_api_client.models.fetch_study_markup_format import FetchStudyMarkupFormat
+from ct_client.clinical_trials_gov_rest_api_client.projection import Projection
+from ct_client.clinical_trials_gov_rest_api_client.types import UNSET
+from ..config.settings import get_settings
+from ..config.ctgov import CTGovClient
 import logging
 
 # Logging setup
@@ -66,12 +77,27 @@ def generate_cypher_query(query, hypothesis, filters=None):
 
 
 class ClinicalTrialsService:
-    def __init__(self):
-        # Initialize the client (replace with AuthenticatedClient if required)
-        self.client = Client(base_url="https://clinicaltrials.gov/api/v2")
-
-
-    def fetch_trials(self, refined_query: str, filters: dict = None):
+    # filter.ids chunk size for the batched detail path; 100 NCT IDs keep the URL around 1.2 KB
+    ID_CHUNK_SIZE = 100
+    # The search only needs NCT IDs to look the details up by; the details only what the copilot shows
+    SEARCH_PROJECTION = Projection()
+    DETAIL_PROJECTION = Projection(
+        "protocolSection.identificationModule.briefTitle",
+        "protocolSection.statusModule.overallStatus",
+    )
+
+    def __init__(self, max_concurrency: int = None, batch_details: bool = None, client: Client = None):
+        settings = get_settings()
+        self.max_concurrency = max_concurrency or settings.CTGOV_MAX_CONCURRENCY
+        self.batch_details = settings.CTGOV_BATCH_DETAILS if batch_details is None else batch_details
+        self._client = client
+
+    @property
+    def client(self) -> Client:
+        # Defaults to the application-wide pooled client so detail requests reuse its connections
+        return self._client or CTGovClient.get_client()
+
+    async def fetch_trials(self, refined_query: str, filters: dict = None):
         """
         Fetch clinical trials with optimized API calls.
         """
@@ -81,7 +107,7 @@ class ClinicalTrialsService:
 
         try:
             # Initialize HTTPX client
-            httpx_client = self.client.get_httpx_client()
+            httpx_client = self.client.get_async_httpx_client()
 
             # Build API parameters dynamically
             params = {
@@ -92,29 +118,22 @@ class ClinicalTrialsService:
                 "filter.design": filters.get("design"),
             }
             params = {k: v for k, v in params.items() if v}  # Remove empty values
+            params["fields"] = self.SEARCH_PROJECTION.param(CTGovClient.field_index)[0]
 
             # Fetch trial summaries in a single call
-            response = httpx_client.get("/studies", params=params)
+            response = await httpx_client.get("/studies", params=params)
             response.raise_for_status()
             trial_summaries = response.json()
 
-            # Fetch details for each trial in parallel
-            for trial in trial_summaries.get("studies", []):
-                try:
-                    trial_details = fetch_study_sync(
-                        nct_id=trial["nct_id"],
-                        client=self.client,
-                        format_="json",
-                        markup_format="markdown",
-                        fields=["nct_id", "title", "status"],  # Request only necessary fields
-                    )
-                    trial_results.append(trial_details)
-                except Exception as e:
-                    logger.error(f"Error fetching details for trial {trial['nct_id']}: {e}")
+            nct_ids = [_study_nct_id(study) for study in trial_summaries.get("studies", [])]
+            trial_results = await self.fetch_trial_details(
+                [nct_id for nct_id in nct_ids if nct_id],
+                projection=self.DETAIL_PROJECTION,
+            )
 
             # Fetch successful trials if required
             if "success" in filters:
-                successful_trials = self.search_successful_trials(refined_query)
+                successful_trials = await self.search_successful_trials(refined_query)
 
         except Exception as e:
             logger.error(f"Error fetching trials: {e}", exc_info=True)
@@ -125,15 +144,86 @@ class ClinicalTrialsService:
             "successful_trials": successful_trials,
         }
 
-    def search_successful_trials(self, refined_query: str):
+    async def fetch_trial_details(
+        self,
+        nct_ids: List[str],
+        projection: Optional[Projection] = None,
+        batch: Optional[bool] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Fetch study details for many NCT IDs concurrently.
+
+        Requests run at most ``max_concurrency`` at a time over the shared client. With
+        ``batch`` enabled the IDs are collapsed into ``filter.ids`` chunks of
+        ``ID_CHUNK_SIZE`` (via ``bulk_fetch_studies``) so the whole batch costs one
+        list_studies call per chunk instead of one fetch_study call per ID. Results keep the order of ``nct_ids``;
+        IDs that fail are logged and skipped. A ``projection`` limits each study to its fields.
+        """
+        batch = self.batch_details if batch is None else batch
+        fields = projection.fields(CTGovClient.field_index) if projection is not None else None
+        if batch:
+            return await self._fetch_trial_details_batched(nct_ids, fields)
+
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        # CT.gov array params are pipeDelimited/explode=false, so send one joined value
+        fields = ["|".join(fields)] if fields else UNSET
+
+        async def fetch_one(nct_id: str) -> List[Dict[str, Any]]:
+            async with semaphore:
+                try:
+                    response = await fetch_study.asyncio_detailed(
+                        nct_id=nct_id,
+                        client=self.client,
+                        format_=FetchStudyFormat.JSON,
+                        markup_format=FetchStudyMarkupFormat.MARKDOWN,
+                        fields=fields,
+                    )
+                    if response.status_code != HTTPStatus.OK:
+                        raise ValueError(f"status {response.status_code}")
+                    return [json.loads(response.content)]
+                except Exception as e:
+                    logger.error(f"Error fetching details for trial {nct_id}: {e}")
+                    return []
+
+        results = await asyncio.gather(*(fetch_one(nct_id) for nct_id in nct_ids))
+        return [study for studies in results for study in studies]
+
+    async def _fetch_trial_details_batched(
+        self, nct_ids: List[str], fields: Optional[List[str]]
+    ) -> List[Dict[str, Any]]:
+        def log_failure(chunk: List[str], e: Exception):
+            logger.error(f"Error fetching details for trials {chunk[0]}..{chunk[-1]}: {e}")
+
+        details = [
+            study.to_dict()
+            async for study in bulk_fetch_studies(
+                nct_ids,
+                client=self.client,
+                fields=fields or UNSET,
+                max_concurrency=self.max_concurrency,
+                max_chunk_size=self.ID_CHUNK_SIZE,
+                lazy=True,
+                on_error=log_failure,
+            )
+        ]
+        # Chunks complete in any order; put the studies back in the caller's order
+        order = {nct_id: index for index, nct_id in enumerate(nct_ids)}
+        details.sort(key=lambda study: order.get(_study_nct_id(study), len(order)))
+        return details
+
+    async def search_successful_trials(self, refined_query: str):
         """
         Search for successful clinical trials.
         """
         try:
-            httpx_client = self.client.get_httpx_client()
-            response = httpx_client.get("/successful-trials", params={"query": refined_query})
+            httpx_client = self.client.get_async_httpx_client()
+            response = await httpx_client.get("/successful-trials", params={"query": refined_query})
             response.raise_for_status()
             return response.json()
         except Exception as e:
             logger.error(f"Error fetching successful trials: {e}", exc_info=True)
             return []
+
+
+def _study_nct_id(study: Dict[str, Any]) -> Optional[str]:
+    return study.get("protocolSection", {}).get("identificationModule", {}).get("nctId")
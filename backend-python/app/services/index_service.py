@@ -0,0 +1,166 @@
+from typing import Any, Dict, List, Optional
+import asyncio
+import logging
+from pymongo.errors import OperationFailure
+from ..config.database import MongoDB
+from ..config.indexes import INDEXES, QUERIES
+from ..config.settings import get_settings
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+
+class IndexService:
+    """
+    Keeps the server's indexes in line with the declarations in config/indexes.py.
+
+    ``apply`` creates declared indexes that are missing and is safe to run
+    repeatedly (and from several workers at once). Indexes whose options
+    changed, and undeclared ones, are only reported by ``drift``; dropping
+    them is left to ``scripts/manage_indexes.py apply --drop-changed/--drop-extra``.
+    """
+    _task: Optional[asyncio.Task] = None
+
+    @classmethod
+    async def start(cls):
+        # In the background: a first build on a large collection can take a while
+        if cls._task is None and settings.INDEXES_APPLY_ON_STARTUP:
+            cls._task = asyncio.create_task(cls._apply_on_startup())
+
+    @classmethod
+    async def stop(cls):
+        if cls._task is not None:
+            cls._task.cancel()
+            try:
+                await cls._task
+            except asyncio.CancelledError:
+                pass
+            cls._task = None
+
+    @classmethod
+    async def _apply_on_startup(cls):
+        try:
+            await cls.apply(MongoDB.db)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.warning(f"Applying declared indexes failed: {str(e)}")
+
+    @staticmethod
+    def _options(spec: Dict[str, Any]) -> Dict[str, Any]:
+        """create_index options for a declaration; also what index_information() reports back."""
+        options = {}
+        if spec.get("unique"):
+            options["unique"] = True
+        if spec.get("partial"):
+            options["partialFilterExpression"] = spec["partial"]
+        if spec.get("ttl") is not None:
+            options["expireAfterSeconds"] = spec["ttl"]
+        return options
+
+    @staticmethod
+    def diff(declared: List[Dict[str, Any]], existing: Dict[str, Dict[str, Any]]) -> Dict[str, List[str]]:
+        """
+        Compare declarations with a collection's ``index_information()``.
+
+        Returns index names that are ``missing``, ``extra`` (on the server
+        but not declared; ``_id_`` excluded) and ``changed`` (same name,
+        different keys or options).
+        """
+        drift = {"missing": [], "extra": [], "changed": []}
+        for spec in declared:
+            info = existing.get(spec["name"])
+            if info is None:
+                drift["missing"].append(spec["name"])
+                continue
+            actual = {
+                "keys": [(field, int(direction)) for field, direction in info["key"]],
+                "unique": bool(info.get("unique")),
+                "partialFilterExpression": dict(info["partialFilterExpression"])
+                if "partialFilterExpression" in info else None,
+                "expireAfterSeconds": info.get("expireAfterSeconds"),
+            }
+            options = IndexService._options(spec)
+            wanted = {
+                "keys": list(spec["keys"]),
+                "unique": options.get("unique", False),
+                "partialFilterExpression": options.get("partialFilterExpression"),
+                "expireAfterSeconds": options.get("expireAfterSeconds"),
+            }
+            if actual != wanted:
+                drift["changed"].append(spec["name"])
+        names = {spec["name"] for spec in declared}
+        drift["extra"] = sorted(name for name in existing if name != "_id_" and name not in names)
+        return drift
+
+    @staticmethod
+    async def drift(db) -> Dict[str, Dict[str, List[str]]]:
+        """Missing, extra and changed indexes of every declared collection."""
+        return {
+            collection: IndexService.diff(declared, await db[collection].index_information())
+            for collection, declared in INDEXES.items()
+        }
+
+    @staticmethod
+    async def apply(db, drop_changed: bool = False, drop_extra: bool = False) -> Dict[str, Dict[str, List[str]]]:
+        """
+        Create missing declared indexes; optionally rebuild changed ones and drop undeclared ones.
+
+        Returns the indexes ``created``, ``dropped`` and ``failed`` per
+        collection. A failed build (e.g. duplicate values under a unique
+        index) is logged and does not stop the others.
+        """
+        report = {}
+        for collection_name, declared in INDEXES.items():
+            collection = db[collection_name]
+            drift = IndexService.diff(declared, await collection.index_information())
+            result = report[collection_name] = {"created": [], "dropped": [], "failed": []}
+            to_drop = (drift["changed"] if drop_changed else []) + (drift["extra"] if drop_extra else [])
+            for name in to_drop:
+                await collection.drop_index(name)
+                result["dropped"].append(name)
+            to_create = set(drift["missing"]) | (set(drift["changed"]) if drop_changed else set())
+            for spec in declared:
+                if spec["name"] not in to_create:
+                    continue
+                try:
+                    await collection.create_index(spec["keys"], name=spec["name"], **IndexService._options(spec))
+                    result["created"].append(spec["name"])
+                    logger.info(f"Created index {collection_name}.{spec['name']}")
+                except OperationFailure as e:
+                    result["failed"].append(spec["name"])
+                    logger.error(f"Creating index {collection_name}.{spec['name']} failed: {str(e)}")
+            if not drop_changed:
+                for name in drift["changed"]:
+                    logger.warning(f"Index {collection_name}.{name} differs from its declaration")
+        return report
+
+    @staticmethod
+    def plan_problems(plan: Dict[str, Any]) -> List[str]:
+        """Stages of a winning plan that mean the query is not covered: COLLSCAN and in-memory SORT."""
+        problems = []
+        stages = [plan]
+        while stages:
+            stage = stages.pop()
+            if stage.get("stage") in ("COLLSCAN", "SORT"):
+                problems.append(stage["stage"])
+            # Plans nest as inputStage, inputStages, or queryPlan in the slot-based engine
+            stages.extend(stage.get("inputStages", []))
+            for child in ("inputStage", "queryPlan"):
+                if child in stage:
+                    stages.append(stage[child])
+        return problems
+
+    @staticmethod
+    async def check_queries(db) -> List[Dict[str, Any]]:
+        """Explain each declared query shape; returns those whose plan scans or sorts in memory."""
+        uncovered = []
+        for collection, query, sort, description in QUERIES:
+            cursor = db[collection].find(query).limit(1)
+            if sort:
+                cursor = cursor.sort(sort)
+            explained = await cursor.explain()
+            problems = IndexService.plan_problems(explained["queryPlanner"]["winningPlan"])
+            if problems:
+                uncovered.append({"query": description, "collection": collection, "stages": problems})
+        return uncovered
@@ -0,0 +1,126 @@
+from typing import Dict, Iterable, Optional, Set
+import asyncio
+import hashlib
+import logging
+import math
+from ..config.database import MongoDB
+from ..config.settings import get_settings
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+
+class BloomFilter:
+    """
+    Set membership with no false negatives and a bounded false-positive rate.
+
+    Sized for ``capacity`` items at ``error_rate``; uses double hashing of
+    one BLAKE2b digest to derive the bit positions.
+    """
+    def __init__(self, capacity: int, error_rate: float = 0.01):
+        capacity = max(capacity, 1)
+        self.size = max(8, int(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.count = 0
+        self._bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, item: str):
+        digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+        first, second = int.from_bytes(digest[:8], "little"), int.from_bytes(digest[8:], "little") | 1
+        return ((first + i * second) % self.size for i in range(self.hashes))
+
+    def add(self, item: str):
+        for position in self._positions(item):
+            self._bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, item: str) -> bool:
+        return all(self._bits[position >> 3] & (1 << (position & 7)) for position in self._positions(item))
+
+    @classmethod
+    def from_items(cls, items: Iterable[str], capacity: int, error_rate: float = 0.01) -> "BloomFilter":
+        bloom = cls(capacity, error_rate)
+        for item in items:
+            bloom.add(item)
+        return bloom
+
+
+class KnownIds:
+    """
+    Per-worker Bloom filters of the NCT IDs in ``trials`` and the ids in ``companies``.
+
+    ``might_exist`` returning False means the id was not in the collection
+    at the last rebuild and has not been added since, so lookups can answer
+    "not found" without a query. Ids written through the services, and
+    inserts seen by the change stream, are added on every worker through
+    the cache invalidation channel; anything else shows up at the next
+    rebuild (KNOWN_IDS_REBUILD_INTERVAL). Until the first rebuild finishes
+    every id might exist.
+    """
+    # kind -> (collection, field)
+    SOURCES = {"trial": ("trials", "nct_id"), "company": ("companies", "_id")}
+
+    _filters: Dict[str, BloomFilter] = {}
+    # Ids added while a rebuild is reading the collection, replayed into the new filter
+    _pending: Dict[str, Set[str]] = {}
+    _task: Optional[asyncio.Task] = None
+
+    @classmethod
+    def might_exist(cls, kind: str, item_id: str) -> bool:
+        bloom = cls._filters.get(kind)
+        return bloom is None or item_id in bloom
+
+    @classmethod
+    def add(cls, kind: str, item_id: str):
+        if kind in cls._filters:
+            cls._filters[kind].add(item_id)
+        if kind in cls._pending:
+            cls._pending[kind].add(item_id)
+
+    @classmethod
+    async def start(cls):
+        if cls._task is None and settings.KNOWN_IDS_BLOOM_ENABLED:
+            cls._task = asyncio.create_task(cls._run())
+
+    @classmethod
+    async def stop(cls):
+        if cls._task is not None:
+            cls._task.cancel()
+            try:
+                await cls._task
+            except asyncio.CancelledError:
+                pass
+            cls._task = None
+        cls._filters.clear()
+
+    @classmethod
+    async def _run(cls):
+        while True:
+            for kind in cls.SOURCES:
+                try:
+                    await cls.rebuild(kind)
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    # Stop trusting a filter that can no longer be refreshed
+                    cls._filters.pop(kind, None)
+                    logger.warning(f"Known {kind} ids rebuild failed: {str(e)}")
+            await asyncio.sleep(settings.KNOWN_IDS_REBUILD_INTERVAL)
+
+    @classmethod
+    async def rebuild(cls, kind: str):
+        collection_name, field = cls.SOURCES[kind]
+        cls._pending[kind] = set()
+        try:
+            async with MongoDB.get_collection(collection_name) as collection:
+                # Headroom for inserts until the next rebuild
+                capacity = int(await collection.estimated_document_count() * 1.2) + 1000
+                bloom = BloomFilter(capacity, settings.KNOWN_IDS_ERROR_RATE)
+                async for document in collection.find({field: {"$exists": True}}, {field: 1}):
+                    bloom.add(str(document[field]))
+            for item_id in cls._pending[kind]:
+                bloom.add(item_id)
+            cls._filters[kind] = bloom
+            logger.info(f"Known {kind} ids rebuilt: {bloom.count} ids, {len(bloom._bits) // 1024} KiB")
+        finally:
+            del cls._pending[kind]
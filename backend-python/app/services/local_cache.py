@@ -0,0 +1,69 @@
+from typing import Any, Optional
+from collections import OrderedDict
+import threading
+import time
+
+
+class LocalCache:
+    """
+    In-process LRU cache of decoded values, bounded by their encoded size.
+
+    Sits in front of Redis in CacheService: a hit skips both the network
+    round trip and JSON decoding. Entries expire after their TTL and the
+    least recently used ones are evicted once ``max_bytes`` is exceeded.
+    Values are shared between callers and must be treated as read-only.
+    """
+    def __init__(self, max_bytes: int, default_ttl: float):
+        self.max_bytes = max_bytes
+        self.default_ttl = default_ttl
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: "OrderedDict[str, tuple[Any, int, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return the cached value, or None if absent or expired."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[2] <= time.monotonic():
+                if entry is not None:
+                    self._remove(key)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def set(self, key: str, value: Any, size: int, ttl: Optional[float] = None):
+        """Cache ``value``; ``size`` is its encoded length in bytes."""
+        if size > self.max_bytes:
+            # Would evict everything else and still not fit
+            self.delete(key)
+            return
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (value, size, time.monotonic() + (ttl or self.default_ttl))
+            self.bytes += size
+            while self.bytes > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+
+    def delete(self, key: str):
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.bytes = 0
+
+    def _remove(self, key: str):
+        _, size, _ = self._entries.pop(key)
+        self.bytes -= size
@@ -0,0 +1,87 @@
+from typing import Optional
+import asyncio
+import logging
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+from ct_client.clinical_trials_gov_rest_api_client.transport import TokenBucket
+from ..config.settings import get_settings
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+# Token bucket state lives in one hash; Redis TIME keeps every worker on the same clock.
+# Returns the seconds the caller must wait (as a string, Lua numbers are truncated to integers).
+TOKEN_BUCKET_SCRIPT = """
+local rate = tonumber(ARGV[1])
+local capacity = tonumber(ARGV[2])
+local cost = tonumber(ARGV[3])
+local pause = tonumber(ARGV[4])
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'updated')
+local tokens = tonumber(state[1]) or capacity
+local updated = tonumber(state[2]) or now
+tokens = math.min(capacity, tokens + (now - updated) * rate)
+if pause > 0 then
+    tokens = math.min(tokens, -pause * rate)
+end
+tokens = tokens - cost
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'updated', tostring(now))
+redis.call('EXPIRE', KEYS[1], math.ceil(capacity / rate) + 60)
+if tokens < 0 then
+    return tostring(-tokens / rate)
+end
+return '0'
+"""
+
+class RedisTokenBucket:
+    """
+    Token bucket shared by every worker process through Redis.
+
+    Drop-in for the async side of ct_client's TokenBucket (acquire/pause),
+    so the ClinicalTrials.gov rate limit holds across all uvicorn workers
+    and replicas rather than per process. While Redis is unreachable each
+    worker falls back to its own in-process bucket at the same rate.
+    """
+    def __init__(self, rate: float, capacity: Optional[float] = None, key: str = "rate_limit:ctgov"):
+        self.rate = rate
+        self.capacity = capacity or max(rate, 1.0)
+        self.key = key
+        self.redis = Redis(
+            host=settings.REDIS_HOST,
+            port=settings.REDIS_PORT,
+            db=settings.REDIS_DB,
+            password=settings.REDIS_PASSWORD if settings.REDIS_PASSWORD else None,
+            decode_responses=True
+        )
+        self._script = self.redis.register_script(TOKEN_BUCKET_SCRIPT)
+        self.fallback = TokenBucket(rate, self.capacity)
+        self._using_fallback = False
+
+    async def _reserve(self, cost: float = 1.0, pause: float = 0.0) -> float:
+        try:
+            wait = await self._script(keys=[self.key], args=[self.rate, self.capacity, cost, pause])
+        except RedisError as e:
+            if not self._using_fallback:
+                logger.warning(f"Shared rate limit unavailable, pacing this worker locally: {str(e)}")
+                self._using_fallback = True
+            return self.fallback._reserve(cost, pause)
+        if self._using_fallback:
+            logger.info("Shared rate limit available again")
+            self._using_fallback = False
+        return float(wait)
+
+    async def acquire(self) -> float:
+        """Wait for a token and return the number of seconds spent waiting."""
+        wait = await self._reserve()
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return wait
+
+    async def pause(self, seconds: float):
+        """Hold back every worker for at least `seconds`."""
+        await self._reserve(cost=0.0, pause=seconds)
+
+    async def close(self):
+        """Close Redis connection."""
+        await self.redis.close()
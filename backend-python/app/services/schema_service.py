@@ -3,10 +3,18 @@ Service for handling schema operations using the schema manager.
 Provides high-level operations for schema-related tasks.
 """
 
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
 from datetime import datetime
+import asyncio
 from app.system_specs.schema_manager import schema_manager, SchemaContext
 from app.config.database import MongoDB
+from app.config.settings import get_settings
+from app.services.cache_service import CacheService
+
+settings = get_settings()
+
+# Context switches move the collection's cache keys to a new namespace
+cache_service = CacheService()
 
 
 class SchemaService:
@@ -35,6 +43,29 @@ class SchemaService:
             context=context
         )
 
+    @staticmethod
+    async def validation_errors(
+        collection_name: str,
+        documents: List[Dict[str, Any]],
+        context: Optional[SchemaContext] = None
+        ) -> List[Optional[str]]:
+        """
+        Validate many documents off the event loop.
+        Returns one entry per document: None if valid, otherwise the error.
+        """
+        schema_name = SchemaService.SINGULAR_EXCEPTIONS.get(collection_name, collection_name.rstrip('s'))
+        chunk_size = settings.SCHEMA_VALIDATION_CHUNK
+
+        def validate_chunk(chunk: List[Dict[str, Any]]) -> List[Optional[str]]:
+            return [schema_manager.validation_error(schema_name, document, context) for document in chunk]
+
+        # Chunks run in the default thread pool, so the loop keeps serving requests in between
+        chunks = await asyncio.gather(*(
+            asyncio.to_thread(validate_chunk, documents[i:i + chunk_size])
+            for i in range(0, len(documents), chunk_size)
+        ))
+        return [error for chunk in chunks for error in chunk]
+
     @staticmethod
     async def migrate_document(
         collection_name: str,
@@ -109,6 +140,23 @@ class SchemaService:
         
         # Set active context in schema manager
         schema_manager.set_active_context(context)
+
+        # Values cached in the old context's shape must not be served any more
+        await cache_service.bump_namespace(
+            collection_name,
+            SchemaContext(context).value,
+            SchemaService.schema_version(collection_name, context)
+        )
+
+    @staticmethod
+    def schema_version(collection_name: str, context: SchemaContext) -> str:
+        """Latest registered schema version of a collection in a context, "0" when none is registered"""
+        schema_name = SchemaService.SINGULAR_EXCEPTIONS.get(collection_name, collection_name.rstrip('s'))
+        versions = [
+            version for version, metadata in schema_manager._schemas.get(schema_name, {}).items()
+            if metadata.context == context
+        ]
+        return str(max(versions)) if versions else "0"
     
     @staticmethod
     async def get_collection_context(collection_name: str) -> SchemaContext:
@@ -0,0 +1,272 @@
+"""
+Trial analytics engines: in-process over trial documents, or a MongoDB ``$facet`` aggregation.
+
+Both compute the TrialAnalytics metrics from the ClinicalTrials.gov fields of each trial
+(``protocolSection``) with the same rules, so either can serve a company's analytics:
+
+- phase_distribution: first listed phase, "Not Specified" when there is none
+- status_summary: overallStatus, "Unknown" when missing
+- therapeutic_areas: occurrences of each condition
+- enrollment_stats: total, average, median and size buckets of positive integer enrollment counts
+- timeline: trials per start year, average and median start-to-completion days
+  (dates as YYYY-MM or YYYY-MM-DD; YYYY-MM counts from the first of the month)
+"""
+
+from typing import Any, Dict, Iterable, List, Optional
+from collections import Counter
+from datetime import datetime
+from statistics import mean, median
+import re
+
+PHASES = "protocolSection.designModule.phases"
+STATUS = "protocolSection.statusModule.overallStatus"
+CONDITIONS = "protocolSection.conditionsModule.conditions"
+ENROLLMENT = "protocolSection.designModule.enrollmentInfo.count"
+START_DATE = "protocolSection.statusModule.startDateStruct.date"
+COMPLETION_DATE = "protocolSection.statusModule.completionDateStruct.date"
+ANALYSED_FIELDS = (PHASES, STATUS, CONDITIONS, ENROLLMENT, START_DATE, COMPLETION_DATE)
+
+# (bucket, lowest, highest); None is unbounded
+ENROLLMENT_RANGES = [("1-100", 1, 100), ("101-500", 101, 500), ("501-1000", 501, 1000), (">1000", 1001, None)]
+DATE_PATTERN = "^[0-9]{4}-[0-9]{2}(-[0-9]{2})?$"
+DAY_MS = 24 * 60 * 60 * 1000
+
+
+class TrialAnalyticsEngine:
+    """The two implementations of the trial analytics, and the shape they both return."""
+
+    @staticmethod
+    def _get(document: Dict[str, Any], path: str) -> Any:
+        for part in path.split("."):
+            if not isinstance(document, dict):
+                return None
+            document = document.get(part)
+        return document
+
+    @staticmethod
+    def _parse_date(value: Any) -> Optional[datetime]:
+        if not isinstance(value, str) or not re.match(DATE_PATTERN, value):
+            return None
+        try:
+            return datetime.strptime(value if len(value) == 10 else value + "-01", "%Y-%m-%d")
+        except ValueError:
+            return None
+
+    @staticmethod
+    def _distribution(counts: Dict[str, int]) -> Dict[str, int]:
+        return {bucket: counts[bucket] for bucket, _, _ in ENROLLMENT_RANGES if counts.get(bucket)}
+
+    @staticmethod
+    def empty() -> Dict[str, Any]:
+        return TrialAnalyticsEngine._result(0, {}, {}, {}, [], {}, [])
+
+    @staticmethod
+    def _result(
+        total: int,
+        phases: Dict[Any, int],
+        statuses: Dict[Any, int],
+        conditions: Dict[str, int],
+        enrollments: List[int],
+        start_years: Dict[str, int],
+        durations: List[float]
+    ) -> Dict[str, Any]:
+        buckets = Counter()
+        for count in enrollments:
+            for bucket, lowest, highest in ENROLLMENT_RANGES:
+                if count >= lowest and (highest is None or count <= highest):
+                    buckets[bucket] += 1
+                    break
+        return {
+            "phase_distribution": dict(phases),
+            "status_summary": dict(statuses),
+            "therapeutic_areas": dict(conditions),
+            "total_trials": total,
+            "enrollment_stats": {
+                "total": sum(enrollments),
+                "average": mean(enrollments) if enrollments else 0,
+                "median": median(enrollments) if enrollments else 0,
+                "distribution": TrialAnalyticsEngine._distribution(buckets),
+            },
+            "timeline": {
+                "start_years": dict(start_years),
+                "average_duration_days": mean(durations) if durations else 0,
+                "median_duration_days": median(durations) if durations else 0,
+            },
+        }
+
+    @staticmethod
+    def compute(trials: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
+        """Analytics of trial documents, computed in Python."""
+        get = TrialAnalyticsEngine._get
+        total = 0
+        phases, statuses, conditions, start_years = Counter(), Counter(), Counter(), Counter()
+        enrollments, durations = [], []
+        for trial in trials:
+            total += 1
+            trial_phases = get(trial, PHASES)
+            first = trial_phases[0] if isinstance(trial_phases, list) and trial_phases else None
+            phases[first if first is not None else "Not Specified"] += 1
+            status = get(trial, STATUS)
+            statuses[status if status is not None else "Unknown"] += 1
+            trial_conditions = get(trial, CONDITIONS)
+            if isinstance(trial_conditions, list):
+                conditions.update(condition for condition in trial_conditions if isinstance(condition, str))
+            count = get(trial, ENROLLMENT)
+            if type(count) is int and count > 0:
+                enrollments.append(count)
+            start = get(trial, START_DATE)
+            if isinstance(start, str) and start:
+                start_years[start[:4]] += 1
+            started = TrialAnalyticsEngine._parse_date(start)
+            completed = TrialAnalyticsEngine._parse_date(get(trial, COMPLETION_DATE))
+            if started and completed and completed >= started:
+                durations.append((completed - started).days)
+        return TrialAnalyticsEngine._result(
+            total, phases, statuses, conditions, enrollments, start_years, durations
+        )
+
+    @staticmethod
+    def _median(values: str) -> Dict[str, Any]:
+        """Median of a sorted array field, as computed by statistics.median."""
+        last = {"$subtract": [{"$size": values}, 1]}
+        return {"$cond": [
+            {"$eq": [{"$size": values}, 0]},
+            0,
+            {"$divide": [
+                {"$add": [
+                    {"$arrayElemAt": [values, {"$toInt": {"$floor": {"$divide": [last, 2]}}}]},
+                    {"$arrayElemAt": [values, {"$toInt": {"$ceil": {"$divide": [last, 2]}}}]},
+                ]},
+                2
+            ]}
+        ]}
+
+    @staticmethod
+    def _date(path: str) -> Dict[str, Any]:
+        """Aggregation expression parsing a date field like _parse_date, null when it does not parse."""
+        field = f"${path}"
+        text = {"$cond": [{"$eq": [{"$strLenCP": field}, 7]}, {"$concat": [field, "-01"]}, field]}
+        parsed = {"$dateFromString": {"dateString": "$$text", "format": "%Y-%m-%d", "onError": None}}
+        # Only dates that format back unchanged, so impossible days (2021-02-30) are rejected as strptime does
+        round_trip = {"$cond": [
+            {"$eq": [{"$dateToString": {"date": "$$date", "format": "%Y-%m-%d"}}, "$$text"]}, "$$date", None
+        ]}
+        return {"$cond": [
+            {"$eq": [{"$type": field}, "string"]},
+            {"$cond": [
+                {"$regexMatch": {"input": field, "regex": DATE_PATTERN}},
+                {"$let": {"vars": {"text": text}, "in": {"$let": {"vars": {"date": parsed}, "in": round_trip}}}},
+                None
+            ]},
+            None
+        ]}
+
+    @staticmethod
+    def _stats(value: Dict[str, Any], buckets: bool) -> List[Dict[str, Any]]:
+        """Stages reducing per-trial ``value``s (nulls dropped) to total, average, median per company."""
+        group = {
+            "_id": "$company_id",
+            "total": {"$sum": "$value"},
+            "average": {"$avg": "$value"},
+            "values": {"$push": "$value"},
+        }
+        if buckets:
+            for bucket, lowest, highest in ENROLLMENT_RANGES:
+                within = [{"$gte": ["$value", lowest]}] + ([{"$lte": ["$value", highest]}] if highest else [])
+                group[bucket] = {"$sum": {"$cond": [{"$and": within}, 1, 0]}}
+        return [
+            {"$project": {"company_id": 1, "value": value}},
+            {"$match": {"value": {"$ne": None}}},
+            {"$sort": {"value": 1}},
+            {"$group": group},
+            {"$addFields": {"median": TrialAnalyticsEngine._median("$values")}},
+            {"$project": {"values": 0}},
+        ]
+
+    @staticmethod
+    def pipeline(company_ids: List[str]) -> List[Dict[str, Any]]:
+        """A single $facet aggregation over ``trials`` returning only per-company aggregates."""
+        def count_by(key: Dict[str, Any]) -> List[Dict[str, Any]]:
+            return [{"$group": {"_id": {"company_id": "$company_id", "key": key}, "count": {"$sum": 1}}}]
+
+        enrollment = f"${ENROLLMENT}"
+        start = f"${START_DATE}"
+        started = TrialAnalyticsEngine._date(START_DATE)
+        completed = TrialAnalyticsEngine._date(COMPLETION_DATE)
+        return [
+            {"$match": {"company_id": {"$in": list(company_ids)}}},
+            {"$facet": {
+                "totals": [{"$group": {"_id": "$company_id", "count": {"$sum": 1}}}],
+                "phases": count_by({"$ifNull": [
+                    {"$cond": [{"$isArray": f"${PHASES}"}, {"$arrayElemAt": [f"${PHASES}", 0]}, None]},
+                    "Not Specified"
+                ]}),
+                "statuses": count_by({"$ifNull": [f"${STATUS}", "Unknown"]}),
+                "conditions": [
+                    {"$match": {CONDITIONS: {"$type": "array"}}},
+                    {"$unwind": f"${CONDITIONS}"},
+                    {"$match": {CONDITIONS: {"$type": "string"}}},
+                    *count_by(f"${CONDITIONS}"),
+                ],
+                "enrollment": TrialAnalyticsEngine._stats({"$cond": [
+                    {"$and": [
+                        {"$in": [{"$type": enrollment}, ["int", "long"]]},
+                        {"$gt": [enrollment, 0]}
+                    ]},
+                    enrollment,
+                    None
+                ]}, buckets=True),
+                "start_years": [
+                    {"$match": {"$expr": {"$and": [
+                        {"$eq": [{"$type": start}, "string"]},
+                        {"$gt": [{"$strLenCP": start}, 0]}
+                    ]}}},
+                    *count_by({"$substrCP": [start, 0, 4]}),
+                ],
+                "durations": TrialAnalyticsEngine._stats({"$let": {
+                    "vars": {"started": started, "completed": completed},
+                    "in": {"$cond": [
+                        {"$and": [
+                            {"$ne": ["$$started", None]},
+                            {"$ne": ["$$completed", None]},
+                            {"$gte": ["$$completed", "$$started"]}
+                        ]},
+                        {"$divide": [{"$subtract": ["$$completed", "$$started"]}, DAY_MS]},
+                        None
+                    ]}
+                }}, buckets=False),
+            }},
+        ]
+
+    @staticmethod
+    def shape(company_ids: List[str], facets: Dict[str, List[Dict[str, Any]]]) -> Dict[str, Dict[str, Any]]:
+        """Per-company analytics, in ``compute``'s shape, from the single $facet result document."""
+        analytics = {company_id: TrialAnalyticsEngine.empty() for company_id in company_ids}
+        for row in facets["totals"]:
+            analytics[row["_id"]]["total_trials"] = row["count"]
+        for facet, field in (
+            ("phases", "phase_distribution"), ("statuses", "status_summary"), ("conditions", "therapeutic_areas")
+        ):
+            for row in facets[facet]:
+                analytics[row["_id"]["company_id"]][field][row["_id"]["key"]] = row["count"]
+        for row in facets["start_years"]:
+            analytics[row["_id"]["company_id"]]["timeline"]["start_years"][row["_id"]["key"]] = row["count"]
+        for row in facets["enrollment"]:
+            analytics[row["_id"]]["enrollment_stats"] = {
+                "total": row["total"],
+                "average": row["average"],
+                "median": row["median"],
+                "distribution": TrialAnalyticsEngine._distribution(row),
+            }
+        for row in facets["durations"]:
+            timeline = analytics[row["_id"]]["timeline"]
+            timeline["average_duration_days"] = row["average"]
+            timeline["median_duration_days"] = row["median"]
+        return analytics
+
+    @staticmethod
+    async def aggregate(collection, company_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Analytics for each of ``company_ids`` computed by MongoDB over ``collection`` (trials)."""
+        cursor = collection.aggregate(TrialAnalyticsEngine.pipeline(company_ids), allowDiskUse=True)
+        facets = await cursor.to_list(length=1)
+        return TrialAnalyticsEngine.shape(company_ids, facets[0])
@@ -6,6 +6,9 @@ Current Implementation:
   - save_company_trials: Store trials and analytics for a company
   - get_company_trials: Retrieve trials and analytics
   - save_trial_analysis: Store analysis matching Node.js structure
+  - normalize_all: Move embedded trial arrays into trials + company_trial_links
+- TrialService: Trial documents in the trials collection
+  - iter_company_trials: Stream a company's trials, optionally projected, one cursor batch in memory
 
 Future Implementation:
 - Advanced trial analysis (see future_concepts/future_trial_analysis.py)
@@ -13,12 +16,17 @@ Future Implementation:
 - Comparative analysis (see future_concepts/future_comparative_analysis.py)
 """
 
-from typing import Dict, List, Any, Optional
+from typing import AsyncIterator, Dict, List, Any, Optional, Tuple
 from datetime import datetime
+import asyncio
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError
 from ..models.trial import ClinicalTrial, TrialAnalytics, TrialAnalysis
 from ..config.database import MongoDB
+from ..config.settings import get_settings
 from bson import ObjectId
 from .cache_service import CacheService
+from .trial_analytics_engine import ANALYSED_FIELDS, TrialAnalyticsEngine
 from ..services.schema_service import SchemaService
 from ..system_specs.schema_manager import SchemaContext
 import logging
@@ -30,8 +38,12 @@ from .future_concepts.future_ml_analysis import FutureMLAnalyzer
 from .future_concepts.future_comparative_analysis import FutureComparativeAnalyzer
 """
 
+settings = get_settings()
 logger = logging.getLogger("clinical_trials")
 
+# Writes below invalidate everything cached for the company they touch
+cache_service = CacheService()
+
 class TrialAnalysisService:
     """
     Generic service for analyzing clinical trials data.
@@ -44,15 +56,8 @@ class TrialAnalysisService:
         analysis_options: Optional[Dict[str, Any]] = None
     ) -> TrialAnalytics:
         """Enhanced batch analysis with multiple analysis types."""
-        analyzer = FutureAdvancedTrialAnalyzer()
-
         # Basic analysis - currently active
-        basic_analysis = {
-            "phases": analyzer.analyze_phases(trials),
-            "therapeutic_areas": analyzer.analyze_therapeutic_areas(trials),
-            "enrollment": analyzer.analyze_enrollment(trials),
-            "timeline": analyzer.analyze_timeline(trials)
-        }
+        basic_analysis = TrialAnalyticsEngine.compute(trial.model_dump() for trial in trials)
 
         # Future advanced analysis features - currently disabled
         # if analysis_options and analysis_options.get("include_advanced", False):
@@ -81,10 +86,162 @@ class TrialAnalysisService:
 
         return TrialAnalytics(**basic_analysis)
 
+    @staticmethod
+    async def analyze_company(company_id: str) -> TrialAnalytics:
+        """Analytics of a company's trials in the trials collection."""
+        return (await TrialAnalysisService.analyze_companies([company_id]))[company_id]
+
+    @staticmethod
+    async def analyze_companies(company_ids: List[str]) -> Dict[str, TrialAnalytics]:
+        """
+        Analytics of each company's trials in the trials collection, in one query.
+
+        TRIAL_ANALYTICS_ENGINE "aggregation" has MongoDB compute them with
+        one $facet pipeline and return only the aggregates; "python" reads
+        the analysed fields of every trial and computes them here.
+        """
+        async with MongoDB.get_collection(TrialService.COLLECTION) as collection:
+            if settings.TRIAL_ANALYTICS_ENGINE == "aggregation":
+                analytics = await TrialAnalyticsEngine.aggregate(collection, company_ids)
+            else:
+                projection = {"company_id": 1, **{field: 1 for field in ANALYSED_FIELDS}}
+                trials = {company_id: [] for company_id in company_ids}
+                async for trial in collection.find({"company_id": {"$in": list(company_ids)}}, projection):
+                    trials[trial["company_id"]].append(trial)
+                analytics = {company_id: TrialAnalyticsEngine.compute(trials[company_id]) for company_id in company_ids}
+        return {company_id: TrialAnalytics(**value) for company_id, value in analytics.items()}
+
 class CompanyTrialService:
-    """Service specifically for handling company-related trial operations."""
+    """
+    Service specifically for handling company-related trial operations.
+
+    A company's trials are stored one of two ways (COMPANY_TRIALS_STORAGE):
+    embedded as arrays in its ``companies`` document (``trials`` from this
+    service, ``clinicalTrials`` in the Node.js shape), or ``normalized``:
+    each trial once in ``trials`` keyed by NCT ID, with ordered rows in
+    ``company_trial_links`` saying which company lists it under which
+    field. Reads handle both, so ``normalize_all`` can move companies over
+    while the app is serving; a company whose array is present is read
+    from it. The Node.js backend only reads embedded arrays, so switch
+    only once it no longer reads trials from ``companies``.
+    """
     
     COLLECTION = "companies"
+    LINKS = "company_trial_links"
+    EMBEDDED_FIELDS = ("trials", "clinicalTrials")
+
+    @staticmethod
+    def normalized() -> bool:
+        return settings.COMPANY_TRIALS_STORAGE == "normalized"
+
+    @staticmethod
+    def trial_nct_id(trial: Dict[str, Any]) -> Optional[str]:
+        """The NCT ID of an embedded trial, in any of the shapes stored on companies."""
+        return (
+            trial.get("nct_id")
+            or trial.get("nctId")
+            or trial.get("protocolSection", {}).get("identificationModule", {}).get("nctId")
+        )
+
+    @staticmethod
+    async def _link_trials(company_id: str, field: str, trials: List[Dict[str, Any]]):
+        """
+        Upsert ``trials`` into the trials collection and make them the company's ``field`` list, in order.
+
+        The trials are stamped with ``company_id`` like TrialService writes, so the analytics and the
+        change stream attribute them to this company; companies they are taken from are invalidated.
+        """
+        now = datetime.utcnow()
+        latest: Dict[str, Tuple[int, Dict[str, Any]]] = {}
+        for position, trial in enumerate(trials):
+            nct_id = CompanyTrialService.trial_nct_id(trial)
+            if not nct_id:
+                raise ValueError(f"Trial {position} in {field} of company {company_id} has no NCT ID")
+            document = {key: value for key, value in trial.items() if key != "_id"}
+            document.update(nct_id=nct_id, company_id=company_id, updated_at=now)
+            latest[nct_id] = (position, document)
+
+        owners = await TrialService._owners(list(latest))
+        _, errors = await TrialService._bulk_upsert(sorted(latest.values(), key=lambda item: item[0]))
+        await TrialService._invalidate_previous_owners(company_id, owners)
+        if errors:
+            raise ValueError(f"Storing {len(errors)} trials of company {company_id} failed: {errors[0]['error']}")
+
+        async with MongoDB.get_collection(CompanyTrialService.LINKS) as links:
+            if latest:
+                await links.bulk_write([
+                    UpdateOne(
+                        {"company_id": company_id, "field": field, "nct_id": nct_id},
+                        {"$set": {"position": position, "updated_at": now}},
+                        upsert=True
+                    )
+                    for nct_id, (position, _) in latest.items()
+                ], ordered=False)
+            await links.delete_many({"company_id": company_id, "field": field, "nct_id": {"$nin": list(latest)}})
+        await cache_service.clear_missing("trial", *latest)
+
+    @staticmethod
+    async def _unlink_trials(company_id: str, *fields: str):
+        async with MongoDB.get_collection(CompanyTrialService.LINKS) as links:
+            await links.delete_many({"company_id": company_id, "field": {"$in": list(fields)}})
+
+    @staticmethod
+    async def _set_company_trials(
+        collection,
+        company_id: str,
+        field: str,
+        trials: List[Dict[str, Any]],
+        update_data: Dict[str, Any]
+    ) -> Optional[Dict[str, Any]]:
+        """$set ``update_data`` and the company's ``field`` trials in the configured storage; None if no company."""
+        if not CompanyTrialService.normalized():
+            update = {**update_data, field: trials}
+            previous = await collection.find_one_and_update({"_id": ObjectId(company_id)}, {"$set": update})
+            if previous is None:
+                return None
+            if field not in previous:
+                # The list was stored normalized until now; its links would shadow the array in get_trial_details
+                await CompanyTrialService._unlink_trials(company_id, field)
+            return {**previous, **update}
+
+        await CompanyTrialService._link_trials(company_id, field, trials)
+        update = {"$set": update_data, "$unset": {field: ""}}
+        result = await collection.find_one_and_update({"_id": ObjectId(company_id)}, update, return_document=True)
+        if result is None:
+            await CompanyTrialService._unlink_trials(company_id, field)
+        return result
+
+    @staticmethod
+    async def linked_trials(
+        company_id: str,
+        field: Optional[str] = "trials",
+        projection: Optional[Dict[str, Any]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        A normalized company's trials, joined from the trials collection in list order.
+
+        ``projection`` limits the trial fields read (``_id`` is left out
+        unless asked for); ``field`` None returns every linked trial.
+        """
+        query = {"company_id": company_id}
+        if field is not None:
+            query["field"] = field
+        async with MongoDB.get_collection(CompanyTrialService.LINKS) as links:
+            cursor = links.find(query, {"nct_id": 1, "_id": 0}).sort([("field", 1), ("position", 1)])
+            nct_ids = [link["nct_id"] async for link in cursor]
+        if not nct_ids:
+            return []
+
+        projection = dict(projection or {"_id": 0})
+        if any(projection.values()):
+            projection["nct_id"] = 1  # needed to restore the list order
+        by_nct_id = {}
+        async with MongoDB.get_collection(TrialService.COLLECTION) as collection:
+            async for trial in collection.find({"nct_id": {"$in": nct_ids}}, projection):
+                if "_id" in trial:
+                    trial["_id"] = str(trial["_id"])
+                by_nct_id[trial["nct_id"]] = trial
+        return [by_nct_id[nct_id] for nct_id in nct_ids if nct_id in by_nct_id]
 
     @staticmethod
     async def save_company_trials(
@@ -120,21 +277,22 @@ class CompanyTrialService:
                 logger.error("Update data validation failed")
                 raise ValueError("Invalid update data for current schema context")
             
-            result = await collection.find_one_and_update(
-                {"_id": ObjectId(company_id)},
-                {"$set": update_data},
-                return_document=True
+            trial_documents = update_data.pop("trials")
+            result = await CompanyTrialService._set_company_trials(
+                collection, company_id, "trials", trial_documents, update_data
             )
             
             if not result:
                 raise ValueError("Company not found")
 
+            await cache_service.invalidate_company(company_id)
             result["_id"] = str(result["_id"])
+            result["trials"] = trial_documents
             return result
 
     @staticmethod
-    async def get_company_trials(company_id: str) -> Dict[str, Any]:
-        """Get all trials and analytics for a company."""
+    async def get_company_trials(company_id: str, projection: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Get all trials and analytics for a company; ``projection`` applies to normalized trials."""
         context = await SchemaService.get_collection_context(CompanyTrialService.COLLECTION)
         async with MongoDB.get_collection(CompanyTrialService.COLLECTION) as collection:
             result = await collection.find_one(
@@ -155,8 +313,10 @@ class CompanyTrialService:
                 )
             
             result["_id"] = str(result["_id"])
+            if "trials" not in result:
+                result["trials"] = await CompanyTrialService.linked_trials(company_id, "trials", projection)
             return {
-                "trials": result.get("trials", []),
+                "trials": result["trials"],
                 "analytics": result.get("trial_analytics", {}),
                 "updated_at": result.get("updated_at")
             }
@@ -187,12 +347,20 @@ class CompanyTrialService:
             if not result:
                 raise ValueError("Company not found")
             
+            await cache_service.invalidate_company(company_id)
             result["_id"] = str(result["_id"])
             return result
 
     @staticmethod
     async def get_trial_details(company_id: str, trial_id: str) -> Optional[Dict[str, Any]]:
         """Get detailed information for a specific trial."""
+        # Normalized companies: an indexed link lookup instead of scanning the embedded array
+        async with MongoDB.get_collection(CompanyTrialService.LINKS) as links:
+            linked = await links.find_one({"company_id": company_id, "nct_id": trial_id}, {"_id": 1})
+        if linked:
+            async with MongoDB.get_collection(TrialService.COLLECTION) as collection:
+                return await collection.find_one({"nct_id": trial_id}, {"_id": 0})
+
         context = await SchemaService.get_collection_context(CompanyTrialService.COLLECTION)
         async with MongoDB.get_collection(CompanyTrialService.COLLECTION) as collection:
             result = await collection.find_one(
@@ -221,7 +389,6 @@ class CompanyTrialService:
             async with MongoDB.get_collection("companies") as collection:
                 # Transform incoming data to match Node.js structure exactly
                 update_data = {
-                    "clinicalTrials": analysis_data["studies"],
                     "trialAnalytics": {
                         "phaseDistribution": analysis_data["analytics"]["phaseDistribution"],
                         "statusSummary": analysis_data["analytics"]["statusSummary"],
@@ -232,23 +399,97 @@ class CompanyTrialService:
                     "trialsCount": len(analysis_data["studies"])  # Calculate from array length
                 }
                 
-                result = await collection.update_one(
-                    {"_id": ObjectId(company_id)},
-                    {"$set": update_data}
+                result = await CompanyTrialService._set_company_trials(
+                    collection, company_id, "clinicalTrials", analysis_data["studies"], update_data
                 )
                 
-                if result.modified_count == 0:
+                if result is None:
                     raise ValueError(f"Company {company_id} not found")
                     
+                await cache_service.invalidate_company(company_id)
                 return {
                     "success": True,
-                    "data": update_data
+                    "data": {"clinicalTrials": analysis_data["studies"], **update_data}
                 }
                 
         except Exception as e:
             logger.error(f"Error in save_trial_analysis: {str(e)}")
             raise e
 
+    @staticmethod
+    async def normalize_company(company_id: str) -> Optional[int]:
+        """
+        Move one company's embedded trial arrays into trials and links.
+
+        Returns the number of trials moved, or None if the company was
+        written meanwhile (its arrays are left in place for the next run).
+        """
+        fields = {field: 1 for field in CompanyTrialService.EMBEDDED_FIELDS}
+        async with MongoDB.get_collection(CompanyTrialService.COLLECTION) as collection:
+            company = await collection.find_one(
+                {"_id": ObjectId(company_id)}, {**fields, "updated_at": 1, "lastUpdated": 1}
+            )
+            if company is None:
+                return 0
+            embedded = {field: company[field] for field in fields if isinstance(company.get(field), list)}
+            for field, trials in embedded.items():
+                await CompanyTrialService._link_trials(company_id, field, trials)
+
+            # Only drop the arrays if neither backend rewrote them while they were being copied
+            result = await collection.update_one(
+                {
+                    "_id": company["_id"],
+                    "updated_at": company.get("updated_at"),
+                    "lastUpdated": company.get("lastUpdated")
+                },
+                {"$unset": {field: "" for field in fields}}
+            )
+            if result.matched_count == 0:
+                # Undo only the links of arrays the company still holds; a field that is gone was
+                # written in normalized storage meanwhile, and its links are that write's
+                current = await collection.find_one({"_id": company["_id"]}, fields) or {}
+                stale = [field for field in embedded if isinstance(current.get(field), list)]
+                if stale:
+                    await CompanyTrialService._unlink_trials(company_id, *stale)
+                return None
+        await cache_service.invalidate_company(company_id)
+        return sum(len(trials) for trials in embedded.values())
+
+    @staticmethod
+    async def normalize_all(batch_size: Optional[int] = None, pause: float = 0.0) -> Dict[str, Any]:
+        """
+        Online migration to normalized storage: companies still holding trial arrays, ``batch_size`` at a time.
+
+        Safe to stop and rerun. Companies that were written during their
+        move, or whose trials could not be stored, are reported in
+        ``skipped`` and left embedded.
+        """
+        batch_size = batch_size or settings.COMPANY_TRIALS_MIGRATION_BATCH
+        report = {"companies": 0, "trials": 0, "skipped": []}
+        query = {"$or": [{field: {"$exists": True}} for field in CompanyTrialService.EMBEDDED_FIELDS]}
+        skipped_ids = []
+        while True:
+            async with MongoDB.get_collection(CompanyTrialService.COLLECTION) as collection:
+                cursor = collection.find({**query, "_id": {"$nin": skipped_ids}}, {"_id": 1}).limit(batch_size)
+                batch = [company["_id"] async for company in cursor]
+            if not batch:
+                return report
+            for company_id in batch:
+                try:
+                    moved = await CompanyTrialService.normalize_company(str(company_id))
+                except ValueError as e:
+                    logger.warning(f"Normalizing trials of company {company_id} failed: {str(e)}")
+                    moved = None
+                if moved is None:
+                    skipped_ids.append(company_id)
+                    report["skipped"].append(str(company_id))
+                else:
+                    report["companies"] += 1
+                    report["trials"] += moved
+            logger.info(f"Normalized trials of {report['companies']} companies ({report['trials']} trials) so far")
+            if pause:
+                await asyncio.sleep(pause)
+
 class TrialService:
     """Core trial data operations matching Node.js backend"""
     COLLECTION = "trials"
@@ -274,51 +515,184 @@ class TrialService:
 
     @staticmethod
     async def save_trial_data(company_id: str, trials: List[Dict[str, Any]]) -> Dict[str, Any]:
-        """Save trial data."""
+        """Save trial data; nothing is written if any trial fails validation."""
+        context = await SchemaService.get_collection_context(TrialService.COLLECTION)
+        for trial in trials:
+            TrialService._stamp(company_id, trial)
+
+        # Validate trial data against current context
+        if any(await SchemaService.validation_errors(TrialService.COLLECTION, trials, context)):
+            logger.error("Trial data validation failed")
+            raise ValueError("Invalid trial data for current schema context")
+
+        # Concurrent batches must not race on one NCT ID; the last occurrence wins, as if written in order
+        latest = {trial["nct_id"]: (index, trial) for index, trial in enumerate(trials)}
+        owners = await TrialService._owners(list(latest))
+        counts, errors = await TrialService._bulk_upsert(sorted(latest.values(), key=lambda item: item[0]))
+        await cache_service.invalidate_company(company_id)
+        await TrialService._invalidate_previous_owners(company_id, owners)
+        await cache_service.clear_missing("trial", *(trial["nct_id"] for trial in trials))
+        return {"success": not errors, "count": len(trials) - len(errors), **counts, "errors": errors}
+
+    @staticmethod
+    async def bulk_save_trials(
+        company_id: str,
+        trials: List[Dict[str, Any]],
+        batch_size: Optional[int] = None,
+        concurrency: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """
+        Validate and upsert a large portfolio, saving every trial that can be saved.
+
+        Validation runs in worker threads; upserts go out as unordered
+        bulk_write batches of ``batch_size`` (TRIAL_BULK_BATCH_SIZE), at most
+        ``concurrency`` (TRIAL_BULK_CONCURRENCY) at a time. Trials that fail
+        validation or their write are reported in ``errors`` as
+        ``{"index", "nct_id", "error"}``, ``index`` being their position in
+        ``trials``. When an NCT ID repeats, its last occurrence is written.
+        """
         context = await SchemaService.get_collection_context(TrialService.COLLECTION)
+        errors = []
+        latest: Dict[str, Tuple[int, Dict[str, Any]]] = {}
+        for trial in trials:
+            TrialService._stamp(company_id, trial)
+        validation_errors = await SchemaService.validation_errors(TrialService.COLLECTION, trials, context)
+        for index, (trial, error) in enumerate(zip(trials, validation_errors)):
+            if not trial.get("nct_id"):
+                errors.append({"index": index, "nct_id": None, "error": "Missing nct_id"})
+            elif error is not None:
+                errors.append({"index": index, "nct_id": trial["nct_id"], "error": error})
+            else:
+                latest[trial["nct_id"]] = (index, trial)
+
+        owners = await TrialService._owners(list(latest))
+        counts, write_errors = await TrialService._bulk_upsert(
+            sorted(latest.values(), key=lambda item: item[0]), batch_size, concurrency
+        )
+        errors = sorted(errors + write_errors, key=lambda error: error["index"])
+        failed = {error["nct_id"] for error in write_errors}
+        await cache_service.invalidate_company(company_id)
+        await TrialService._invalidate_previous_owners(company_id, owners)
+        await cache_service.clear_missing("trial", *(nct_id for nct_id in latest if nct_id not in failed))
+        logger.info(f"Bulk saved {len(trials) - len(errors)} of {len(trials)} trials for company {company_id}")
+        return {"success": not errors, "count": len(trials) - len(errors), **counts, "errors": errors}
+
+    @staticmethod
+    def _stamp(company_id: str, trial: Dict[str, Any]):
+        trial["company_id"] = company_id
+        trial["updated_at"] = datetime.utcnow()
+        if not trial.get("created_at"):
+            trial["created_at"] = trial["updated_at"]
+
+    @staticmethod
+    async def _owners(nct_ids: List[str]) -> List[str]:
+        """The companies that currently hold any of ``nct_ids``; an upsert moves those trials away from them."""
+        if not nct_ids:
+            return []
         async with MongoDB.get_collection(TrialService.COLLECTION) as collection:
-            for trial in trials:
-                trial["company_id"] = company_id
-                trial["updated_at"] = datetime.utcnow()
-                if not trial.get("created_at"):
-                    trial["created_at"] = trial["updated_at"]
-                
-                # Validate trial data against current context
-                if not await SchemaService.validate_document(TrialService.COLLECTION, trial, context):
-                    logger.error("Trial data validation failed")
-                    raise ValueError("Invalid trial data for current schema context")
-                
-                await collection.find_one_and_update(
-                    {"nct_id": trial["nct_id"]},
-                    {"$set": trial},
-                    upsert=True
-                )
-            
-            return {"success": True, "count": len(trials)}
+            return await collection.distinct("company_id", {"nct_id": {"$in": nct_ids}})
 
     @staticmethod
-    async def get_company_trials(company_id: str) -> List[Dict[str, Any]]:
-        """Get all trials for a company."""
+    async def _invalidate_previous_owners(company_id: str, owners: List[str]):
+        """Invalidate each company other than ``company_id`` that a written trial was taken from, once."""
+        for owner in sorted(set(owners) - {company_id, None}):
+            await cache_service.invalidate_company(owner)
+
+    @staticmethod
+    async def _bulk_upsert(
+        indexed_trials: List[Tuple[int, Dict[str, Any]]],
+        batch_size: Optional[int] = None,
+        concurrency: Optional[int] = None
+    ) -> Tuple[Dict[str, int], List[Dict[str, Any]]]:
+        """Upsert (index, trial) pairs by NCT ID; returns write counts and per-trial write errors."""
+        batch_size = batch_size or settings.TRIAL_BULK_BATCH_SIZE
+        semaphore = asyncio.Semaphore(concurrency or settings.TRIAL_BULK_CONCURRENCY)
+        counts = {"upserted": 0, "matched": 0, "modified": 0}
+        errors = []
+
+        async def write(collection, batch: List[Tuple[int, Dict[str, Any]]]):
+            requests = [UpdateOne({"nct_id": trial["nct_id"]}, {"$set": trial}, upsert=True) for _, trial in batch]
+            async with semaphore:
+                try:
+                    result = (await collection.bulk_write(requests, ordered=False)).bulk_api_result
+                except BulkWriteError as e:
+                    # Unordered: everything but the failed requests was applied
+                    result = e.details
+            for error in result.get("writeErrors", []):
+                index, trial = batch[error["index"]]
+                errors.append({"index": index, "nct_id": trial["nct_id"], "error": error["errmsg"]})
+            counts["upserted"] += result["nUpserted"]
+            counts["matched"] += result["nMatched"]
+            counts["modified"] += result["nModified"]
+
+        async with MongoDB.get_collection(TrialService.COLLECTION) as collection:
+            await asyncio.gather(*(
+                write(collection, indexed_trials[i:i + batch_size])
+                for i in range(0, len(indexed_trials), batch_size)
+            ))
+        return counts, errors
+
+    @staticmethod
+    async def _prepare(trial: Dict[str, Any], context: Optional[SchemaContext]) -> Dict[str, Any]:
+        """Stringify ``_id`` and, when a schema context is given, validate and migrate the document."""
+        if "_id" in trial:
+            trial["_id"] = str(trial["_id"])
+        # Validate and potentially migrate document
+        if context is not None and not await SchemaService.validate_document(TrialService.COLLECTION, trial, context):
+            trial = await SchemaService.migrate_document(
+                collection_name=TrialService.COLLECTION,
+                document=trial,
+                from_context=SchemaContext.LEGACY,
+                to_context=context
+            )
+        return trial
+
+    @staticmethod
+    async def iter_company_trials(
+        company_id: str,
+        projection: Optional[Dict[str, Any]] = None,
+        batch_size: Optional[int] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Yield a company's trials as the cursor returns them, so memory holds one batch rather than the portfolio.
+
+        Whole documents are validated and migrated; projected ones are partial by design and only get
+        their ``_id`` stringified.
+        """
+        context = await SchemaService.get_collection_context(TrialService.COLLECTION) if projection is None else None
+        async with MongoDB.get_collection(TrialService.COLLECTION) as collection:
+            cursor = collection.find({"company_id": company_id}, projection).batch_size(
+                batch_size or settings.READ_BATCH_SIZE
+            )
+            async for trial in cursor:
+                yield await TrialService._prepare(trial, context)
+
+    @staticmethod
+    async def get_company_trials(
+        company_id: str,
+        projection: Optional[Dict[str, Any]] = None,
+        batch_size: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """Get all trials for a company as a list; prefer iter_company_trials for large portfolios."""
+        return [trial async for trial in TrialService.iter_company_trials(company_id, projection, batch_size)]
+
+    @staticmethod
+    async def get_trials_for_companies(company_ids: List[str]) -> Dict[str, List[Dict[str, Any]]]:
+        """Get the trials of several companies in one query, e.g. the misses of CacheService.get_many_trials."""
         context = await SchemaService.get_collection_context(TrialService.COLLECTION)
+        trials_by_company = {company_id: [] for company_id in company_ids}
         async with MongoDB.get_collection(TrialService.COLLECTION) as collection:
-            cursor = collection.find({"company_id": company_id})
-            trials = []
+            cursor = collection.find({"company_id": {"$in": list(company_ids)}}).batch_size(settings.READ_BATCH_SIZE)
             async for trial in cursor:
-                trial["_id"] = str(trial["_id"])
-                # Validate and potentially migrate document
-                if not await SchemaService.validate_document(TrialService.COLLECTION, trial, context):
-                    trial = await SchemaService.migrate_document(
-                        collection_name=TrialService.COLLECTION,
-                        document=trial,
-                        from_context=SchemaContext.LEGACY,
-                        to_context=context
-                    )
-                trials.append(trial)
-            return trials
+                trial = await TrialService._prepare(trial, context)
+                trials_by_company[trial["company_id"]].append(trial)
+            return trials_by_company
 
     @staticmethod
     async def get_trial_by_nct_id(nct_id: str) -> Optional[Dict[str, Any]]:
-        """Get trial by NCT ID."""
+        """Get trial by NCT ID; unknown ids are answered from the negative cache for a while."""
+        if await cache_service.is_missing("trial", nct_id):
+            return None
         context = await SchemaService.get_collection_context(TrialService.COLLECTION)
         async with MongoDB.get_collection(TrialService.COLLECTION) as collection:
             result = await collection.find_one({"nct_id": nct_id})
@@ -333,4 +707,5 @@ class TrialService:
                         to_context=context
                     )
                 return result
+            await cache_service.set_missing("trial", nct_id)
             return None 
\ No newline at end of file
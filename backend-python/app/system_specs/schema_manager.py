@@ -198,12 +198,22 @@ class SchemaManager:
         version: Optional[SchemaVersion] = None
     ) -> bool:
         """Validate data against a schema version"""
+        return self.validation_error(name, data, context, version) is None
+
+    def validation_error(
+        self,
+        name: str,
+        data: Dict[str, Any],
+        context: Optional[SchemaContext] = None,
+        version: Optional[SchemaVersion] = None
+    ) -> Optional[str]:
+        """Why data fails a schema version, or None if it is valid"""
         schema = self.get_schema(name, context, version)
         try:
             schema(**data)
-            return True
-        except Exception:
-            return False
+            return None
+        except Exception as e:
+            return str(e)
             
     def migrate_data(
         self,
@@ -1,8 +1,12 @@
 import pytest
 import asyncio
 import os
+import shutil
+import socket
+import subprocess
 from motor.motor_asyncio import AsyncIOMotorClient
 from app.config.settings import get_settings
+from app.config.database import MongoDB
 from httpx import AsyncClient
 from redis import Redis
 from app.main import app
@@ -63,4 +67,41 @@ async def test_redis():
     )
     yield redis
     redis.flushdb()  # Clear test database
-    redis.close() 
\ No newline at end of file
+    redis.close() 
+
+@pytest.fixture
+def mongod(request, tmp_path):
+    """
+    A throwaway mongod; skips the test when mongod is not installed.
+
+    Standalone by default; parametrize indirectly with "replica_set" for a single-node
+    replica set (e.g. for change streams), which the caller still has to initiate.
+    """
+    if shutil.which("mongod") is None:
+        pytest.skip("mongod is not installed")
+    replica_set = getattr(request, "param", "standalone") == "replica_set"
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    command = ["mongod", "--port", str(port), "--bind_ip", "127.0.0.1", "--dbpath", str(tmp_path)]
+    if replica_set:
+        command += ["--replSet", "rs0"]
+    process = subprocess.Popen(command, stdout=subprocess.DEVNULL)
+    try:
+        yield f"mongodb://127.0.0.1:{port}/" + ("?directConnection=true" if replica_set else "")
+    finally:
+        process.terminate()
+        process.wait(timeout=30)
+
+
+@pytest.fixture
+async def mongo_db(mongod):
+    """Points MongoDB at a database on the throwaway mongod for the duration of a test."""
+    client = AsyncIOMotorClient(mongod, serverSelectionTimeoutMS=10000)
+    previous = MongoDB.client, MongoDB.db
+    MongoDB.client, MongoDB.db = client, client["test"]
+    try:
+        yield MongoDB.db
+    finally:
+        MongoDB.client, MongoDB.db = previous
+        client.close()
@@ -0,0 +1,137 @@
+"""
+In-memory stand-in for the Motor collection calls the trial services make.
+
+Filters support equality, ``$in`` and ``$nin`` on top-level fields; updates
+support ``$set`` and ``$unset``, and projections keep whole top-level fields. Install it with ``monkeypatch.setattr(MongoDB,
+"get_collection", FakeMongo().get_collection)``.
+"""
+
+from contextlib import asynccontextmanager
+from types import SimpleNamespace
+
+from bson import ObjectId
+from pymongo import ReturnDocument, UpdateOne
+
+
+def matches(document, query):
+    for field, condition in query.items():
+        value = document.get(field)
+        if isinstance(condition, dict) and "$in" in condition:
+            if value not in condition["$in"]:
+                return False
+        elif isinstance(condition, dict) and "$nin" in condition:
+            if value in condition["$nin"]:
+                return False
+        elif value != condition:
+            return False
+    return True
+
+
+class FakeCursor:
+    def __init__(self, documents):
+        self.documents = documents
+
+    def batch_size(self, size):
+        return self
+
+    def sort(self, keys):
+        for field, direction in reversed(keys):
+            self.documents.sort(key=lambda document: document.get(field), reverse=direction < 0)
+        return self
+
+    def __aiter__(self):
+        return self._iterate()
+
+    async def _iterate(self):
+        for document in self.documents:
+            yield document
+
+
+class FakeCollection:
+    def __init__(self):
+        self.documents = []
+        self.bulk_writes = []
+
+    @staticmethod
+    def _project(document, projection):
+        if not projection:
+            return dict(document)
+        fields = {field.split(".")[0] for field, include in projection.items() if include}
+        excluded = {field for field, include in projection.items() if not include}
+        return {
+            key: value for key, value in document.items()
+            if key not in excluded and (not fields or key in fields or key == "_id")
+        }
+
+    def _update(self, query, update, upsert):
+        """Apply ``update`` to the first match; returns (before, after), before being None for an upsert."""
+        document = next((document for document in self.documents if matches(document, query)), None)
+        if document is None and not upsert:
+            return None, None
+        before = None if document is None else dict(document)
+        if document is None:
+            document = {"_id": ObjectId(), **{k: v for k, v in query.items() if not isinstance(v, dict)}}
+            self.documents.append(document)
+        document.update(update.get("$set", {}))
+        for field in update.get("$unset", {}):
+            document.pop(field, None)
+        return before, dict(document)
+
+    async def insert_one(self, document):
+        document.setdefault("_id", ObjectId())
+        self.documents.append(dict(document))
+        return SimpleNamespace(inserted_id=document["_id"])
+
+    async def find_one(self, query, projection=None):
+        document = next((document for document in self.documents if matches(document, query)), None)
+        return None if document is None else self._project(document, projection)
+
+    def find(self, query, projection=None):
+        return FakeCursor([self._project(document, projection) for document in self.documents if matches(document, query)])
+
+    async def distinct(self, field, query):
+        values = []
+        for document in self.documents:
+            if matches(document, query) and field in document and document[field] not in values:
+                values.append(document[field])
+        return values
+
+    async def update_one(self, query, update, upsert=False):
+        before, after = self._update(query, update, upsert)
+        upserted_id = after["_id"] if before is None and after is not None else None
+        return SimpleNamespace(matched_count=int(before is not None), upserted_id=upserted_id)
+
+    async def find_one_and_update(self, query, update, upsert=False, return_document=ReturnDocument.BEFORE, projection=None):
+        before, after = self._update(query, update, upsert)
+        document = after if return_document == ReturnDocument.AFTER else before
+        return None if document is None else self._project(document, projection)
+
+    async def delete_many(self, query):
+        kept = [document for document in self.documents if not matches(document, query)]
+        deleted, self.documents = len(self.documents) - len(kept), kept
+        return SimpleNamespace(deleted_count=deleted)
+
+    async def bulk_write(self, requests, ordered=True):
+        self.bulk_writes.append(len(requests))
+        result = {"nUpserted": 0, "nMatched": 0, "nModified": 0, "writeErrors": []}
+        for request in requests:
+            assert isinstance(request, UpdateOne)
+            before, _ = self._update(request._filter, request._doc, request._upsert)
+            if before is None:
+                result["nUpserted"] += 1
+            else:
+                result["nMatched"] += 1
+                result["nModified"] += 1
+        return SimpleNamespace(bulk_api_result=result)
+
+
+class FakeMongo:
+    def __init__(self):
+        self.collections = {}
+
+    def __getitem__(self, name):
+        return self.collections.setdefault(name, FakeCollection())
+
+    @asynccontextmanager
+    async def get_collection(self, collection_name):
+        yield self[collection_name]
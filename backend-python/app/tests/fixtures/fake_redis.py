@@ -0,0 +1,162 @@
+"""
+In-memory stand-in for the redis.asyncio commands CacheService uses.
+
+Values are bytes and set members are bytes, as with ``decode_responses=False``;
+pipelines run their commands in order on ``execute``.
+"""
+
+import fnmatch
+import time
+import uuid
+
+from redis.exceptions import LockError, LockNotOwnedError
+
+
+class FakeRedis:
+    def __init__(self):
+        self.data = {}
+        self.deadlines = {}
+        self.published = []
+        self.calls = []
+
+    def _live(self, key):
+        deadline = self.deadlines.get(key)
+        if deadline is not None and deadline <= time.monotonic():
+            self.data.pop(key, None)
+            self.deadlines.pop(key, None)
+        return self.data.get(key)
+
+    @staticmethod
+    def _bytes(value):
+        return value if isinstance(value, bytes) else str(value).encode()
+
+    def expire_in(self, key, seconds: float):
+        """Move ``key``'s expiry, e.g. to make a value stale without waiting."""
+        self.deadlines[key] = time.monotonic() + seconds
+
+    async def get(self, key):
+        self.calls.append(("get", key))
+        return self._live(key)
+
+    async def mget(self, keys):
+        self.calls.append(("mget", tuple(keys)))
+        return [self._live(key) for key in keys]
+
+    async def set(self, key, value, nx=False, px=None):
+        if nx and self._live(key) is not None:
+            return None
+        self.data[key] = self._bytes(value)
+        self.deadlines.pop(key, None)
+        if px is not None:
+            self.expire_in(key, px / 1000)
+        return True
+
+    async def setex(self, key, seconds, value):
+        self.calls.append(("setex", key))
+        self.data[key] = self._bytes(value)
+        self.expire_in(key, seconds)
+        return True
+
+    async def pttl(self, key):
+        if self._live(key) is None:
+            return -2
+        deadline = self.deadlines.get(key)
+        return -1 if deadline is None else int((deadline - time.monotonic()) * 1000)
+
+    async def exists(self, *keys):
+        return sum(self._live(key) is not None for key in keys)
+
+    async def delete(self, *keys):
+        deleted = 0
+        for key in keys:
+            deleted += self._live(key) is not None
+            self.data.pop(key, None)
+            self.deadlines.pop(key, None)
+        return deleted
+
+    async def incr(self, key):
+        value = int(self._live(key) or 0) + 1
+        self.data[key] = self._bytes(value)
+        return value
+
+    async def sadd(self, key, *members):
+        members = {self._bytes(member) for member in members}
+        current = self.data.setdefault(key, set())
+        added = len(members - current)
+        current.update(members)
+        return added
+
+    async def srem(self, key, *members):
+        current = self.data.get(key, set())
+        members = {self._bytes(member) for member in members}
+        removed = len(members & current)
+        current.difference_update(members)
+        if not current:
+            self.data.pop(key, None)
+        return removed
+
+    async def smembers(self, key):
+        return set(self.data.get(key, set()))
+
+    async def publish(self, channel, message):
+        self.published.append(message)
+        return 0
+
+    async def scan_iter(self, match="*"):
+        for key in list(self.data):
+            if fnmatch.fnmatchcase(key, match):
+                yield key.encode()
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+    def lock(self, name, timeout=None):
+        return FakeLock(self, name, timeout)
+
+    async def close(self):
+        pass
+
+
+class FakePipeline:
+    def __init__(self, redis: FakeRedis):
+        self.redis = redis
+        self.commands = []
+
+    def __getattr__(self, name):
+        def queue(*args, **kwargs):
+            self.commands.append((name, args, kwargs))
+            return self
+        return queue
+
+    async def execute(self):
+        commands, self.commands = self.commands, []
+        return [await getattr(self.redis, name)(*args, **kwargs) for name, args, kwargs in commands]
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+
+class FakeLock:
+    def __init__(self, redis: FakeRedis, name: str, timeout):
+        self.redis = redis
+        self.name = name
+        self.timeout = timeout
+        self.token = uuid.uuid4().hex.encode()
+
+    async def acquire(self, blocking=True):
+        px = int(self.timeout * 1000) if self.timeout else None
+        return bool(await self.redis.set(self.name, self.token, nx=True, px=px))
+
+    async def release(self):
+        if self.redis._live(self.name) != self.token:
+            raise LockError("Cannot release a lock that's no longer owned")
+        await self.redis.delete(self.name)
+
+    async def reacquire(self):
+        if self.redis._live(self.name) != self.token:
+            raise LockNotOwnedError("Cannot reacquire a lock that's no longer owned")
+        self.redis.expire_in(self.name, self.timeout)
+        return True
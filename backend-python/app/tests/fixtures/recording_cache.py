@@ -0,0 +1,12 @@
+"""Stand-in for a service module's ``cache_service`` that records the companies its writes invalidate."""
+
+
+class RecordingCache:
+    def __init__(self):
+        self.invalidated = []
+
+    async def invalidate_company(self, company_id):
+        self.invalidated.append(company_id)
+
+    async def clear_missing(self, kind, *ids):
+        pass
@@ -0,0 +1,50 @@
+"""Tests for the binary cache codec used by CacheService."""
+
+import json
+
+import pytest
+
+from ..services import cache_codec
+from ..services.cache_codec import COMPRESSIONS, SERIALIZERS, CacheCodec
+from .fixtures.trial_data import SAMPLE_TRIAL
+
+
+def test_round_trips_and_compresses_above_threshold():
+    """Small values are stored as-is, large ones compressed; both decode to the original value."""
+    codec = CacheCodec("json", "zlib", compress_threshold=1024)
+    small = {"total_trials": 1}
+    large = [SAMPLE_TRIAL] * 50
+
+    small_data, small_size = codec.dumps(small)
+    large_data, large_size = codec.dumps(large)
+
+    assert small_data[0] == SERIALIZERS["json"] << 3 | COMPRESSIONS["none"]
+    assert large_data[0] == SERIALIZERS["json"] << 3 | COMPRESSIONS["zlib"]
+    assert len(large_data) < large_size
+    assert codec.loads(small_data) == (small, small_size)
+    assert codec.loads(large_data) == (large, large_size)
+
+
+def test_reads_values_written_before_the_codec():
+    """Plain JSON strings from the old decode_responses cache, and other codecs' output, still decode."""
+    codec = CacheCodec("json", "none")
+    legacy = json.dumps(SAMPLE_TRIAL)
+
+    assert codec.decode(legacy) == SAMPLE_TRIAL
+    assert codec.decode(legacy.encode()) == SAMPLE_TRIAL
+    assert codec.decode(CacheCodec("json", "zlib", compress_threshold=0).encode(SAMPLE_TRIAL)) == SAMPLE_TRIAL
+
+
+def test_falls_back_when_package_is_missing(monkeypatch):
+    """Missing optional packages fall back to orjson/json and zlib; unknown names are rejected."""
+    monkeypatch.setattr(cache_codec, "zstandard", None)
+    monkeypatch.setattr(cache_codec, "msgpack", None)
+    monkeypatch.setattr(cache_codec, "orjson", None)
+
+    codec = CacheCodec("msgpack", "zstd", compress_threshold=0)
+
+    assert codec.serializer == SERIALIZERS["json"]
+    assert codec.compression == COMPRESSIONS["zlib"]
+    assert codec.decode(codec.encode({"a": [1, 2]})) == {"a": [1, 2]}
+    with pytest.raises(ValueError):
+        CacheCodec("pickle")
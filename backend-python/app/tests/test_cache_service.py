@@ -0,0 +1,300 @@
+"""Tests for CacheService against an in-memory Redis."""
+
+import asyncio
+import time
+
+import pytest
+
+from ..services import company_service, trial_service
+from ..services.cache_service import CacheService
+from ..services.company_service import CompanyService
+from ..services.schema_service import SchemaService
+from ..services.trial_service import CompanyTrialService, TrialService
+from ..config.database import MongoDB
+from ..config.settings import get_settings
+from ..models.company import Company
+from ..system_specs.schema_manager import schema_manager
+from .fixtures.fake_mongo import FakeMongo
+from .fixtures.recording_cache import RecordingCache
+from .fixtures.fake_redis import FakeRedis
+
+settings = get_settings()
+
+
+@pytest.fixture
+def cache():
+    cache = CacheService()
+    cache.redis = FakeRedis()
+    CacheService._namespaces.clear()
+    CacheService.local.clear()
+    CacheService._load_seconds.clear()
+    return cache
+
+
+@pytest.mark.asyncio
+async def test_invalidation_keeps_keys_tagged_after_it_read_the_tag(cache):
+    """A value cached between reading and clearing the tag set is still found by the next invalidation."""
+    tag = cache.company_tag("acme")
+    await cache._set_value("analysis:0:acme", {"v": 1}, 60, [tag])
+    smembers = cache.redis.smembers
+
+    async def racing_smembers(key):
+        members = await smembers(key)
+        await cache._set_value("company_trials:0:acme", [{"v": 2}], 60, [tag])
+        return members
+
+    cache.redis.smembers = racing_smembers
+    await cache.invalidate_company("acme")
+    cache.redis.smembers = smembers
+
+    assert await cache.redis.get("analysis:0:acme") is None
+    assert await cache.redis.smembers(f"tag:{tag}") == {b"company_trials:0:acme"}
+    await cache.invalidate_company("acme")
+    assert await cache.redis.get("company_trials:0:acme") is None
+
+
+@pytest.mark.asyncio
+async def test_load_racing_an_invalidation_is_not_cached(cache):
+    """The tag version is bumped before the members are read, so a load that straddles it is returned uncached."""
+    async def loader():
+        await cache.invalidate_company("acme")
+        return {"v": "pre-write"}
+
+    value, cached = await cache.get_or_load("analysis:0:acme", loader, tags=[cache.company_tag("acme")])
+
+    assert value == {"v": "pre-write"} and not cached
+    assert await cache.redis.get("analysis:0:acme") is None
+
+
+@pytest.mark.asyncio
+async def test_every_write_path_invalidates_its_company(mongo_db, monkeypatch):
+    """Each service write drops the company's cached values once it has committed."""
+    recording = RecordingCache()
+    monkeypatch.setattr(trial_service, "cache_service", recording)
+    monkeypatch.setattr(company_service, "cache_service", recording)
+
+    async def valid(*args, **kwargs):
+        return True
+
+    async def no_errors(collection_name, documents, context=None):
+        return [None] * len(documents)
+
+    monkeypatch.setattr(SchemaService, "validate_document", valid)
+    monkeypatch.setattr(SchemaService, "validation_errors", no_errors)
+    monkeypatch.setattr(schema_manager, "get_schema", lambda name: dict)
+    company_id = str((await mongo_db.companies.insert_one({"name": "Acme"})).inserted_id)
+    analysis = {"analytics": {"phaseDistribution": {}, "statusSummary": {}, "therapeuticAreas": {}}, "studies": []}
+
+    await CompanyTrialService.save_company_trials(company_id, [])
+    await CompanyTrialService.update_trial_analysis(company_id, [])
+    await CompanyTrialService.save_trial_analysis(company_id, analysis)
+    await TrialService.save_trial_data(company_id, [{"nct_id": "NCT00000001"}])
+    await TrialService.bulk_save_trials(company_id, [{"nct_id": "NCT00000002"}])
+    await CompanyService.update_company(company_id, {"name": "Acme Bio"})
+
+    assert recording.invalidated == [company_id] * 6
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("save", [TrialService.save_trial_data, TrialService.bulk_save_trials])
+async def test_moving_a_trial_invalidates_the_company_it_left(save, monkeypatch):
+    """An upsert keyed on nct_id takes the trial from its previous company, whose values go stale too."""
+    recording = RecordingCache()
+    mongo = FakeMongo()
+    monkeypatch.setattr(trial_service, "cache_service", recording)
+    monkeypatch.setattr(MongoDB, "get_collection", mongo.get_collection)
+
+    async def no_errors(collection_name, documents, context=None):
+        return [None] * len(documents)
+
+    monkeypatch.setattr(SchemaService, "validation_errors", no_errors)
+    await mongo["trials"].insert_one({"nct_id": "NCT00000001", "company_id": "a"})
+    await mongo["trials"].insert_one({"nct_id": "NCT00000002", "company_id": "c"})
+
+    await save("b", [{"nct_id": "NCT00000001"}, {"nct_id": "NCT00000003"}])
+
+    assert recording.invalidated == ["b", "a"]
+    assert await mongo["trials"].distinct("company_id", {}) == ["b", "c"]
+
+
+@pytest.mark.asyncio
+async def test_create_company_invalidates_the_company_it_overwrites(monkeypatch):
+    """create_company upserts by name, so an existing company's cached values are dropped."""
+    recording = RecordingCache()
+    mongo = FakeMongo()
+    monkeypatch.setattr(company_service, "cache_service", recording)
+    monkeypatch.setattr(MongoDB, "get_collection", mongo.get_collection)
+    monkeypatch.setattr(schema_manager, "get_schema", lambda name: Company)
+    existing = await mongo["companies"].insert_one({"name": "Acme"})
+
+    result = await CompanyService.create_company({"name": "Acme"})
+
+    assert result["_id"] == str(existing.inserted_id)
+    assert recording.invalidated == [result["_id"]]
+
+
+@pytest.mark.asyncio
+async def test_bump_namespace_moves_every_key_of_the_collection(cache, monkeypatch):
+    """Keys read from the bumped collection change at once; families of other collections keep theirs."""
+    monkeypatch.setattr(CacheService, "_l1_active", True)
+    assert await cache.key(CacheService.TRIALS, "acme") == "company_trials:0:acme"
+
+    namespace = await cache.bump_namespace("trials", "current", "1.0.0")
+
+    assert namespace == "current.1.0.0.1"
+    assert await cache.key(CacheService.TRIALS, "acme") == "company_trials:current.1.0.0.1:acme"
+    assert await cache.key(CacheService.ANALYSIS, "acme") == "analysis:0:acme"
+    assert f"{CacheService.instance_id} ns:trials" in cache.redis.published
+
+
+@pytest.mark.asyncio
+async def test_namespace_read_overlapping_a_bump_is_not_memoized(cache, monkeypatch):
+    """A bump announced while the namespace GET is in flight leaves nothing memoized to go stale."""
+    monkeypatch.setattr(CacheService, "_l1_active", True)
+    get = cache.redis.get
+
+    async def racing_get(key):
+        value = await get(key)
+        # Another worker bumps the namespace after this GET read the old one
+        await cache.redis.set("ns:trials", b"current.1.0.0.7")
+        CacheService._handle_invalidation("other-worker ns:trials")
+        return value
+
+    cache.redis.get = racing_get
+    assert await cache.namespace("trials") == "0"
+    cache.redis.get = get
+
+    assert "trials" not in CacheService._namespaces
+    assert await cache.namespace("trials") == "current.1.0.0.7"
+
+
+@pytest.mark.asyncio
+async def test_namespace_is_reused_briefly_without_the_listener(cache):
+    """With L1 off, keys share one namespace GET for CACHE_NAMESPACE_TTL, then pick up a bump made elsewhere."""
+    assert not CacheService._l1_active
+    assert await cache.key(CacheService.TRIALS, "a") == "company_trials:0:a"
+    assert await cache.key(CacheService.TRIALS, "b") == "company_trials:0:b"
+    assert cache.redis.calls.count(("get", "ns:trials")) == 1
+
+    await cache.redis.set("ns:trials", b"current.1.0.0.2")
+    namespace, expires_at = CacheService._namespaces["trials"]
+    assert expires_at - time.monotonic() <= settings.CACHE_NAMESPACE_TTL
+    CacheService._namespaces["trials"] = (namespace, time.monotonic())
+
+    assert await cache.key(CacheService.TRIALS, "a") == "company_trials:current.1.0.0.2:a"
+
+
+@pytest.mark.asyncio
+async def test_get_many_splits_hits_and_misses_in_input_order(cache):
+    """One round trip answers every company; misses keep the order they were asked in."""
+    await cache.set_many(CacheService.TRIALS, {"b": [{"nct_id": "NCT00000002"}], "d": []})
+
+    hits, misses = await cache.get_many_trials(["a", "b", "c", "d"])
+
+    assert hits == {"b": [{"nct_id": "NCT00000002"}], "d": []}
+    assert misses == ["a", "c"]
+    assert [call for call in cache.redis.calls if call[0] == "mget"] == [
+        ("mget", ("company_trials:0:a", "company_trials:0:b", "company_trials:0:c", "company_trials:0:d"))
+    ]
+
+
+@pytest.mark.asyncio
+async def test_get_many_reads_l1_first_and_counts_stale_values_as_misses(cache, monkeypatch):
+    """L1 hits never reach Redis; values past their fresh TTL are reported as misses to reload."""
+    monkeypatch.setattr(CacheService, "_l1_active", True)
+    await cache.set_many(CacheService.TRIAL_ANALYTICS, {"b": {"total_trials": 2}})
+    CacheService.local.clear()
+    CacheService.local.set("trial_analytics:0:a", {"total_trials": 1}, 10, 60)
+    cache.redis.expire_in("trial_analytics:0:b", settings.CACHE_STALE_TTL / 2)
+
+    hits, misses = await cache.get_many_analytics(["a", "b"])
+
+    assert hits == {"a": {"total_trials": 1}}
+    assert misses == ["b"]
+    assert ("mget", ("trial_analytics:0:b",)) in cache.redis.calls
+
+
+@pytest.mark.asyncio
+async def test_set_many_tags_each_value_with_its_company(cache):
+    """Values written in bulk are invalidated by their own company's writes only."""
+    await cache.set_many(CacheService.TRIALS, {"a": [], "b": []})
+
+    assert await cache.redis.smembers("tag:company:a") == {b"company_trials:0:a"}
+    await cache.invalidate_company("a")
+    hits, misses = await cache.get_many_trials(["a", "b"])
+    assert misses == ["a"] and set(hits) == {"b"}
+
+
+@pytest.mark.asyncio
+async def test_get_or_load_coalesces_misses_and_reports_them_as_loaded(cache):
+    """Callers that join an in-flight load share its one loader call and none of them reports a cache hit."""
+    calls = []
+
+    async def loader():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return {"v": 1}
+
+    results = await asyncio.gather(*(cache.get_or_load("analysis:0:acme", loader) for _ in range(3)))
+
+    assert results == [({"v": 1}, False)] * 3
+    assert len(calls) == 1
+    assert await cache.get_or_load("analysis:0:acme", loader) == ({"v": 1}, True)
+
+
+@pytest.mark.asyncio
+async def test_get_or_load_serves_stale_values_while_one_refresh_runs(cache):
+    """A stale value is returned at once as cached; a single background load replaces it."""
+    await cache._set_value("analysis:0:acme", {"v": "old"}, 60)
+    cache.redis.expire_in("analysis:0:acme", settings.CACHE_STALE_TTL / 2)
+    refreshed = asyncio.Event()
+    calls = []
+
+    async def loader():
+        calls.append(1)
+        await refreshed.wait()
+        return {"v": "new"}
+
+    assert await cache.get_or_load("analysis:0:acme", loader) == ({"v": "old"}, True)
+    assert await cache.get_or_load("analysis:0:acme", loader) == ({"v": "old"}, True)
+    refreshed.set()
+    await asyncio.sleep(0.01)
+
+    assert len(calls) == 1
+    assert await cache.get_or_load("analysis:0:acme", loader) == ({"v": "new"}, True)
+
+
+@pytest.mark.asyncio
+async def test_get_or_load_waits_for_the_worker_holding_the_load_lock(cache):
+    """With another worker loading the key, its result is used instead of loading again."""
+    other_worker = cache.redis.lock("lock:analysis:0:acme", timeout=settings.CACHE_LOCK_TIMEOUT)
+    assert await other_worker.acquire(blocking=False)
+
+    async def loader():
+        raise AssertionError("loaded while another worker held the lock")
+
+    async def other_worker_finishes():
+        await asyncio.sleep(0.02)
+        await cache.redis.setex("analysis:0:acme", 60 + settings.CACHE_STALE_TTL, CacheService.codec.dumps({"v": 2})[0])
+
+    waiting = asyncio.ensure_future(cache.get_or_load("analysis:0:acme", loader))
+    await other_worker_finishes()
+
+    assert await waiting == ({"v": 2}, False)
+
+
+@pytest.mark.asyncio
+async def test_get_or_load_stops_waiting_after_a_few_typical_loads(cache):
+    """A worker that holds the load lock but never delivers delays a miss by a few load times, not the lock timeout."""
+    other_worker = cache.redis.lock("lock:analysis:0:acme", timeout=settings.CACHE_LOCK_TIMEOUT)
+    assert await other_worker.acquire(blocking=False)
+    CacheService._record_load_time("analysis:0:other", 0.02)
+
+    async def loader():
+        return {"v": 1}
+
+    started = asyncio.get_running_loop().time()
+    assert await cache.get_or_load("analysis:0:acme", loader) == ({"v": 1}, False)
+    assert asyncio.get_running_loop().time() - started < 1
+    assert CacheService._lock_wait("analysis:0:acme", 0.05) == pytest.approx(0.1)
+    assert CacheService._lock_wait("company_trials:0:acme", 0.05) == settings.CACHE_LOCK_WAIT
@@ -0,0 +1,46 @@
+"""Tests for the per-key cache statistics behind /api/cache/stats."""
+
+from ..services.cache_service import CacheService
+from ..services.cache_stats import CacheKeyStats
+
+
+def test_ranks_keys_and_summarises_families():
+    """Top keys are ranked by size or access count and hit ratios are rolled up per key family."""
+    stats = CacheKeyStats()
+    stats.record_size("company_trials:a", 50000)
+    stats.record("company_trials:a", hit=True)
+    stats.record("company_trials:b", hit=False)
+    for _ in range(3):
+        stats.record("trial_analytics:a", hit=True, size=900)
+
+    assert [row["key"] for row in stats.top("bytes", 2)] == ["company_trials:a", "trial_analytics:a"]
+    assert stats.top("accesses", 1)[0] == {
+        "key": "trial_analytics:a", "hits": 3, "misses": 0, "accesses": 3, "bytes": 900
+    }
+    families = stats.families()
+    assert families["company_trials"]["hit_ratio"] == 0.5
+    assert families["company_trials"]["bytes"] == 50000
+    assert families["trial_analytics"]["keys"] == 1
+
+
+def test_prunes_least_accessed_keys_when_full():
+    """Once max_keys is reached the least accessed half is dropped, keeping busy keys."""
+    stats = CacheKeyStats(max_keys=4)
+    for _ in range(5):
+        stats.record("busy", hit=True)
+    for key in ("a", "b", "c"):
+        stats.record(key, hit=False)
+    stats.record("new", hit=False)
+
+    keys = {row["key"] for row in stats.top("accesses", 10)}
+    assert "busy" in keys and "new" in keys
+    assert len(keys) == 3
+
+
+def test_service_stats_report_l1_usage():
+    """CacheService.stats reports this worker's L1 usage next to the key rankings."""
+    stats = CacheService.stats(limit=5)
+
+    assert stats["instance_id"] == CacheService.instance_id
+    assert stats["l1"]["max_bytes"] == CacheService.local.max_bytes
+    assert set(stats) >= {"families", "top_by_size", "top_by_access"}
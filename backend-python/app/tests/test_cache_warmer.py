@@ -0,0 +1,57 @@
+"""Tests for the startup cache warm-up."""
+
+import pytest
+
+from ..services.cache_service import CacheService
+from ..services.cache_warmer import CacheWarmer
+from ..services.trial_service import TrialService
+from .fixtures.fake_redis import FakeRedis
+
+
+@pytest.fixture
+def cache():
+    cache = CacheService()
+    cache.redis = FakeRedis()
+    CacheService._namespaces.clear()
+    return cache
+
+
+@pytest.mark.asyncio
+async def test_warm_loads_only_misses_and_skips_companies_written_meanwhile(cache, monkeypatch):
+    """Cached companies are not reloaded; a company invalidated during its load is left uncached."""
+    await cache.set_many(CacheService.TRIALS, {"a": [{"nct_id": "NCT00000001"}]})
+    await cache.set_many(CacheService.TRIAL_ANALYTICS, {"a": {"total_trials": 1}})
+    loaded = []
+
+    async def load_trials(company_ids):
+        loaded.append(("trials", list(company_ids)))
+        # A write to c lands while its trials are being read
+        await cache.invalidate_company("c")
+        return {company_id: [] for company_id in company_ids}
+
+    async def load_analytics(company_ids):
+        loaded.append(("analytics", list(company_ids)))
+        return {company_id: {"total_trials": 0} for company_id in company_ids}
+
+    monkeypatch.setattr(TrialService, "get_trials_for_companies", load_trials)
+    monkeypatch.setattr(CacheWarmer, "_load_analytics", load_analytics)
+
+    warmed = await CacheWarmer.warm(cache, ["a", "b", "c"])
+
+    assert sorted(loaded) == [("analytics", ["b", "c"]), ("trials", ["b", "c"])]
+    assert warmed == {CacheService.TRIALS: 1, CacheService.TRIAL_ANALYTICS: 2}
+    hits, misses = await cache.get_many_trials(["a", "b", "c"])
+    assert set(hits) == {"a", "b"} and misses == ["c"]
+
+
+@pytest.mark.asyncio
+async def test_warm_once_yields_to_the_replica_holding_the_lock(cache, monkeypatch):
+    """Only one replica warms per round; the others return without touching MongoDB."""
+    async def rank_companies(top_n):
+        raise AssertionError("warmed while another replica held the lock")
+
+    monkeypatch.setattr(CacheWarmer, "rank_companies", rank_companies)
+    held = cache.redis.lock("lock:cache-warm", timeout=60)
+    assert await held.acquire(blocking=False)
+
+    assert await CacheWarmer.warm_once(cache) is None
@@ -0,0 +1,217 @@
+"""Tests for change-stream driven cache invalidation."""
+
+import asyncio
+
+import pytest
+from bson import ObjectId
+from motor.motor_asyncio import AsyncIOMotorClient
+
+from ..services.cache_service import CacheService
+from ..services.change_stream_service import ChangeStreamService
+from .fixtures.fake_mongo import FakeMongo
+from .fixtures.fake_redis import FakeRedis
+
+
+def test_maps_changes_to_company_tags():
+    """Company changes map by _id, trial changes by company_id; unknown owners invalidate everything."""
+    company_id = ObjectId()
+    affected = ChangeStreamService.affected_companies
+
+    assert affected({
+        "operationType": "update", "ns": {"coll": "companies"}, "documentKey": {"_id": company_id}
+    }) == {str(company_id)}
+    assert affected({
+        "operationType": "replace", "ns": {"coll": "trials"}, "documentKey": {"_id": ObjectId()},
+        "fullDocument": {"nct_id": "NCT00000000", "company_id": "abc"}
+    }) == {"abc"}
+    assert affected({
+        "operationType": "insert", "ns": {"coll": "trials"}, "fullDocument": {"nct_id": "NCT00000001"}
+    }) == set()
+    assert affected({"operationType": "delete", "ns": {"coll": "trials"}, "documentKey": {"_id": ObjectId()}}) is None
+    assert affected({"operationType": "drop", "ns": {"coll": "trials"}}) is None
+
+
+def test_maps_trial_pre_images_to_the_companies_they_left():
+    """A deleted trial's pre-image names its company; a moved trial invalidates both companies."""
+    affected = ChangeStreamService.affected_companies
+
+    assert affected({
+        "operationType": "delete", "ns": {"coll": "trials"}, "documentKey": {"_id": ObjectId()},
+        "fullDocumentBeforeChange": {"nct_id": "NCT00000001", "company_id": "a"}
+    }) == {"a"}
+    moved = {
+        "operationType": "update", "ns": {"coll": "trials"}, "documentKey": {"_id": ObjectId()},
+        "fullDocumentBeforeChange": {"nct_id": "NCT00000001", "company_id": "a"},
+        "fullDocument": {"nct_id": "NCT00000001", "company_id": "b"}
+    }
+    assert affected(moved) == {"a", "b"}
+    assert ChangeStreamService.trial_nct_ids(moved) == {"NCT00000001"}
+
+
+def test_maps_inserts_to_negative_cache_ids():
+    """Inserted trials clear their NCT ID and inserted companies their id; updates create nothing."""
+    company_id = ObjectId()
+    created = ChangeStreamService.created_id
+
+    assert created({
+        "operationType": "insert", "ns": {"coll": "trials"}, "fullDocument": {"nct_id": "NCT00000001"}
+    }) == ("trial", "NCT00000001")
+    assert created({
+        "operationType": "insert", "ns": {"coll": "companies"}, "documentKey": {"_id": company_id}
+    }) == ("company", str(company_id))
+    assert created({
+        "operationType": "update", "ns": {"coll": "trials"}, "fullDocument": {"nct_id": "NCT00000001"}
+    }) is None
+
+
+class RecordingCache:
+    """Stands in for CacheService's Redis side; records the tags it is asked to invalidate."""
+    company_tag = staticmethod(CacheService.company_tag)
+
+    def __init__(self):
+        self.invalidated = []
+        self.changed = asyncio.Event()
+
+    async def company_tags(self):
+        return []
+
+    async def invalidate_tags(self, *tags):
+        self.invalidated.extend(tags)
+        self.changed.set()
+
+    async def clear_missing(self, kind, *ids):
+        pass
+
+
+class FakeStream:
+    """A change stream replaying ``changes``; None is a poll that finds nothing, and the token moves on every poll."""
+
+    def __init__(self, changes):
+        self.changes = list(changes)
+        self.alive = True
+        self.resume_token = None
+        self.polls = 0
+
+    async def try_next(self):
+        self.polls += 1
+        self.resume_token = {"_data": str(self.polls)}
+        if not self.changes:
+            self.alive = False
+            return None
+        return self.changes.pop(0)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+
+class FakeDatabase(FakeMongo):
+    def __init__(self, changes):
+        super().__init__()
+        self.stream = FakeStream(changes)
+        self.watch_options = None
+
+    def watch(self, pipeline, **options):
+        self.watch_options = options
+        return self.stream
+
+    async def command(self, *args, **kwargs):
+        return {"ok": 1}
+
+
+@pytest.mark.asyncio
+async def test_consume_invalidates_linking_companies_and_checkpoints_only_applied_batches():
+    """Companies linking a changed trial are invalidated too; idle polls do not rewrite the resume token."""
+    moved = {
+        "operationType": "update", "ns": {"coll": "trials"}, "documentKey": {"_id": ObjectId()},
+        "fullDocumentBeforeChange": {"nct_id": "NCT00000001", "company_id": "a"},
+        "fullDocument": {"nct_id": "NCT00000001", "company_id": "b"}
+    }
+    db = FakeDatabase([None, None, moved, None, None])
+    await db["company_trial_links"].insert_one({"company_id": "c", "field": "trials", "nct_id": "NCT00000001"})
+    cache = RecordingCache()
+
+    await ChangeStreamService.consume(db, cache)
+
+    assert db.watch_options["full_document_before_change"] == "whenAvailable"
+    assert sorted(cache.invalidated) == ["company:a", "company:b", "company:c"]
+    state = await db[ChangeStreamService.STATE_COLLECTION].find_one({"_id": ChangeStreamService.STREAM_ID})
+    assert state["token"] == {"_data": "4"}
+
+
+@pytest.mark.asyncio
+async def test_only_the_replica_holding_the_lock_consumes(monkeypatch):
+    """Replicas that find the lock taken wait for it instead of opening a second stream."""
+    consumed = []
+
+    async def consume(db, cache, batch_size=None):
+        consumed.append(cache)
+        await asyncio.Event().wait()
+
+    monkeypatch.setattr(ChangeStreamService, "consume", consume)
+    monkeypatch.setattr(ChangeStreamService, "LOCK_TIMEOUT", 0.3)
+    redis = FakeRedis()
+    caches = []
+    for _ in range(2):
+        cache = CacheService()
+        cache.redis = redis
+        caches.append(cache)
+
+    replicas = [asyncio.create_task(ChangeStreamService._run(cache)) for cache in caches]
+    await asyncio.sleep(0.5)
+    assert consumed == [caches[0]]
+
+    replicas[0].cancel()
+    await asyncio.gather(replicas[0], return_exceptions=True)
+    await asyncio.sleep(0.3)
+    assert consumed == [caches[0], caches[1]]
+    replicas[1].cancel()
+    await asyncio.gather(replicas[1], return_exceptions=True)
+
+
+async def wait_for_primary(url: str) -> AsyncIOMotorClient:
+    client = AsyncIOMotorClient(url)
+    for _ in range(100):
+        try:
+            await client.admin.command("replSetInitiate")
+        except Exception:
+            pass
+        try:
+            if (await client.admin.command("hello")).get("isWritablePrimary"):
+                return client
+        except Exception:
+            pass
+        await asyncio.sleep(0.1)
+    raise RuntimeError("replica set did not elect a primary")
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("mongod", ["replica_set"], indirect=True)
+async def test_invalidates_companies_and_resumes_after_restart(mongod):
+    """Out-of-band writes invalidate their companies, and a restarted consumer picks up where it left off."""
+    client = await wait_for_primary(mongod)
+    db = client["change_stream_test"]
+    company_id = ObjectId()
+    await db.companies.insert_one({"_id": company_id, "name": "Acme"})
+
+    cache = RecordingCache()
+    consumer = asyncio.create_task(ChangeStreamService.consume(db, cache))
+    await asyncio.sleep(1)  # let the stream open before writing
+    await db.trials.insert_one({"nct_id": "NCT00000000", "company_id": str(company_id)})
+    await asyncio.wait_for(cache.changed.wait(), 10)
+    await asyncio.sleep(0.5)  # the resume token is saved right after invalidating
+    consumer.cancel()
+    assert cache.invalidated == [f"company:{company_id}"]
+    assert await db[ChangeStreamService.STATE_COLLECTION].find_one({"_id": ChangeStreamService.STREAM_ID})
+
+    # Written while no consumer is running
+    await db.companies.update_one({"_id": company_id}, {"$set": {"name": "Acme Pharma"}})
+
+    cache = RecordingCache()
+    consumer = asyncio.create_task(ChangeStreamService.consume(db, cache))
+    await asyncio.wait_for(cache.changed.wait(), 10)
+    consumer.cancel()
+    assert cache.invalidated == [f"company:{company_id}"]
+    client.close()
@@ -0,0 +1,146 @@
+"""Tests for normalized company trial storage and the online migration to it."""
+
+from datetime import datetime
+
+import pytest
+from bson import ObjectId
+
+from ..config.database import MongoDB
+from ..models.trial import ClinicalTrial
+from ..services import trial_service
+from ..services.schema_service import SchemaService
+from ..services.trial_service import CompanyTrialService, TrialAnalysisService
+from .fixtures.fake_mongo import FakeMongo
+from .fixtures.recording_cache import RecordingCache
+
+
+def study(nct_id: str) -> dict:
+    return {"protocolSection": {"identificationModule": {"nctId": nct_id, "briefTitle": f"Study {nct_id}"}}}
+
+
+def test_trial_nct_id_reads_every_embedded_shape():
+    """Python, Node.js and raw ClinicalTrials.gov trials all carry their NCT ID somewhere different."""
+    assert CompanyTrialService.trial_nct_id({"nct_id": "NCT00000001"}) == "NCT00000001"
+    assert CompanyTrialService.trial_nct_id({"nctId": "NCT00000002"}) == "NCT00000002"
+    assert CompanyTrialService.trial_nct_id(study("NCT00000003")) == "NCT00000003"
+    assert CompanyTrialService.trial_nct_id({"briefTitle": "No id"}) is None
+
+
+@pytest.mark.asyncio
+async def test_normalize_moves_embedded_trials_and_reads_join_them(mongo_db):
+    """After the move the company has no arrays, and reads return the same trials in the same order."""
+    company_id = ObjectId()
+    trials = [study("NCT00000002"), study("NCT00000001")]
+    await mongo_db.companies.insert_one({"_id": company_id, "name": "Acme", "trials": trials})
+
+    assert await CompanyTrialService.normalize_company(str(company_id)) == 2
+
+    company = await mongo_db.companies.find_one({"_id": company_id})
+    assert "trials" not in company
+    linked = await CompanyTrialService.linked_trials(str(company_id))
+    assert [CompanyTrialService.trial_nct_id(trial) for trial in linked] == ["NCT00000002", "NCT00000001"]
+    titles = await CompanyTrialService.linked_trials(
+        str(company_id), projection={"protocolSection.identificationModule.briefTitle": 1, "_id": 0}
+    )
+    assert set(titles[0]) == {"protocolSection", "nct_id"}
+    assert await CompanyTrialService.get_trial_details(str(company_id), "NCT00000001") is not None
+
+
+@pytest.mark.asyncio
+async def test_normalize_keeps_links_of_a_racing_normalized_write(mongo_db, monkeypatch):
+    """A normalized save landing mid-move wins: its links survive and the company is left for the next run."""
+    company_id = ObjectId()
+    await mongo_db.companies.insert_one({"_id": company_id, "name": "Acme", "trials": [study("NCT00000001")]})
+    monkeypatch.setattr(trial_service.settings, "COMPANY_TRIALS_STORAGE", "normalized")
+    link_trials = CompanyTrialService._link_trials
+    racing = []
+
+    async def link_then_race(company_id, field, trials):
+        await link_trials(company_id, field, trials)
+        if not racing:
+            racing.append(field)
+            await CompanyTrialService._set_company_trials(
+                mongo_db.companies, company_id, field, [study("NCT00000009")], {"updated_at": datetime.utcnow()}
+            )
+
+    monkeypatch.setattr(CompanyTrialService, "_link_trials", link_then_race)
+
+    assert await CompanyTrialService.normalize_company(str(company_id)) is None
+
+    linked = await CompanyTrialService.linked_trials(str(company_id))
+    assert [CompanyTrialService.trial_nct_id(trial) for trial in linked] == ["NCT00000009"]
+
+
+@pytest.fixture
+def mongo(monkeypatch):
+    """Services read and write an in-memory database; schema checks pass and cache calls are recorded."""
+    mongo = FakeMongo()
+    monkeypatch.setattr(MongoDB, "get_collection", mongo.get_collection)
+    monkeypatch.setattr(trial_service, "cache_service", RecordingCache())
+
+    async def current_context(collection_name):
+        return None
+
+    async def valid(*args, **kwargs):
+        return True
+
+    monkeypatch.setattr(SchemaService, "get_collection_context", current_context)
+    monkeypatch.setattr(SchemaService, "validate_document", valid)
+    return mongo
+
+
+def clinical_trial(nct_id: str, phase: str, status: str, enrollment: int, start: str) -> ClinicalTrial:
+    return ClinicalTrial(protocolSection={
+        "identificationModule": {"nctId": nct_id, "briefTitle": f"Study {nct_id}", "officialTitle": None},
+        "statusModule": {
+            "overallStatus": status,
+            "startDateStruct": {"date": start},
+            "completionDateStruct": {"date": "2025-06-30"},
+            "primaryCompletionDateStruct": None
+        },
+        "designModule": {"phases": [phase], "enrollmentInfo": {"count": enrollment}},
+        "conditionsModule": {"conditions": ["Oncology"]}
+    })
+
+
+@pytest.mark.asyncio
+async def test_normalized_company_analytics_match_the_embedded_ones(mongo, monkeypatch):
+    """Linked trials carry the company_id the analytics engine filters on, so nothing is lost by normalizing."""
+    monkeypatch.setattr(trial_service.settings, "COMPANY_TRIALS_STORAGE", "normalized")
+    monkeypatch.setattr(trial_service.settings, "TRIAL_ANALYTICS_ENGINE", "python")
+    company_id = (await mongo["companies"].insert_one({"name": "Acme"})).inserted_id
+    await mongo["trials"].insert_one({"nct_id": "NCT00000001", "company_id": "other"})
+    trials = [
+        clinical_trial("NCT00000001", "PHASE1", "RECRUITING", 40, "2021-03"),
+        clinical_trial("NCT00000002", "PHASE2", "COMPLETED", 350, "2019-11-02"),
+    ]
+
+    saved = await CompanyTrialService.save_company_trials(str(company_id), trials)
+
+    embedded = (await TrialAnalysisService.analyze_batch(trials)).model_dump()
+    normalized = (await TrialAnalysisService.analyze_company(str(company_id))).model_dump()
+    assert normalized == embedded == saved["trial_analytics"]
+    assert trial_service.cache_service.invalidated == ["other", str(company_id)]
+
+
+@pytest.mark.asyncio
+async def test_embedded_writes_only_unlink_lists_that_were_normalized(mongo, monkeypatch):
+    """An embedded company already holding its array is written in one round trip; a normalized one drops its links."""
+    unlinked = []
+
+    async def unlink_trials(company_id, *fields):
+        unlinked.append((company_id, fields))
+
+    monkeypatch.setattr(CompanyTrialService, "_unlink_trials", unlink_trials)
+    companies = mongo["companies"]
+    embedded = (await companies.insert_one({"name": "Embedded", "trials": []})).inserted_id
+    normalized = (await companies.insert_one({"name": "Normalized"})).inserted_id
+
+    for company_id in (embedded, normalized):
+        result = await CompanyTrialService._set_company_trials(
+            companies, str(company_id), "trials", [study("NCT00000001")], {"updated_at": datetime.utcnow()}
+        )
+        assert result["trials"] == [study("NCT00000001")]
+
+    assert unlinked == [(str(normalized), ("trials",))]
+    assert await CompanyTrialService._set_company_trials(companies, str(ObjectId()), "trials", [], {}) is None
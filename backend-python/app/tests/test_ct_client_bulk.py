@@ -0,0 +1,87 @@
+"""Tests for the chunked bulk study fetcher."""
+
+import asyncio
+
+import httpx
+import pytest
+from ct_client.clinical_trials_gov_rest_api_client import Client, errors
+from ct_client.clinical_trials_gov_rest_api_client.bulk import bulk_fetch_studies, chunk_ids
+
+NCT_IDS = [f"NCT{i:08d}" for i in range(1, 1201)]
+
+
+def make_client(handler) -> Client:
+    client = Client(base_url="https://clinicaltrials.gov/api/v2")
+    client.set_async_httpx_client(
+        httpx.AsyncClient(base_url="https://clinicaltrials.gov/api/v2", transport=httpx.MockTransport(handler))
+    )
+    return client
+
+
+def studies_for(request: httpx.Request) -> httpx.Response:
+    ids = request.url.params["filter.ids"].split("|")
+    return httpx.Response(
+        200, json={"studies": [{"protocolSection": {"identificationModule": {"nctId": nct_id}}} for nct_id in ids]}
+    )
+
+
+def test_chunks_fit_the_url_budget():
+    """Chunks stay under the parameter length budget and the page size."""
+    chunks = chunk_ids(NCT_IDS, max_param_length=1400)
+
+    assert [nct_id for chunk in chunks for nct_id in chunk] == NCT_IDS
+    assert all(len(chunk) == 100 for chunk in chunks)
+    assert len(chunk_ids(NCT_IDS, max_param_length=10**6)) == 2
+
+
+@pytest.mark.asyncio
+async def test_bulk_fetch_dedupes_and_runs_chunks_concurrently():
+    """Repeated IDs are requested and yielded once; chunks overlap up to max_concurrency."""
+    requested = []
+    in_flight = peak = 0
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        nonlocal in_flight, peak
+        requested.extend(request.url.params["filter.ids"].split("|"))
+        assert request.url.params["fields"] == "BriefTitle|NCTId"
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return studies_for(request)
+
+    ids = NCT_IDS + [nct_id.lower() for nct_id in NCT_IDS[:50]]
+    studies = [
+        study
+        async for study in bulk_fetch_studies(
+            ids, client=make_client(handler), fields=["BriefTitle"], max_param_length=1400, max_concurrency=4
+        )
+    ]
+
+    assert sorted(study.protocol_section.identification_module.nct_id for study in studies) == NCT_IDS
+    assert sorted(requested) == NCT_IDS
+    assert peak == 4
+
+
+@pytest.mark.asyncio
+async def test_bulk_fetch_reports_failed_chunks():
+    """With on_error a failing chunk is reported and skipped, otherwise the failure is raised."""
+    def handler(request: httpx.Request) -> httpx.Response:
+        if NCT_IDS[0] in request.url.params["filter.ids"]:
+            return httpx.Response(400, text="bad ids")
+        return studies_for(request)
+
+    failed = []
+    studies = [
+        study
+        async for study in bulk_fetch_studies(
+            NCT_IDS[:200], client=make_client(handler), max_chunk_size=100, lazy=True,
+            on_error=lambda chunk, e: failed.append(chunk),
+        )
+    ]
+    assert [study.nct_id for study in studies] == NCT_IDS[100:200]
+    assert failed == [NCT_IDS[:100]]
+
+    with pytest.raises(errors.UnexpectedStatus):
+        async for _ in bulk_fetch_studies(NCT_IDS[:200], client=make_client(handler), max_chunk_size=100):
+            pass
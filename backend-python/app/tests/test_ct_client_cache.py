@@ -0,0 +1,79 @@
+"""Tests for the ClinicalTrials.gov on-disk response cache."""
+
+import httpx
+import pytest
+from ct_client.clinical_trials_gov_rest_api_client.cache import (
+    AsyncCachingTransport,
+    CachingTransport,
+    SQLiteResponseCache,
+)
+
+
+def versioned_api(version):
+    """Mock CT.gov answering /version with `version[0]` and recording the study requests it served."""
+    calls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path.endswith("/version"):
+            return httpx.Response(200, json={"apiVersion": "2.0.0", "dataTimestamp": version[0]})
+        calls.append((request.method, request.url.path))
+        if request.url.path.endswith("/missing"):
+            return httpx.Response(404)
+        return httpx.Response(200, json={"studies": [], "version": version[0]})
+
+    return httpx.MockTransport(handler), calls
+
+
+@pytest.mark.asyncio
+async def test_repeated_requests_are_served_from_disk(tmp_path):
+    """A second identical GET never reaches the network, whatever its param order."""
+    transport, calls = versioned_api(["2024-01-01T00:00:00"])
+    cache = SQLiteResponseCache(tmp_path / "responses.sqlite3")
+    async with httpx.AsyncClient(
+        transport=AsyncCachingTransport(transport, cache), base_url="https://ct.test/api/v2"
+    ) as client:
+        first = await client.get("/studies", params={"query.cond": "asthma", "pageSize": 10})
+        second = await client.get("/studies", params={"pageSize": 10, "query.cond": "asthma"})
+
+    assert first.json() == second.json()
+    assert calls == [("GET", "/api/v2/studies")]
+    assert (cache.hits, cache.misses) == (1, 1)
+
+    # The blocking transport shares the same file
+    with httpx.Client(transport=CachingTransport(transport, cache), base_url="https://ct.test/api/v2") as client:
+        client.get("/studies", params={"query.cond": "asthma", "pageSize": 10})
+    assert len(calls) == 1
+    cache.close()
+
+
+def test_new_data_version_invalidates(tmp_path):
+    """Once /version reports a new dataTimestamp the stored responses are dropped."""
+    version = ["2024-01-01T00:00:00"]
+    transport, calls = versioned_api(version)
+    cache = SQLiteResponseCache(tmp_path / "responses.sqlite3")
+    caching = CachingTransport(transport, cache, version_ttl=0)
+    with httpx.Client(transport=caching, base_url="https://ct.test/api/v2") as client:
+        client.get("/studies/NCT00000102")
+        client.get("/studies/NCT00000102")
+        version[0] = "2024-01-02T00:00:00"
+        response = client.get("/studies/NCT00000102")
+
+    assert len(calls) == 2
+    assert response.json()["version"] == "2024-01-02T00:00:00"
+    assert cache.data_version() == "2024-01-02T00:00:00"
+    cache.close()
+
+
+def test_only_successful_study_gets_are_cached(tmp_path):
+    """POSTs, non-study paths and error responses always go to the network."""
+    transport, calls = versioned_api(["2024-01-01T00:00:00"])
+    cache = SQLiteResponseCache(tmp_path / "responses.sqlite3")
+    with httpx.Client(transport=CachingTransport(transport, cache), base_url="https://ct.test/api/v2") as client:
+        for _ in range(2):
+            client.post("/studies")
+            client.get("/stats/size")
+            assert client.get("/studies/missing").status_code == 404
+
+    assert len(calls) == 6
+    assert cache.hits == 0
+    cache.close()
@@ -0,0 +1,113 @@
+"""Tests for the ClinicalTrials.gov page-token iterator."""
+
+import asyncio
+import gc
+
+import httpx
+import pytest
+from ct_client.clinical_trials_gov_rest_api_client import Client, LazyStudy, errors
+from ct_client.clinical_trials_gov_rest_api_client.pagination import MAX_PAGE_SIZE, iter_pages, iter_studies
+from ct_client.clinical_trials_gov_rest_api_client.types import UNSET
+
+PAGES = {
+    None: {"studies": [{"protocolSection": {"identificationModule": {"nctId": "NCT00000001"}}}], "nextPageToken": "p2"},
+    "p2": {"studies": [{"protocolSection": {"identificationModule": {"nctId": "NCT00000002"}}}], "nextPageToken": "p3"},
+    "p3": {"studies": [{"protocolSection": {"identificationModule": {"nctId": "NCT00000003"}}}]},
+}
+
+
+def make_client(handler) -> Client:
+    client = Client(base_url="https://clinicaltrials.gov/api/v2")
+    client.set_async_httpx_client(
+        httpx.AsyncClient(base_url="https://clinicaltrials.gov/api/v2", transport=httpx.MockTransport(handler))
+    )
+    return client
+
+
+@pytest.mark.asyncio
+async def test_iter_studies_follows_page_tokens():
+    """Every page is requested with the same query and the max page size."""
+    requests = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        return httpx.Response(200, json=PAGES[request.url.params.get("pageToken")])
+
+    client = make_client(handler)
+    nct_ids = [
+        study.protocol_section.identification_module.nct_id
+        async for study in iter_studies(client=client, query_spons="Acme")
+    ]
+
+    assert nct_ids == ["NCT00000001", "NCT00000002", "NCT00000003"]
+    assert len(requests) == 3
+    assert all(r.url.params["query.spons"] == "Acme" for r in requests)
+    assert all(r.url.params["pageSize"] == str(MAX_PAGE_SIZE) for r in requests)
+
+
+@pytest.mark.asyncio
+async def test_iter_pages_prefetches_next_page():
+    """The next page is already requested when the current page is handed out."""
+    requested = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        token = request.url.params.get("pageToken")
+        requested.append(token)
+        return httpx.Response(200, json=PAGES[token])
+
+    client = make_client(handler)
+    pages = iter_pages(client=client, page_size=5000)
+    await pages.__anext__()
+    # Let the scheduled prefetch run before touching the generator again.
+    for _ in range(5):
+        await asyncio.sleep(0)
+    assert requested == [None, "p2"]
+    await pages.aclose()
+
+
+@pytest.mark.asyncio
+async def test_iter_studies_raises_on_error_status():
+    """A failed page surfaces as UnexpectedStatus instead of silently ending the iteration."""
+    client = make_client(lambda request: httpx.Response(400, text="bad query"))
+
+    with pytest.raises(errors.UnexpectedStatus):
+        async for _ in iter_studies(client=client, query_term="x"):
+            pass
+
+
+@pytest.mark.asyncio
+async def test_abandoning_iteration_retrieves_a_failed_prefetch():
+    """A prefetched page that failed while the caller held the previous one is not reported as never retrieved."""
+    def handler(request: httpx.Request) -> httpx.Response:
+        token = request.url.params.get("pageToken")
+        return httpx.Response(200, json=PAGES[token]) if token is None else httpx.Response(500)
+
+    unretrieved = []
+    loop = asyncio.get_running_loop()
+    loop.set_exception_handler(lambda loop, context: unretrieved.append(context))
+    pages = iter_pages(client=make_client(handler))
+    await pages.__anext__()
+    for _ in range(5):
+        await asyncio.sleep(0)
+    await pages.aclose()
+    del pages
+    gc.collect()
+    loop.set_exception_handler(None)
+
+    assert unretrieved == []
+
+
+@pytest.mark.asyncio
+async def test_iter_studies_lazy_defers_models():
+    """Lazy studies answer shortcut fields from the decoded JSON and build sections only when read."""
+    client = make_client(lambda request: httpx.Response(200, json=PAGES[request.url.params.get("pageToken")]))
+
+    studies = [study async for study in iter_studies(client=client, lazy=True)]
+
+    assert [study.nct_id for study in studies] == ["NCT00000001", "NCT00000002", "NCT00000003"]
+    assert all(isinstance(study, LazyStudy) for study in studies)
+    assert studies[0]._sections == {}
+    section = studies[0].protocol_section
+    assert section.identification_module.nct_id == "NCT00000001"
+    assert studies[0].protocol_section is section
+    assert studies[0].results_section is UNSET
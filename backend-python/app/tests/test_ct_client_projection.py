@@ -0,0 +1,120 @@
+"""Tests for deriving the CT.gov `fields` parameter from declared projections."""
+
+import httpx
+import pytest
+from ct_client.clinical_trials_gov_rest_api_client import Client
+from ct_client.clinical_trials_gov_rest_api_client.api.studies import list_studies
+from ct_client.clinical_trials_gov_rest_api_client.models.field_node import FieldNode
+from ct_client.clinical_trials_gov_rest_api_client.projection import FieldIndex, Projection, load_field_index
+from ct_client.clinical_trials_gov_rest_api_client.types import UNSET
+from ..config.ctgov import CTGovClient
+from ..services.clinical_trials_service import ClinicalTrialsService
+
+METADATA = [
+    {"name": "protocolSection", "piece": "ProtocolSection", "sourceType": "STRUCT", "type": "ProtocolSection",
+     "children": [
+         {"name": "identificationModule", "piece": "IdentificationModule", "sourceType": "STRUCT",
+          "type": "IdentificationModule",
+          "children": [{"name": "nctId", "piece": "NCTId", "sourceType": "TEXT", "type": "nct"}]},
+         {"name": "designModule", "piece": "DesignModule", "sourceType": "STRUCT", "type": "DesignModule",
+          "children": [
+              {"name": "phases", "piece": "Phase", "sourceType": "TEXT", "type": "Phase[]"},
+              {"name": "enrollmentInfo", "piece": "EnrollmentInfo", "sourceType": "STRUCT", "type": "EnrollmentInfo",
+               "children": [{"name": "count", "piece": "EnrollmentCount", "sourceType": "NUMERIC", "type": "integer"}]},
+          ]},
+     ]},
+]
+
+
+def make_client(handler) -> Client:
+    client = Client(base_url="https://clinicaltrials.gov/api/v2")
+    client.set_async_httpx_client(
+        httpx.AsyncClient(base_url="https://clinicaltrials.gov/api/v2", transport=httpx.MockTransport(handler))
+    )
+    return client
+
+
+def test_projection_drops_paths_covered_by_a_branch():
+    """A requested module already includes its children, so only the module is sent."""
+    projection = Projection(
+        "protocolSection.designModule",
+        "protocolSection.designModule.phases",
+        "protocolSection.designModuleExtra",
+    )
+
+    assert projection.fields() == [
+        "protocolSection.designModule",
+        "protocolSection.designModuleExtra",
+        "protocolSection.identificationModule.nctId",
+    ]
+    assert projection.param() == ["|".join(projection.fields())]
+
+
+@pytest.mark.asyncio
+async def test_field_index_maps_paths_to_pieces():
+    """With the metadata tree loaded, projections are validated and sent as piece names."""
+    client = make_client(lambda request: httpx.Response(200, json=METADATA))
+    index = await load_field_index(client)
+
+    projection = Projection("protocolSection.designModule.phases", "EnrollmentCount")
+    assert projection.fields(index) == ["EnrollmentCount", "Phase", "NCTId"]
+
+    with pytest.raises(KeyError):
+        Projection("protocolSection.noSuchModule").fields(index)
+
+
+@pytest.mark.asyncio
+async def test_projected_response_parses_into_partial_models():
+    """Fields outside the projection come back UNSET instead of failing to parse."""
+    seen = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen.append(request.url.params["fields"])
+        return httpx.Response(200, json={"studies": [{"protocolSection": {
+            "identificationModule": {"nctId": "NCT00000001"},
+            "designModule": {"phases": ["PHASE2"]},
+        }}]})
+
+    index = FieldIndex([FieldNode.from_dict(node) for node in METADATA])
+    page = await list_studies.asyncio(
+        client=make_client(handler), fields=Projection("protocolSection.designModule.phases").param(index)
+    )
+
+    assert seen == ["Phase|NCTId"]
+    study = page.studies[0]
+    assert [phase.value for phase in study.protocol_section.design_module.phases] == ["PHASE2"]
+    assert study.protocol_section.status_module is UNSET
+    assert study.results_section is UNSET
+
+
+@pytest.mark.asyncio
+async def test_field_index_loads_at_startup_and_requests_never_fetch_metadata(monkeypatch):
+    """Until the startup load succeeds projections use dotted paths; no request waits on /studies/metadata."""
+    metadata_calls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path.endswith("/studies/metadata"):
+            metadata_calls.append(request.url.path)
+            return httpx.Response(503) if len(metadata_calls) == 1 else httpx.Response(200, json=METADATA)
+        return httpx.Response(200, json={"studies": []})
+
+    client = make_client(handler)
+    client.set_httpx_client(
+        httpx.Client(base_url="https://clinicaltrials.gov/api/v2", transport=httpx.MockTransport(handler))
+    )
+    monkeypatch.setattr(CTGovClient, "client", client)
+    monkeypatch.setattr(CTGovClient, "field_index", None)
+    monkeypatch.setattr(CTGovClient, "FIELD_INDEX_RETRY_INTERVAL", 0.0)
+    service = ClinicalTrialsService()
+    projection = Projection("protocolSection.designModule.phases")
+
+    assert service._fields(projection) == projection.param(None)
+    service.fetch_studies({}, projection)
+    assert metadata_calls == []
+
+    await CTGovClient.connect()
+    await CTGovClient._field_index_task
+    CTGovClient._field_index_task = None
+
+    assert len(metadata_calls) == 2
+    assert service._fields(projection) == ["Phase|NCTId"]
@@ -0,0 +1,74 @@
+"""Tests for the incremental list_studies decoders."""
+
+import csv
+import io
+import json
+
+import httpx
+import pytest
+from ct_client.clinical_trials_gov_rest_api_client import Client
+from ct_client.clinical_trials_gov_rest_api_client.models.list_studies_format import ListStudiesFormat
+from ct_client.clinical_trials_gov_rest_api_client.streaming import StudyArrayScanner, stream_studies
+
+STUDIES = [
+    {"protocolSection": {"identificationModule": {"nctId": "NCT00000001", "briefTitle": 'Braces {[ and "quotes"'}}},
+    {"protocolSection": {"identificationModule": {"nctId": "NCT00000002", "briefTitle": "Back\\slash \\\" ]}"}}},
+    {"protocolSection": {"conditionsModule": {"conditions": ["Asthma", "COPD"]}}, "hasResults": False},
+]
+PAGE = json.dumps({"studies": STUDIES, "nextPageToken": "abc", "totalCount": 3}).encode()
+
+
+def chunked_client(body: bytes, chunk_size: int, headers=None) -> Client:
+    """Client whose responses arrive in ``chunk_size`` byte pieces."""
+    async def chunks():
+        for i in range(0, len(body), chunk_size):
+            yield body[i:i + chunk_size]
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, content=chunks(), headers=headers or {})
+
+    client = Client(base_url="https://clinicaltrials.gov/api/v2")
+    client.set_async_httpx_client(
+        httpx.AsyncClient(base_url="https://clinicaltrials.gov/api/v2", transport=httpx.MockTransport(handler))
+    )
+    return client
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 64, len(PAGE)])
+def test_scanner_splits_studies_at_any_chunk_boundary(chunk_size):
+    """Strings with braces, brackets and escapes never confuse the object boundaries."""
+    scanner = StudyArrayScanner()
+    studies = []
+    for i in range(0, len(PAGE), chunk_size):
+        studies += scanner.feed(PAGE[i:i + chunk_size])
+
+    assert [json.loads(study) for study in studies] == STUDIES
+    assert scanner.finish() == {"studies": [], "nextPageToken": "abc", "totalCount": 3}
+
+
+@pytest.mark.asyncio
+async def test_stream_studies_json():
+    """JSON studies are yielded one by one and the page token is available afterwards."""
+    stream = stream_studies(client=chunked_client(PAGE, 5), query_cond="asthma", lazy=True)
+    nct_ids = [study.nct_id async for study in stream]
+
+    assert nct_ids == ["NCT00000001", "NCT00000002", None]
+    assert stream.next_page_token == "abc"
+    assert stream.total_count == 3
+
+
+@pytest.mark.asyncio
+async def test_stream_studies_csv():
+    """CSV rows, including quoted fields spanning lines, come back as column dicts."""
+    rows = [["NCT Number", "Study Title"], ["NCT00000001", "Line one\nline two, \"quoted\""], ["NCT00000002", "Ünïcode"]]
+    body = io.StringIO()
+    csv.writer(body).writerows(rows)
+
+    stream = stream_studies(
+        client=chunked_client(body.getvalue().encode(), 3, headers={"x-next-page-token": "next"}),
+        format_=ListStudiesFormat.CSV,
+    )
+    records = [record async for record in stream]
+
+    assert records == [dict(zip(rows[0], row)) for row in rows[1:]]
+    assert stream.next_page_token == "next"
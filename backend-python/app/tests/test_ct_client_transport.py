@@ -0,0 +1,117 @@
+"""Tests for the ClinicalTrials.gov rate-limiting retry transport."""
+
+import time
+
+import httpx
+import pytest
+from redis.exceptions import ConnectionError as RedisConnectionError
+from ct_client.clinical_trials_gov_rest_api_client.transport import (
+    AsyncRetryTransport,
+    RetryTransport,
+    TokenBucket,
+    TransportStats,
+)
+from ..services.rate_limiter import RedisTokenBucket
+
+
+def scripted(statuses, headers=None):
+    """Mock transport returning the given statuses in order and recording the methods it saw."""
+    calls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request.method)
+        return httpx.Response(statuses[min(len(calls), len(statuses)) - 1], headers=headers or {})
+
+    return httpx.MockTransport(handler), calls
+
+
+@pytest.mark.asyncio
+async def test_retries_transient_errors_with_backoff():
+    """A GET that hits 503 twice is retried and eventually succeeds."""
+    transport, calls = scripted([503, 503, 200])
+    stats = TransportStats()
+    async with httpx.AsyncClient(
+        transport=AsyncRetryTransport(transport, backoff=0.001, stats=stats), base_url="https://ct.test"
+    ) as client:
+        response = await client.get("/studies")
+
+    assert response.status_code == 200
+    assert len(calls) == 3
+    assert stats.retries == 2
+    assert stats.failures == 0
+
+
+@pytest.mark.asyncio
+async def test_honours_retry_after_and_pauses_bucket():
+    """A 429 with Retry-After is counted, retried and pauses the shared bucket."""
+    transport, calls = scripted([429, 200], headers={"Retry-After": "0.05"})
+    bucket = TokenBucket(rate=1000, capacity=1000)
+    stats = TransportStats()
+    async with httpx.AsyncClient(
+        transport=AsyncRetryTransport(transport, limiter=bucket, stats=stats), base_url="https://ct.test"
+    ) as client:
+        started = time.monotonic()
+        response = await client.get("/studies")
+        elapsed = time.monotonic() - started
+
+    assert response.status_code == 200
+    assert stats.rate_limited == 1
+    assert elapsed >= 0.05
+
+    # Other callers sharing the bucket are held back too
+    await bucket.pause(0.05)
+    assert await bucket.acquire() >= 0.04
+
+
+@pytest.mark.asyncio
+async def test_retry_after_is_waited_once():
+    """The pause on the bucket already delays the retry; the transport does not sleep on top of it."""
+    transport, calls = scripted([429, 200], headers={"Retry-After": "0.2"})
+    bucket = TokenBucket(rate=1000, capacity=1000)
+    async with httpx.AsyncClient(
+        transport=AsyncRetryTransport(transport, limiter=bucket), base_url="https://ct.test"
+    ) as client:
+        started = time.monotonic()
+        await client.get("/studies")
+        elapsed = time.monotonic() - started
+
+    assert 0.2 <= elapsed < 0.35
+
+
+@pytest.mark.asyncio
+async def test_redis_bucket_falls_back_to_a_local_bucket():
+    """With Redis down the shared bucket paces this worker on its own instead of failing every request."""
+    bucket = RedisTokenBucket(rate=50, capacity=1)
+
+    async def unavailable(keys, args):
+        raise RedisConnectionError("Connection refused")
+
+    bucket._script = unavailable
+    waits = [await bucket.acquire() for _ in range(2)]
+
+    assert waits[0] == 0.0
+    assert waits[1] == pytest.approx(0.02, abs=0.01)
+    await bucket.close()
+
+
+def test_does_not_retry_non_idempotent_requests():
+    """POSTs are returned as-is and counted as failures once they hit a retryable status."""
+    transport, calls = scripted([503, 200])
+    stats = TransportStats()
+    with httpx.Client(transport=RetryTransport(transport, backoff=0.001, stats=stats), base_url="https://ct.test") as client:
+        response = client.post("/studies")
+
+    assert response.status_code == 503
+    assert calls == ["POST"]
+    assert stats.failures == 1
+
+
+@pytest.mark.asyncio
+async def test_token_bucket_paces_after_burst():
+    """Once the burst is spent, callers wait roughly 1/rate per token."""
+    bucket = TokenBucket(rate=50, capacity=2)
+    waits = [await bucket.acquire() for _ in range(4)]
+
+    assert waits[:2] == [0.0, 0.0]
+    assert waits[2] > 0
+    assert sum(waits) == pytest.approx(0.04, abs=0.02)
@@ -0,0 +1,33 @@
+"""Tests for the shared ClinicalTrials.gov client registry."""
+
+import pytest
+from ..config.ctgov import CTGovClient
+from ..config.settings import get_settings
+
+
+@pytest.mark.asyncio
+async def test_client_is_shared_and_closed():
+    """Every caller gets the same pooled client until shutdown closes it."""
+    await CTGovClient.connect()
+    client = CTGovClient.get_client()
+    assert CTGovClient.get_client() is client
+
+    async_client = client.get_async_httpx_client()
+    assert async_client.timeout.connect == get_settings().CTGOV_CONNECT_TIMEOUT
+
+    await CTGovClient.close()
+    assert async_client.is_closed
+    assert CTGovClient.client is None
+
+
+@pytest.mark.asyncio
+async def test_pool_stats_reports_limits():
+    """Pool stats are available before and after the pool is opened."""
+    assert CTGovClient.pool_stats()["connections"] == 0
+
+    await CTGovClient.connect()
+    stats = CTGovClient.pool_stats()
+    await CTGovClient.close()
+
+    assert stats["max_connections"] == get_settings().CTGOV_MAX_CONNECTIONS
+    assert stats["active"] + stats["idle"] == stats["connections"]
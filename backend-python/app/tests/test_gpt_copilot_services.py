@@ -0,0 +1,111 @@
+"""Tests for the batched study detail fetcher in ClinicalTrialsService."""
+
+import asyncio
+import json
+
+import httpx
+import pytest
+from ct_client.clinical_trials_gov_rest_api_client.client import Client
+from ct_client.clinical_trials_gov_rest_api_client.models.field_node import FieldNode
+from ct_client.clinical_trials_gov_rest_api_client.projection import FieldIndex
+from ..config.ctgov import CTGovClient
+from ..services.gpt_copilot_services import ClinicalTrialsService
+
+NCT_IDS = [f"NCT{i:08d}" for i in range(1, 251)]
+METADATA = [
+    {"name": "protocolSection", "piece": "ProtocolSection", "sourceType": "STRUCT", "type": "ProtocolSection",
+     "children": [
+         {"name": "identificationModule", "piece": "IdentificationModule", "sourceType": "STRUCT",
+          "type": "IdentificationModule",
+          "children": [
+              {"name": "nctId", "piece": "NCTId", "sourceType": "TEXT", "type": "nct"},
+              {"name": "briefTitle", "piece": "BriefTitle", "sourceType": "TEXT", "type": "text"},
+          ]},
+         {"name": "statusModule", "piece": "StatusModule", "sourceType": "STRUCT", "type": "StatusModule",
+          "children": [{"name": "overallStatus", "piece": "OverallStatus", "sourceType": "ENUM", "type": "Status"}]},
+     ]},
+]
+
+
+def study(nct_id: str) -> dict:
+    return {"protocolSection": {"identificationModule": {"nctId": nct_id}}}
+
+
+def make_service(handler, **kwargs) -> ClinicalTrialsService:
+    client = Client(base_url="https://clinicaltrials.gov/api/v2")
+    client.set_async_httpx_client(
+        httpx.AsyncClient(base_url="https://clinicaltrials.gov/api/v2", transport=httpx.MockTransport(handler))
+    )
+    return ClinicalTrialsService(client=client, **kwargs)
+
+
+@pytest.mark.asyncio
+async def test_fetch_trial_details_bounded_concurrency():
+    """Per-ID fetches run concurrently but never exceed max_concurrency."""
+    in_flight = 0
+    peak = 0
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.001)
+        in_flight -= 1
+        return httpx.Response(200, text=json.dumps(study(request.url.path.rsplit("/", 1)[-1])))
+
+    service = make_service(handler, max_concurrency=4, batch_details=False)
+    details = await service.fetch_trial_details(NCT_IDS[:20])
+
+    assert [d["protocolSection"]["identificationModule"]["nctId"] for d in details] == NCT_IDS[:20]
+    assert 1 < peak <= 4
+
+
+@pytest.mark.asyncio
+async def test_fetch_trial_details_batches_into_filter_ids():
+    """Batch mode issues one list_studies call per ID chunk and keeps the caller's order."""
+    calls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        ids = request.url.params["filter.ids"].split("|")
+        calls.append(ids)
+        return httpx.Response(200, json={"studies": [study(nct_id) for nct_id in reversed(ids)]})
+
+    service = make_service(handler, batch_details=True)
+    details = await service.fetch_trial_details(NCT_IDS)
+
+    assert len(calls) == 3
+    assert max(len(ids) for ids in calls) == ClinicalTrialsService.ID_CHUNK_SIZE
+    assert [d["protocolSection"]["identificationModule"]["nctId"] for d in details] == NCT_IDS
+
+
+@pytest.mark.asyncio
+async def test_fetch_trial_details_skips_failed_ids():
+    """A failing ID is logged and dropped without failing the whole batch."""
+    def handler(request: httpx.Request) -> httpx.Response:
+        nct_id = request.url.path.rsplit("/", 1)[-1]
+        if nct_id == NCT_IDS[1]:
+            return httpx.Response(404, text="not found")
+        return httpx.Response(200, text=json.dumps(study(nct_id)))
+
+    service = make_service(handler, batch_details=False)
+    details = await service.fetch_trial_details(NCT_IDS[:3])
+
+    assert [d["protocolSection"]["identificationModule"]["nctId"] for d in details] == [NCT_IDS[0], NCT_IDS[2]]
+
+
+@pytest.mark.asyncio
+async def test_fetch_trials_requests_only_the_projected_fields(monkeypatch):
+    """The search asks for NCT IDs only and the details for the fields shown, as piece names once indexed."""
+    index = FieldIndex([FieldNode.from_dict(node) for node in METADATA])
+    monkeypatch.setattr(CTGovClient, "field_index", index)
+    requested = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requested.append(request.url.params["fields"])
+        return httpx.Response(200, json={"studies": [study(nct_id) for nct_id in NCT_IDS[:2]]})
+
+    service = make_service(handler, batch_details=True)
+    result = await service.fetch_trials("asthma")
+
+    assert len(result["trial_results"]) == 2
+    assert requested == ["NCTId", "BriefTitle|NCTId|OverallStatus"]
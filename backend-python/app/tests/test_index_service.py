@@ -0,0 +1,37 @@
+"""Tests for index drift detection and query plan checks."""
+
+from ..services.index_service import IndexService
+
+
+def test_diff_reports_missing_extra_and_changed_indexes():
+    """Indexes are matched by name; differing keys or options count as changed, _id_ is never extra."""
+    declared = [
+        {"keys": [("nct_id", 1)], "name": "nct_id_unique", "unique": True, "partial": {"nct_id": {"$exists": True}}},
+        {"keys": [("company_id", 1)], "name": "company_id"},
+        {"keys": [("updated_at", -1)], "name": "updated_at_desc"},
+    ]
+    existing = {
+        "_id_": {"key": [("_id", 1)], "v": 2},
+        "nct_id_unique": {
+            "key": [("nct_id", 1.0)], "v": 2, "unique": True, "partialFilterExpression": {"nct_id": {"$exists": True}}
+        },
+        "company_id": {"key": [("company_id", -1)], "v": 2},
+        "companyName_1": {"key": [("companyName", 1)], "v": 2, "unique": True},
+    }
+
+    assert IndexService.diff(declared, existing) == {
+        "missing": ["updated_at_desc"],
+        "extra": ["companyName_1"],
+        "changed": ["company_id"],
+    }
+
+
+def test_plan_problems_finds_nested_scans_and_sorts():
+    """A COLLSCAN or in-memory SORT anywhere in the winning plan marks the query as uncovered."""
+    covered = {"stage": "FETCH", "inputStage": {"stage": "IXSCAN", "indexName": "nct_id_unique"}}
+    scanned = {"stage": "SORT", "inputStage": {"stage": "COLLSCAN"}}
+    slot_based = {"queryPlan": {"stage": "OR", "inputStages": [{"stage": "IXSCAN"}, {"stage": "COLLSCAN"}]}}
+
+    assert IndexService.plan_problems(covered) == []
+    assert sorted(IndexService.plan_problems(scanned)) == ["COLLSCAN", "SORT"]
+    assert IndexService.plan_problems(slot_based) == ["COLLSCAN"]
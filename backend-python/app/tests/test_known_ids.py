@@ -0,0 +1,30 @@
+"""Tests for the Bloom filters behind negative caching."""
+
+from ..services.known_ids import BloomFilter, KnownIds
+
+
+def test_bloom_filter_has_no_false_negatives_and_few_false_positives():
+    """Every added id is found; unknown ids are rejected at about the configured error rate."""
+    known = [f"NCT{n:08d}" for n in range(10000)]
+    bloom = BloomFilter.from_items(known, capacity=len(known), error_rate=0.01)
+
+    assert all(nct_id in bloom for nct_id in known)
+    false_positives = sum(f"NCT{n:08d}" in bloom for n in range(10000, 30000))
+    assert false_positives < 20000 * 0.02
+
+
+def test_known_ids_only_rule_out_ids_once_built():
+    """Without a filter every id might exist; ids added during a rebuild survive the swap."""
+    KnownIds._filters.clear()
+    assert KnownIds.might_exist("trial", "NCT99999999")
+
+    KnownIds._filters["trial"] = BloomFilter(100)
+    KnownIds._pending["trial"] = set()
+    try:
+        assert not KnownIds.might_exist("trial", "NCT99999999")
+        KnownIds.add("trial", "NCT99999999")
+        assert KnownIds.might_exist("trial", "NCT99999999")
+        assert KnownIds._pending["trial"] == {"NCT99999999"}
+    finally:
+        KnownIds._filters.clear()
+        KnownIds._pending.clear()
@@ -0,0 +1,53 @@
+"""Tests for the in-process L1 cache used by CacheService."""
+
+import time
+
+from ..services.cache_service import CacheService
+from ..services.local_cache import LocalCache
+
+
+def test_evicts_least_recently_used_by_size():
+    """Entries are evicted oldest-first once their combined size exceeds the budget."""
+    cache = LocalCache(max_bytes=100, default_ttl=60)
+    cache.set("a", {"v": 1}, size=40)
+    cache.set("b", {"v": 2}, size=40)
+    assert cache.get("a") == {"v": 1}  # a is now the most recently used
+
+    cache.set("c", {"v": 3}, size=40)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == {"v": 1}
+    assert cache.get("c") == {"v": 3}
+    assert cache.bytes == 80
+    assert cache.evictions == 1
+
+
+def test_expires_entries_and_skips_oversized_values():
+    """Expired entries are misses and values larger than the whole budget are never kept."""
+    cache = LocalCache(max_bytes=100, default_ttl=60)
+    cache.set("short", [1], size=10, ttl=0.01)
+    cache.set("huge", [2], size=1000)
+    time.sleep(0.02)
+
+    assert cache.get("short") is None
+    assert cache.get("huge") is None
+    assert cache.bytes == 0
+    assert (cache.hits, cache.misses) == (0, 2)
+
+
+def test_invalidation_messages_from_other_workers_drop_keys():
+    """A worker ignores its own invalidation messages but applies everyone else's."""
+    CacheService.local.set("company_trials:1", [], size=2)
+    CacheService._handle_invalidation(f"{CacheService.instance_id} company_trials:1")
+    assert CacheService.local.get("company_trials:1") == []
+
+    CacheService._handle_invalidation("other-worker company_trials:1")
+    assert CacheService.local.get("company_trials:1") is None
+
+
+def test_namespace_messages_drop_memoized_namespaces():
+    """A namespace bump in another worker makes this one re-read the collection's namespace."""
+    CacheService._namespaces["trials"] = ("current.1.0.0.1", float("inf"))
+    CacheService._handle_invalidation("other-worker ns:trials")
+
+    assert "trials" not in CacheService._namespaces
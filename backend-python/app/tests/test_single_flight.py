@@ -0,0 +1,49 @@
+"""Tests for the request coalescing behind CacheService.get_or_load."""
+
+import asyncio
+
+import pytest
+
+from ..services.single_flight import SingleFlight
+
+
+@pytest.mark.asyncio
+async def test_concurrent_calls_share_one_load():
+    """Callers arriving while a load is in flight get its result instead of starting another."""
+    flights = SingleFlight()
+    calls = 0
+
+    async def load():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return ["NCT00000000"]
+
+    results = await asyncio.gather(*(flights.do("company_trials:1", load) for _ in range(20)))
+
+    assert calls == 1
+    assert all(result == ["NCT00000000"] for result in results)
+    assert "company_trials:1" not in flights
+    assert await flights.do("company_trials:1", load) == ["NCT00000000"]
+    assert calls == 2
+
+
+@pytest.mark.asyncio
+async def test_failures_propagate_and_cancelled_waiters_do_not_cancel_the_load():
+    """Every waiter sees the loader's exception; a cancelled waiter leaves the shared load running."""
+    flights = SingleFlight()
+    release = asyncio.Event()
+
+    async def fail():
+        await release.wait()
+        raise RuntimeError("mongo unavailable")
+
+    waiters = [asyncio.ensure_future(flights.do("key", fail)) for _ in range(3)]
+    await asyncio.sleep(0)
+    waiters[0].cancel()
+    release.set()
+    results = await asyncio.gather(*waiters, return_exceptions=True)
+
+    assert isinstance(results[0], asyncio.CancelledError)
+    assert all(isinstance(result, RuntimeError) for result in results[1:])
+    assert "key" not in flights
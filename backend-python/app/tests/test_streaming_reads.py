@@ -0,0 +1,65 @@
+"""Tests for cursor-streamed trial and company reads and their JSON responses."""
+
+import json
+from datetime import datetime
+
+import pytest
+from bson import ObjectId
+
+from ..routes.streaming import projection, stream_json
+from ..services.trial_service import TrialService
+
+
+async def documents(*items):
+    for item in items:
+        yield item
+
+
+async def body(response) -> str:
+    return b"".join([chunk async for chunk in response.body_iterator]).decode()
+
+
+def test_projection_from_fields():
+    assert projection(None) is None
+    assert projection("nct_id, protocolSection.statusModule,") == {"nct_id": 1, "protocolSection.statusModule": 1}
+
+
+@pytest.mark.asyncio
+async def test_stream_json_writes_an_enveloped_array():
+    """Documents are encoded as they arrive; an empty cursor still yields valid JSON."""
+    oid = ObjectId()
+    response = await stream_json(
+        documents({"_id": oid, "at": datetime(2024, 1, 2)}, {"n": 2}), prefix='{"data": [', suffix="]}"
+    )
+    assert json.loads(await body(response)) == {"data": [{"_id": str(oid), "at": "2024-01-02T00:00:00"}, {"n": 2}]}
+    assert json.loads(await body(await stream_json(documents()))) == []
+
+
+@pytest.mark.asyncio
+async def test_stream_json_reports_failures_before_and_after_the_status():
+    """A failing first document raises before any response exists; a later one closes the array with an error."""
+    def validate(document):
+        if "name" not in document:
+            raise ValueError("name is required")
+        return document
+
+    with pytest.raises(ValueError):
+        await stream_json(documents({"id": 1}), transform=validate)
+
+    response = await stream_json(documents({"name": "a"}, {"id": 2}, {"name": "c"}), transform=validate)
+    assert response.status_code == 200
+    assert json.loads(await body(response)) == [{"name": "a"}, {"error": "name is required"}]
+
+
+@pytest.mark.asyncio
+async def test_iter_company_trials_streams_projected_documents(mongo_db):
+    """A projection skips validation and returns only the requested fields, across several cursor batches."""
+    await mongo_db.trials.insert_many(
+        [{"nct_id": f"NCT{index:08d}", "company_id": "acme", "protocolSection": {}} for index in range(5)]
+    )
+
+    trials = [
+        trial async for trial in TrialService.iter_company_trials("acme", {"nct_id": 1, "_id": 0}, batch_size=2)
+    ]
+
+    assert trials == [{"nct_id": f"NCT{index:08d}"} for index in range(5)]
@@ -0,0 +1,86 @@
+"""Tests for the in-process and $facet trial analytics engines."""
+
+import random
+
+import pytest
+
+from ..services.trial_analytics_engine import TrialAnalyticsEngine
+
+
+def trial(company_id, phases=None, status=None, conditions=None, enrollment=None, start=None, completion=None):
+    return {
+        "company_id": company_id,
+        "protocolSection": {
+            "designModule": {"phases": phases, "enrollmentInfo": {"count": enrollment}},
+            "statusModule": {
+                "overallStatus": status,
+                "startDateStruct": {"date": start},
+                "completionDateStruct": {"date": completion},
+            },
+            "conditionsModule": {"conditions": conditions},
+        },
+    }
+
+
+def portfolio(seed: int = 7):
+    """Two companies' trials, including the awkward shapes both engines must treat alike."""
+    rng = random.Random(seed)
+    trials = [
+        trial("a", phases=[], status=None, conditions="Asthma", enrollment=0, start="", completion="2020"),
+        trial("a", phases=[None], enrollment=12.5, start="2021-02-30", completion="2022-01-01"),
+        {"company_id": "b", "nct_id": "NCT00000000"},
+    ]
+    for _ in range(200):
+        trials.append(trial(
+            rng.choice(["a", "b"]),
+            phases=rng.choice([["PHASE1"], ["PHASE2", "PHASE3"], ["PHASE3"], None]),
+            status=rng.choice(["RECRUITING", "COMPLETED", "TERMINATED"]),
+            conditions=rng.sample(["Asthma", "COPD", "Lung Cancer", "Diabetes"], rng.randint(0, 3)),
+            enrollment=rng.choice([None, rng.randint(1, 3000)]),
+            start=f"{rng.randint(2000, 2024)}-{rng.randint(1, 12):02d}",
+            completion=rng.choice([None, f"{rng.randint(2000, 2030)}-{rng.randint(1, 12):02d}-15"]),
+        ))
+    return trials
+
+
+def test_compute_applies_the_documented_rules():
+    """Missing phases and statuses get placeholders; only positive integer enrollments and valid dates count."""
+    analytics = TrialAnalyticsEngine.compute([
+        trial("a", phases=["PHASE2", "PHASE3"], status="RECRUITING", conditions=["Asthma", "COPD"], enrollment=100,
+              start="2020-01", completion="2020-01-31"),
+        trial("a", phases=[], conditions=["Asthma"], enrollment=300, start="2021-06-01", completion="bad"),
+        trial("a", enrollment=12.5),
+    ])
+
+    assert analytics["total_trials"] == 3
+    assert analytics["phase_distribution"] == {"PHASE2": 1, "Not Specified": 2}
+    assert analytics["status_summary"] == {"RECRUITING": 1, "Unknown": 2}
+    assert analytics["therapeutic_areas"] == {"Asthma": 2, "COPD": 1}
+    assert analytics["enrollment_stats"] == {
+        "total": 400, "average": 200, "median": 200.0, "distribution": {"1-100": 1, "101-500": 1}
+    }
+    assert analytics["timeline"] == {
+        "start_years": {"2020": 1, "2021": 1}, "average_duration_days": 30, "median_duration_days": 30
+    }
+
+
+@pytest.mark.asyncio
+async def test_aggregation_matches_python(mongo_db):
+    """The $facet pipeline returns, per company, what compute returns for that company's trials."""
+    trials = portfolio()
+    await mongo_db.trials.insert_many([dict(document) for document in trials])
+
+    aggregated = await TrialAnalyticsEngine.aggregate(mongo_db.trials, ["a", "b", "none"])
+
+    for company_id in ("a", "b", "none"):
+        expected = TrialAnalyticsEngine.compute(document for document in trials if document["company_id"] == company_id)
+        assert _approx_equal(aggregated[company_id], expected)
+
+
+def _approx_equal(actual, expected) -> bool:
+    """Nested comparison with float tolerance; server averages are doubles where Python may keep ints."""
+    if isinstance(expected, dict):
+        assert actual.keys() == expected.keys()
+        return all(_approx_equal(actual[key], expected[key]) for key in expected)
+    assert actual == pytest.approx(expected)
+    return True
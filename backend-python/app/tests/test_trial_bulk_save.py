@@ -0,0 +1,120 @@
+"""Tests for the bulk upsert path behind TrialService.save_trial_data and bulk_save_trials."""
+
+import pytest
+from fastapi import FastAPI
+from httpx import ASGITransport, AsyncClient
+
+from ..config.database import MongoDB
+from ..routes import trial_routes
+from ..services import trial_service
+from ..services.cache_service import CacheService
+from ..services.schema_service import SchemaService
+from ..services.trial_service import TrialService
+from .fixtures.fake_mongo import FakeMongo
+from .fixtures.fake_redis import FakeRedis
+
+
+@pytest.fixture
+def mongo(monkeypatch):
+    mongo = FakeMongo()
+    monkeypatch.setattr(MongoDB, "get_collection", mongo.get_collection)
+    return mongo
+
+
+@pytest.fixture
+def cache(monkeypatch):
+    cache = CacheService()
+    cache.redis = FakeRedis()
+    CacheService._namespaces.clear()
+    CacheService.local.clear()
+    monkeypatch.setattr(trial_service, "cache_service", cache)
+    return cache
+
+
+@pytest.fixture(autouse=True)
+def titles_required(monkeypatch):
+    """Validation reports trials without a title, one error per trial in input order."""
+    async def validation_errors(collection_name, documents, context=None):
+        return [None if "title" in document else "title is required" for document in documents]
+
+    monkeypatch.setattr(SchemaService, "validation_errors", validation_errors)
+
+
+@pytest.mark.asyncio
+async def test_bulk_upsert_reports_failed_trials_and_writes_the_rest(mongo_db):
+    """Batches are unordered: one failing upsert is reported by its index and the others still land."""
+    existing = await mongo_db.trials.insert_one({"nct_id": "NCT00000002", "company_id": "acme"})
+    trials = [(index, {"nct_id": f"NCT{index:08d}", "company_id": "acme"}) for index in range(5)]
+    # Changing _id of an existing document is rejected by the server
+    trials[2][1]["_id"] = "not-" + str(existing.inserted_id)
+
+    counts, errors = await TrialService._bulk_upsert(trials, batch_size=2, concurrency=2)
+
+    assert [(error["index"], error["nct_id"]) for error in errors] == [(2, "NCT00000002")]
+    assert counts["upserted"] == 4
+    assert await mongo_db.trials.count_documents({}) == 5
+
+
+@pytest.mark.asyncio
+async def test_bulk_save_reports_invalid_trials_by_index_and_saves_the_rest(mongo, cache):
+    """Trials failing validation or missing an NCT ID are listed by position; valid ones are written in batches."""
+    trials = [
+        {"nct_id": "NCT00000001", "title": "a"},
+        {"nct_id": "NCT00000002"},
+        {"title": "no id"},
+        {"nct_id": "NCT00000004", "title": "d"},
+        {"nct_id": "NCT00000005", "title": "e"},
+    ]
+
+    result = await TrialService.bulk_save_trials("acme", trials, batch_size=2)
+
+    assert result["errors"] == [
+        {"index": 1, "nct_id": "NCT00000002", "error": "title is required"},
+        {"index": 2, "nct_id": None, "error": "Missing nct_id"},
+    ]
+    assert not result["success"] and result["count"] == 3 and result["upserted"] == 3
+    assert mongo["trials"].bulk_writes == [2, 1]
+    assert {trial["nct_id"] for trial in mongo["trials"].documents} == {"NCT00000001", "NCT00000004", "NCT00000005"}
+
+
+@pytest.mark.asyncio
+async def test_bulk_save_writes_the_last_occurrence_of_a_repeated_nct_id(mongo, cache):
+    """A repeated NCT ID is upserted once, with its last value."""
+    trials = [{"nct_id": "NCT00000001", "title": "first"}, {"nct_id": "NCT00000001", "title": "last"}]
+
+    result = await TrialService.bulk_save_trials("acme", trials)
+
+    assert result["success"] and result["upserted"] == 1
+    assert mongo["trials"].bulk_writes == [1]
+    assert [trial["title"] for trial in mongo["trials"].documents] == ["last"]
+
+
+@pytest.mark.asyncio
+async def test_bulk_save_invalidates_each_company_tag_once(mongo, cache):
+    """However many batches are written, the company's tag is bumped once, and cached values are gone."""
+    await cache.set_many(CacheService.TRIALS, {"acme": [], "other": []})
+    trials = [{"nct_id": f"NCT{index:08d}", "title": str(index)} for index in range(5)]
+
+    await TrialService.bulk_save_trials("acme", trials, batch_size=2)
+
+    assert cache.redis.data["tagver:company:acme"] == b"1"
+    assert "tagver:company:other" not in cache.redis.data
+    hits, misses = await cache.get_many_trials(["acme", "other"])
+    assert misses == ["acme"] and set(hits) == {"other"}
+
+
+@pytest.mark.asyncio
+async def test_bulk_route_returns_the_save_result(mongo, cache):
+    """POST /{company_id}/trials/bulk answers 200 with per-trial errors rather than failing the call."""
+    app = FastAPI()
+    app.include_router(trial_routes.router)
+    trials = [{"nct_id": "NCT00000001", "title": "a"}, {"nct_id": "NCT00000002"}]
+
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        response = await client.post("/api/companies/acme/trials/bulk", json=trials)
+
+    assert response.status_code == 200
+    data = response.json()["data"]
+    assert data["count"] == 1 and data["upserted"] == 1
+    assert data["errors"] == [{"index": 1, "nct_id": "NCT00000002", "error": "title is required"}]
+    assert mongo["trials"].documents[0]["company_id"] == "acme"
@@ -1,24 +1,19 @@
 """
 A client library for accessing ClinicalTrials.gov REST API
 """
-"""
-A client library for accessing ClinicalTrials.gov REST API
-"""
 from .client import AuthenticatedClient, Client
 from .client import Configuration
 from .api.studies.fetch_study import sync as fetch_study_sync
+from .bulk import bulk_fetch_studies
+from .lazy import LazyStudy
+from .pagination import iter_studies
 
 __all__ = (
     "AuthenticatedClient",
     "Client",
     "Configuration",
     "fetch_study_sync",
-)
-
-
-__all__ = (
-    "AuthenticatedClient",
-    "Client",
-    "ClinicalTrialsApi",
-    "Configuration",
+    "iter_studies",
+    "LazyStudy",
+    "bulk_fetch_studies",
 )
@@ -0,0 +1,242 @@
+"""Persistent response cache for the study endpoints, keyed on the ClinicalTrials.gov data version
+
+Study data only changes when ClinicalTrials.gov refreshes its dataset, which `/version` reports as `dataTimestamp`.
+The caching transports store raw response bytes in SQLite under a hash of the normalised request and the current
+data version, and drop every entry as soon as `/version` reports a new timestamp.
+"""
+
+import asyncio
+import hashlib
+import json
+import re
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Optional, Union
+
+import httpx
+from attrs import define
+
+# /studies, /studies/{nctId}, /studies/enums, /studies/search-areas and /studies/metadata
+CACHEABLE_PATH = re.compile(r"^(?P<prefix>.*)/studies(?:/[^/]+)?$")
+
+
+@define
+class CachedResponse:
+    status_code: int
+    headers: list[tuple[str, str]]
+    content: bytes
+
+
+class SQLiteResponseCache:
+    """Response store in a single SQLite file, safe to share between threads and both transports"""
+
+    def __init__(self, path: Union[str, Path]):
+        self.path = Path(path)
+        self.hits = 0
+        self.misses = 0
+        self._connection: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        # Opened lazily so merely configuring a cache never touches the disk
+        if self._connection is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._connection = sqlite3.connect(self.path, check_same_thread=False)
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                "key TEXT PRIMARY KEY, status_code INTEGER, headers TEXT, content BLOB, stored_at REAL)"
+            )
+            self._connection.execute("CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value TEXT)")
+            self._connection.commit()
+        return self._connection
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        with self._lock:
+            row = self._connect().execute(
+                "SELECT status_code, headers, content FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return CachedResponse(status_code=row[0], headers=[tuple(h) for h in json.loads(row[1])], content=row[2])
+
+    def set(self, key: str, response: CachedResponse) -> None:
+        with self._lock:
+            connection = self._connect()
+            connection.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?)",
+                (key, response.status_code, json.dumps(response.headers), response.content, time.time()),
+            )
+            connection.commit()
+
+    def data_version(self) -> Optional[str]:
+        with self._lock:
+            row = self._connect().execute("SELECT value FROM meta WHERE name = 'data_version'").fetchone()
+        return row[0] if row else None
+
+    def set_data_version(self, version: str) -> bool:
+        """Record the current data version, clearing every stored response if it changed. Returns True on change."""
+        with self._lock:
+            connection = self._connect()
+            row = connection.execute("SELECT value FROM meta WHERE name = 'data_version'").fetchone()
+            if row and row[0] == version:
+                return False
+            connection.execute("DELETE FROM responses")
+            connection.execute("INSERT OR REPLACE INTO meta VALUES ('data_version', ?)", (version,))
+            connection.commit()
+            return True
+
+    def clear(self) -> None:
+        with self._lock:
+            connection = self._connect()
+            connection.execute("DELETE FROM responses")
+            connection.commit()
+
+    def close(self) -> None:
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+
+
+def cache_key(request: httpx.Request, data_version: str) -> str:
+    """Hash of the method, URL without query, sorted query params and data version"""
+    params = sorted(request.url.params.multi_items())
+    identity = json.dumps(
+        [request.method, str(request.url.copy_with(query=None)), params, data_version], separators=(",", ":")
+    )
+    return hashlib.sha256(identity.encode()).hexdigest()
+
+
+class _VersionedCache:
+    def __init__(self, cache: SQLiteResponseCache, version_ttl: float = 300.0):
+        self.cache = cache
+        self.version_ttl = version_ttl
+        self._version: Optional[str] = None
+        self._checked_at = 0.0
+
+    @staticmethod
+    def _cache_prefix(request: httpx.Request) -> Optional[str]:
+        if request.method != "GET":
+            return None
+        match = CACHEABLE_PATH.match(request.url.path)
+        return match.group("prefix") if match else None
+
+    @staticmethod
+    def _version_request(request: httpx.Request, prefix: str) -> httpx.Request:
+        return httpx.Request("GET", request.url.copy_with(path=f"{prefix}/version", query=None))
+
+    def _version_is_stale(self) -> bool:
+        return self._version is None or time.monotonic() - self._checked_at > self.version_ttl
+
+    def _apply_version(self, response: httpx.Response) -> None:
+        self._checked_at = time.monotonic()
+        if response.status_code != 200:
+            return
+        version = json.loads(response.content).get("dataTimestamp")
+        if version:
+            self.cache.set_data_version(version)
+            self._version = version
+
+    @staticmethod
+    def _to_cached(response: httpx.Response, content: bytes) -> CachedResponse:
+        return CachedResponse(status_code=response.status_code, headers=response.headers.multi_items(), content=content)
+
+    @staticmethod
+    def _to_response(request: httpx.Request, cached: CachedResponse) -> httpx.Response:
+        return httpx.Response(cached.status_code, headers=cached.headers, content=cached.content, request=request)
+
+
+class AsyncCachingTransport(_VersionedCache, httpx.AsyncBaseTransport):
+    """Async transport answering study endpoint GETs from a `SQLiteResponseCache` while the data version holds"""
+
+    def __init__(self, transport: httpx.AsyncBaseTransport, cache: SQLiteResponseCache, version_ttl: float = 300.0):
+        super().__init__(cache, version_ttl)
+        self.transport = transport
+        self._version_lock = asyncio.Lock()
+
+    async def _refresh_version(self, request: httpx.Request, prefix: str) -> Optional[str]:
+        async with self._version_lock:
+            if self._version_is_stale():
+                try:
+                    response = await self.transport.handle_async_request(self._version_request(request, prefix))
+                    await response.aread()
+                    await asyncio.to_thread(self._apply_version, response)
+                except (httpx.HTTPError, ValueError):
+                    # Keep serving the last known version; check again on the next request
+                    self._checked_at = time.monotonic()
+        return self._version
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        prefix = self._cache_prefix(request)
+        version = await self._refresh_version(request, prefix) if prefix is not None else None
+        if version is None:
+            return await self.transport.handle_async_request(request)
+
+        key = cache_key(request, version)
+        cached = await asyncio.to_thread(self.cache.get, key)
+        if cached is not None:
+            return self._to_response(request, cached)
+
+        response = await self.transport.handle_async_request(request)
+        if response.status_code != 200:
+            return response
+        # Raw (still content-encoded) bytes; the client decodes them as usual when the cached copy is replayed
+        content = b"".join([chunk async for chunk in response.stream])
+        await response.aclose()
+        cached = self._to_cached(response, content)
+        await asyncio.to_thread(self.cache.set, key, cached)
+        return self._to_response(request, cached)
+
+    async def aclose(self) -> None:
+        await self.transport.aclose()
+
+
+class CachingTransport(_VersionedCache, httpx.BaseTransport):
+    """Blocking counterpart of `AsyncCachingTransport`"""
+
+    def __init__(self, transport: httpx.BaseTransport, cache: SQLiteResponseCache, version_ttl: float = 300.0):
+        super().__init__(cache, version_ttl)
+        self.transport = transport
+        self._version_lock = threading.Lock()
+
+    def _refresh_version(self, request: httpx.Request, prefix: str) -> Optional[str]:
+        with self._version_lock:
+            if self._version_is_stale():
+                try:
+                    response = self.transport.handle_request(self._version_request(request, prefix))
+                    response.read()
+                    self._apply_version(response)
+                except (httpx.HTTPError, ValueError):
+                    self._checked_at = time.monotonic()
+        return self._version
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        prefix = self._cache_prefix(request)
+        version = self._refresh_version(request, prefix) if prefix is not None else None
+        if version is None:
+            return self.transport.handle_request(request)
+
+        key = cache_key(request, version)
+        cached = self.cache.get(key)
+        if cached is not None:
+            return self._to_response(request, cached)
+
+        response = self.transport.handle_request(request)
+        if response.status_code != 200:
+            return response
+        content = b"".join(response.stream)
+        response.close()
+        cached = self._to_cached(response, content)
+        self.cache.set(key, cached)
+        return self._to_response(request, cached)
+
+    def close(self) -> None:
+        self.transport.close()
+
+
+__all__ = ["AsyncCachingTransport", "CachingTransport", "SQLiteResponseCache", "cache_key"]
@@ -0,0 +1,182 @@
+"""Lazy study views that defer building the attrs model tree until a section is actually read
+
+`Study.from_dict` eagerly converts every nested module of every study on a page, which dominates the cost of a
+1000-study page when the caller only needs a few fields. `LazyStudy` keeps the decoded JSON and materialises each
+top-level section on first access, while the shortcut properties read straight from the decoded dict.
+"""
+
+from typing import TYPE_CHECKING, Any, Optional, TypeVar, Union
+
+from .types import UNSET, Unset
+
+if TYPE_CHECKING:
+    from .models.annotation_section import AnnotationSection
+    from .models.derived_section import DerivedSection
+    from .models.document_section import DocumentSection
+    from .models.protocol_section import ProtocolSection
+    from .models.results_section import ResultsSection
+    from .models.study import Study
+
+try:
+    import orjson
+
+    def loads(content: Union[bytes, str]) -> Any:
+        """Decode JSON with orjson when it is installed, falling back to the standard library"""
+        return orjson.loads(content)
+
+except ImportError:  # pragma: no cover - exercised only without orjson
+    import json
+
+    def loads(content: Union[bytes, str]) -> Any:
+        """Decode JSON with orjson when it is installed, falling back to the standard library"""
+        return json.loads(content)
+
+
+T = TypeVar("T", bound="LazyStudy")
+P = TypeVar("P", bound="LazyPagedStudies")
+
+
+class LazyStudy:
+    """Read-only view over one decoded study
+
+    Attributes:
+        nct_id (Optional[str]): `protocolSection.identificationModule.nctId`, read without building any model.
+        brief_title (Optional[str]): `protocolSection.identificationModule.briefTitle`.
+        overall_status (Optional[str]): `protocolSection.statusModule.overallStatus`, as the raw enum value.
+        phases (list[str]): `protocolSection.designModule.phases`, as raw enum values.
+        protocol_section (Union[Unset, ProtocolSection]): Built with `ProtocolSection.from_dict` on first access.
+        results_section (Union[Unset, ResultsSection]): Built on first access.
+        annotation_section (Union[Unset, AnnotationSection]): Built on first access.
+        document_section (Union[Unset, DocumentSection]): Built on first access.
+        derived_section (Union[Unset, DerivedSection]): Built on first access.
+        has_results (Union[Unset, bool]):
+    """
+
+    __slots__ = ("_raw", "_sections")
+
+    def __init__(self, raw: dict[str, Any]):
+        self._raw = raw
+        self._sections: dict[str, Any] = {}
+
+    @classmethod
+    def from_dict(cls: type[T], src_dict: dict[str, Any]) -> T:
+        return cls(src_dict)
+
+    @classmethod
+    def from_json(cls: type[T], content: Union[bytes, str]) -> T:
+        return cls(loads(content))
+
+    def to_dict(self) -> dict[str, Any]:
+        """The decoded study, as returned by the API"""
+        return self._raw
+
+    def to_model(self) -> "Study":
+        """Build the complete eager `Study` model"""
+        from .models.study import Study
+
+        return Study.from_dict(self._raw)
+
+    def _module(self, module: str) -> dict[str, Any]:
+        return self._raw.get("protocolSection", {}).get(module, {})
+
+    @property
+    def nct_id(self) -> Optional[str]:
+        return self._module("identificationModule").get("nctId")
+
+    @property
+    def brief_title(self) -> Optional[str]:
+        return self._module("identificationModule").get("briefTitle")
+
+    @property
+    def overall_status(self) -> Optional[str]:
+        return self._module("statusModule").get("overallStatus")
+
+    @property
+    def phases(self) -> list[str]:
+        return self._module("designModule").get("phases", [])
+
+    def _section(self, key: str, model: type) -> Any:
+        if key not in self._sections:
+            raw = self._raw.get(key, UNSET)
+            self._sections[key] = UNSET if isinstance(raw, Unset) else model.from_dict(raw)
+        return self._sections[key]
+
+    @property
+    def protocol_section(self) -> Union[Unset, "ProtocolSection"]:
+        from .models.protocol_section import ProtocolSection
+
+        return self._section("protocolSection", ProtocolSection)
+
+    @property
+    def results_section(self) -> Union[Unset, "ResultsSection"]:
+        from .models.results_section import ResultsSection
+
+        return self._section("resultsSection", ResultsSection)
+
+    @property
+    def annotation_section(self) -> Union[Unset, "AnnotationSection"]:
+        from .models.annotation_section import AnnotationSection
+
+        return self._section("annotationSection", AnnotationSection)
+
+    @property
+    def document_section(self) -> Union[Unset, "DocumentSection"]:
+        from .models.document_section import DocumentSection
+
+        return self._section("documentSection", DocumentSection)
+
+    @property
+    def derived_section(self) -> Union[Unset, "DerivedSection"]:
+        from .models.derived_section import DerivedSection
+
+        return self._section("derivedSection", DerivedSection)
+
+    @property
+    def has_results(self) -> Union[Unset, bool]:
+        return self._raw.get("hasResults", UNSET)
+
+    def __getitem__(self, key: str) -> Any:
+        return self._raw[key]
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._raw
+
+    def __repr__(self) -> str:
+        return f"LazyStudy(nct_id={self.nct_id!r})"
+
+
+class LazyPagedStudies:
+    """`PagedStudies` counterpart whose studies are `LazyStudy` views
+
+    Attributes:
+        studies (list[LazyStudy]):
+        next_page_token (Union[Unset, str]):
+        total_count (Union[Unset, int]):
+    """
+
+    __slots__ = ("studies", "next_page_token", "total_count")
+
+    def __init__(
+        self,
+        studies: list[LazyStudy],
+        next_page_token: Union[Unset, str] = UNSET,
+        total_count: Union[Unset, int] = UNSET,
+    ):
+        self.studies = studies
+        self.next_page_token = next_page_token
+        self.total_count = total_count
+
+    @classmethod
+    def from_dict(cls: type[P], src_dict: dict[str, Any]) -> P:
+        return cls(
+            studies=[LazyStudy(study) for study in src_dict.get("studies", [])],
+            next_page_token=src_dict.get("nextPageToken", UNSET),
+            total_count=src_dict.get("totalCount", UNSET),
+        )
+
+    @classmethod
+    def from_json(cls: type[P], content: Union[bytes, str]) -> P:
+        return cls.from_dict(loads(content))
+
+
+__all__ = ["LazyPagedStudies", "LazyStudy", "loads"]
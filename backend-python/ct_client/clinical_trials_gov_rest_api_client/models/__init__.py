@@ -1,161 +1,343 @@
-"""Contains all the data models used in inputs/outputs"""
+"""Contains all the data models used in inputs/outputs
+
+Model modules are imported on first attribute access rather than all at once, so importing one endpoint module
+(or the package itself) does not load every generated model.
+"""
+
+from importlib import import_module
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from .adverse_event import AdverseEvent
+    from .adverse_events_module import AdverseEventsModule
+    from .agency_class import AgencyClass
+    from .agreement_restriction_type import AgreementRestrictionType
+    from .analysis_dispersion_type import AnalysisDispersionType
+    from .annotation_module import AnnotationModule
+    from .annotation_section import AnnotationSection
+    from .arm_group import ArmGroup
+    from .arm_group_type import ArmGroupType
+    from .arms_interventions_module import ArmsInterventionsModule
+    from .avail_ipd import AvailIpd
+    from .baseline_characteristics_module import BaselineCharacteristicsModule
+    from .baseline_measure import BaselineMeasure
+    from .bio_spec import BioSpec
+    from .bio_spec_retention import BioSpecRetention
+    from .bmi_limits import BmiLimits
+    from .boolean_stats import BooleanStats
+    from .browse_branch import BrowseBranch
+    from .browse_leaf import BrowseLeaf
+    from .browse_leaf_relevance import BrowseLeafRelevance
+    from .browse_module import BrowseModule
+    from .certain_agreement import CertainAgreement
+    from .conditions_module import ConditionsModule
+    from .confidence_interval_num_sides import ConfidenceIntervalNumSides
+    from .contact import Contact
+    from .contact_role import ContactRole
+    from .contacts_locations_module import ContactsLocationsModule
+    from .date_stats import DateStats
+    from .date_struct import DateStruct
+    from .date_type import DateType
+    from .denom import Denom
+    from .denom_count import DenomCount
+    from .derived_section import DerivedSection
+    from .description_module import DescriptionModule
+    from .design_allocation import DesignAllocation
+    from .design_info import DesignInfo
+    from .design_masking import DesignMasking
+    from .design_module import DesignModule
+    from .design_time_perspective import DesignTimePerspective
+    from .dist_item import DistItem
+    from .document_section import DocumentSection
+    from .drop_withdraw import DropWithdraw
+    from .eligibility_module import EligibilityModule
+    from .enrollment_info import EnrollmentInfo
+    from .enrollment_type import EnrollmentType
+    from .enum_info import EnumInfo
+    from .enum_item import EnumItem
+    from .enum_item_exceptions import EnumItemExceptions
+    from .enum_stats import EnumStats
+    from .event_assessment import EventAssessment
+    from .event_group import EventGroup
+    from .event_stats import EventStats
+    from .expanded_access_info import ExpandedAccessInfo
+    from .expanded_access_status import ExpandedAccessStatus
+    from .expanded_access_types import ExpandedAccessTypes
+    from .fetch_study_format import FetchStudyFormat
+    from .fetch_study_markup_format import FetchStudyMarkupFormat
+    from .field_node import FieldNode
+    from .field_stats_type import FieldStatsType
+    from .first_mcp_info import FirstMcpInfo
+    from .flow_group import FlowGroup
+    from .flow_milestone import FlowMilestone
+    from .flow_period import FlowPeriod
+    from .flow_stats import FlowStats
+    from .geo_point import GeoPoint
+    from .gzip_stats import GzipStats
+    from .gzip_stats_percentiles import GzipStatsPercentiles
+    from .identification_module import IdentificationModule
+    from .integer_stats import IntegerStats
+    from .intervention import Intervention
+    from .intervention_type import InterventionType
+    from .interventional_assignment import InterventionalAssignment
+    from .ipd_sharing import IpdSharing
+    from .ipd_sharing_info_type import IpdSharingInfoType
+    from .ipd_sharing_statement_module import IpdSharingStatementModule
+    from .large_doc import LargeDoc
+    from .large_document_module import LargeDocumentModule
+    from .limitations_and_caveats import LimitationsAndCaveats
+    from .list_size import ListSize
+    from .list_sizes import ListSizes
+    from .list_studies_format import ListStudiesFormat
+    from .list_studies_markup_format import ListStudiesMarkupFormat
+    from .location import Location
+    from .longest_string import LongestString
+    from .masking_block import MaskingBlock
+    from .measure_analysis import MeasureAnalysis
+    from .measure_category import MeasureCategory
+    from .measure_class import MeasureClass
+    from .measure_dispersion_type import MeasureDispersionType
+    from .measure_group import MeasureGroup
+    from .measure_param import MeasureParam
+    from .measurement import Measurement
+    from .mesh import Mesh
+    from .misc_info_module import MiscInfoModule
+    from .model_predictions import ModelPredictions
+    from .more_info_module import MoreInfoModule
+    from .non_inferiority_type import NonInferiorityType
+    from .number_stats import NumberStats
+    from .observational_model import ObservationalModel
+    from .official import Official
+    from .official_role import OfficialRole
+    from .org_study_id_info import OrgStudyIdInfo
+    from .org_study_id_type import OrgStudyIdType
+    from .organization import Organization
+    from .outcome import Outcome
+    from .outcome_measure import OutcomeMeasure
+    from .outcome_measure_type import OutcomeMeasureType
+    from .outcome_measures_module import OutcomeMeasuresModule
+    from .outcomes_module import OutcomesModule
+    from .oversight_module import OversightModule
+    from .paged_studies import PagedStudies
+    from .partial_date_struct import PartialDateStruct
+    from .participant_flow_module import ParticipantFlowModule
+    from .phase import Phase
+    from .point_of_contact import PointOfContact
+    from .primary_purpose import PrimaryPurpose
+    from .protocol_section import ProtocolSection
+    from .recruitment_status import RecruitmentStatus
+    from .reference import Reference
+    from .reference_type import ReferenceType
+    from .references_module import ReferencesModule
+    from .reporting_status import ReportingStatus
+    from .responsible_party import ResponsibleParty
+    from .responsible_party_type import ResponsiblePartyType
+    from .results_section import ResultsSection
+    from .retraction import Retraction
+    from .sampling_method import SamplingMethod
+    from .search_area import SearchArea
+    from .search_document import SearchDocument
+    from .search_part import SearchPart
+    from .secondary_id_info import SecondaryIdInfo
+    from .secondary_id_type import SecondaryIdType
+    from .see_also_link import SeeAlsoLink
+    from .sex import Sex
+    from .sponsor import Sponsor
+    from .sponsor_collaborators_module import SponsorCollaboratorsModule
+    from .standard_age import StandardAge
+    from .status import Status
+    from .status_module import StatusModule
+    from .string_stats import StringStats
+    from .study import Study
+    from .study_fhir import StudyFhir
+    from .study_size import StudySize
+    from .study_type import StudyType
+    from .submission_info import SubmissionInfo
+    from .submission_tracking import SubmissionTracking
+    from .unposted_annotation import UnpostedAnnotation
+    from .unposted_event import UnpostedEvent
+    from .unposted_event_type import UnpostedEventType
+    from .value_count import ValueCount
+    from .version import Version
+    from .violation_annotation import ViolationAnnotation
+    from .violation_event import ViolationEvent
+    from .violation_event_type import ViolationEventType
+    from .web_link import WebLink
+    from .who_masked import WhoMasked
+
+# Exported name -> defining module
+_MODULES = {
+    "AdverseEvent": "adverse_event",
+    "AdverseEventsModule": "adverse_events_module",
+    "AgencyClass": "agency_class",
+    "AgreementRestrictionType": "agreement_restriction_type",
+    "AnalysisDispersionType": "analysis_dispersion_type",
+    "AnnotationModule": "annotation_module",
+    "AnnotationSection": "annotation_section",
+    "ArmGroup": "arm_group",
+    "ArmGroupType": "arm_group_type",
+    "ArmsInterventionsModule": "arms_interventions_module",
+    "AvailIpd": "avail_ipd",
+    "BaselineCharacteristicsModule": "baseline_characteristics_module",
+    "BaselineMeasure": "baseline_measure",
+    "BioSpec": "bio_spec",
+    "BioSpecRetention": "bio_spec_retention",
+    "BmiLimits": "bmi_limits",
+    "BooleanStats": "boolean_stats",
+    "BrowseBranch": "browse_branch",
+    "BrowseLeaf": "browse_leaf",
+    "BrowseLeafRelevance": "browse_leaf_relevance",
+    "BrowseModule": "browse_module",
+    "CertainAgreement": "certain_agreement",
+    "ConditionsModule": "conditions_module",
+    "ConfidenceIntervalNumSides": "confidence_interval_num_sides",
+    "Contact": "contact",
+    "ContactRole": "contact_role",
+    "ContactsLocationsModule": "contacts_locations_module",
+    "DateStats": "date_stats",
+    "DateStruct": "date_struct",
+    "DateType": "date_type",
+    "Denom": "denom",
+    "DenomCount": "denom_count",
+    "DerivedSection": "derived_section",
+    "DescriptionModule": "description_module",
+    "DesignAllocation": "design_allocation",
+    "DesignInfo": "design_info",
+    "DesignMasking": "design_masking",
+    "DesignModule": "design_module",
+    "DesignTimePerspective": "design_time_perspective",
+    "DistItem": "dist_item",
+    "DocumentSection": "document_section",
+    "DropWithdraw": "drop_withdraw",
+    "EligibilityModule": "eligibility_module",
+    "EnrollmentInfo": "enrollment_info",
+    "EnrollmentType": "enrollment_type",
+    "EnumInfo": "enum_info",
+    "EnumItem": "enum_item",
+    "EnumItemExceptions": "enum_item_exceptions",
+    "EnumStats": "enum_stats",
+    "EventAssessment": "event_assessment",
+    "EventGroup": "event_group",
+    "EventStats": "event_stats",
+    "ExpandedAccessInfo": "expanded_access_info",
+    "ExpandedAccessStatus": "expanded_access_status",
+    "ExpandedAccessTypes": "expanded_access_types",
+    "FetchStudyFormat": "fetch_study_format",
+    "FetchStudyMarkupFormat": "fetch_study_markup_format",
+    "FieldNode": "field_node",
+    "FieldStatsType": "field_stats_type",
+    "FirstMcpInfo": "first_mcp_info",
+    "FlowGroup": "flow_group",
+    "FlowMilestone": "flow_milestone",
+    "FlowPeriod": "flow_period",
+    "FlowStats": "flow_stats",
+    "GeoPoint": "geo_point",
+    "GzipStats": "gzip_stats",
+    "GzipStatsPercentiles": "gzip_stats_percentiles",
+    "IdentificationModule": "identification_module",
+    "IntegerStats": "integer_stats",
+    "Intervention": "intervention",
+    "InterventionType": "intervention_type",
+    "InterventionalAssignment": "interventional_assignment",
+    "IpdSharing": "ipd_sharing",
+    "IpdSharingInfoType": "ipd_sharing_info_type",
+    "IpdSharingStatementModule": "ipd_sharing_statement_module",
+    "LargeDoc": "large_doc",
+    "LargeDocumentModule": "large_document_module",
+    "LimitationsAndCaveats": "limitations_and_caveats",
+    "ListSize": "list_size",
+    "ListSizes": "list_sizes",
+    "ListStudiesFormat": "list_studies_format",
+    "ListStudiesMarkupFormat": "list_studies_markup_format",
+    "Location": "location",
+    "LongestString": "longest_string",
+    "MaskingBlock": "masking_block",
+    "MeasureAnalysis": "measure_analysis",
+    "MeasureCategory": "measure_category",
+    "MeasureClass": "measure_class",
+    "MeasureDispersionType": "measure_dispersion_type",
+    "MeasureGroup": "measure_group",
+    "MeasureParam": "measure_param",
+    "Measurement": "measurement",
+    "Mesh": "mesh",
+    "MiscInfoModule": "misc_info_module",
+    "ModelPredictions": "model_predictions",
+    "MoreInfoModule": "more_info_module",
+    "NonInferiorityType": "non_inferiority_type",
+    "NumberStats": "number_stats",
+    "ObservationalModel": "observational_model",
+    "Official": "official",
+    "OfficialRole": "official_role",
+    "OrgStudyIdInfo": "org_study_id_info",
+    "OrgStudyIdType": "org_study_id_type",
+    "Organization": "organization",
+    "Outcome": "outcome",
+    "OutcomeMeasure": "outcome_measure",
+    "OutcomeMeasureType": "outcome_measure_type",
+    "OutcomeMeasuresModule": "outcome_measures_module",
+    "OutcomesModule": "outcomes_module",
+    "OversightModule": "oversight_module",
+    "PagedStudies": "paged_studies",
+    "PartialDateStruct": "partial_date_struct",
+    "ParticipantFlowModule": "participant_flow_module",
+    "Phase": "phase",
+    "PointOfContact": "point_of_contact",
+    "PrimaryPurpose": "primary_purpose",
+    "ProtocolSection": "protocol_section",
+    "RecruitmentStatus": "recruitment_status",
+    "Reference": "reference",
+    "ReferenceType": "reference_type",
+    "ReferencesModule": "references_module",
+    "ReportingStatus": "reporting_status",
+    "ResponsibleParty": "responsible_party",
+    "ResponsiblePartyType": "responsible_party_type",
+    "ResultsSection": "results_section",
+    "Retraction": "retraction",
+    "SamplingMethod": "sampling_method",
+    "SearchArea": "search_area",
+    "SearchDocument": "search_document",
+    "SearchPart": "search_part",
+    "SecondaryIdInfo": "secondary_id_info",
+    "SecondaryIdType": "secondary_id_type",
+    "SeeAlsoLink": "see_also_link",
+    "Sex": "sex",
+    "Sponsor": "sponsor",
+    "SponsorCollaboratorsModule": "sponsor_collaborators_module",
+    "StandardAge": "standard_age",
+    "Status": "status",
+    "StatusModule": "status_module",
+    "StringStats": "string_stats",
+    "Study": "study",
+    "StudyFhir": "study_fhir",
+    "StudySize": "study_size",
+    "StudyType": "study_type",
+    "SubmissionInfo": "submission_info",
+    "SubmissionTracking": "submission_tracking",
+    "UnpostedAnnotation": "unposted_annotation",
+    "UnpostedEvent": "unposted_event",
+    "UnpostedEventType": "unposted_event_type",
+    "ValueCount": "value_count",
+    "Version": "version",
+    "ViolationAnnotation": "violation_annotation",
+    "ViolationEvent": "violation_event",
+    "ViolationEventType": "violation_event_type",
+    "WebLink": "web_link",
+    "WhoMasked": "who_masked",
+}
+
+
+def __getattr__(name: str) -> Any:
+    module = _MODULES.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(f".{module}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(_MODULES))
 
-from .adverse_event import AdverseEvent
-from .adverse_events_module import AdverseEventsModule
-from .agency_class import AgencyClass
-from .agreement_restriction_type import AgreementRestrictionType
-from .analysis_dispersion_type import AnalysisDispersionType
-from .annotation_module import AnnotationModule
-from .annotation_section import AnnotationSection
-from .arm_group import ArmGroup
-from .arm_group_type import ArmGroupType
-from .arms_interventions_module import ArmsInterventionsModule
-from .avail_ipd import AvailIpd
-from .baseline_characteristics_module import BaselineCharacteristicsModule
-from .baseline_measure import BaselineMeasure
-from .bio_spec import BioSpec
-from .bio_spec_retention import BioSpecRetention
-from .bmi_limits import BmiLimits
-from .boolean_stats import BooleanStats
-from .browse_branch import BrowseBranch
-from .browse_leaf import BrowseLeaf
-from .browse_leaf_relevance import BrowseLeafRelevance
-from .browse_module import BrowseModule
-from .certain_agreement import CertainAgreement
-from .conditions_module import ConditionsModule
-from .confidence_interval_num_sides import ConfidenceIntervalNumSides
-from .contact import Contact
-from .contact_role import ContactRole
-from .contacts_locations_module import ContactsLocationsModule
-from .date_stats import DateStats
-from .date_struct import DateStruct
-from .date_type import DateType
-from .denom import Denom
-from .denom_count import DenomCount
-from .derived_section import DerivedSection
-from .description_module import DescriptionModule
-from .design_allocation import DesignAllocation
-from .design_info import DesignInfo
-from .design_masking import DesignMasking
-from .design_module import DesignModule
-from .design_time_perspective import DesignTimePerspective
-from .dist_item import DistItem
-from .document_section import DocumentSection
-from .drop_withdraw import DropWithdraw
-from .eligibility_module import EligibilityModule
-from .enrollment_info import EnrollmentInfo
-from .enrollment_type import EnrollmentType
-from .enum_info import EnumInfo
-from .enum_item import EnumItem
-from .enum_item_exceptions import EnumItemExceptions
-from .enum_stats import EnumStats
-from .event_assessment import EventAssessment
-from .event_group import EventGroup
-from .event_stats import EventStats
-from .expanded_access_info import ExpandedAccessInfo
-from .expanded_access_status import ExpandedAccessStatus
-from .expanded_access_types import ExpandedAccessTypes
-from .fetch_study_format import FetchStudyFormat
-from .fetch_study_markup_format import FetchStudyMarkupFormat
-from .field_node import FieldNode
-from .field_stats_type import FieldStatsType
-from .first_mcp_info import FirstMcpInfo
-from .flow_group import FlowGroup
-from .flow_milestone import FlowMilestone
-from .flow_period import FlowPeriod
-from .flow_stats import FlowStats
-from .geo_point import GeoPoint
-from .gzip_stats import GzipStats
-from .gzip_stats_percentiles import GzipStatsPercentiles
-from .identification_module import IdentificationModule
-from .integer_stats import IntegerStats
-from .intervention import Intervention
-from .intervention_type import InterventionType
-from .interventional_assignment import InterventionalAssignment
-from .ipd_sharing import IpdSharing
-from .ipd_sharing_info_type import IpdSharingInfoType
-from .ipd_sharing_statement_module import IpdSharingStatementModule
-from .large_doc import LargeDoc
-from .large_document_module import LargeDocumentModule
-from .limitations_and_caveats import LimitationsAndCaveats
-from .list_size import ListSize
-from .list_sizes import ListSizes
-from .list_studies_format import ListStudiesFormat
-from .list_studies_markup_format import ListStudiesMarkupFormat
-from .location import Location
-from .longest_string import LongestString
-from .masking_block import MaskingBlock
-from .measure_analysis import MeasureAnalysis
-from .measure_category import MeasureCategory
-from .measure_class import MeasureClass
-from .measure_dispersion_type import MeasureDispersionType
-from .measure_group import MeasureGroup
-from .measure_param import MeasureParam
-from .measurement import Measurement
-from .mesh import Mesh
-from .misc_info_module import MiscInfoModule
-from .model_predictions import ModelPredictions
-from .more_info_module import MoreInfoModule
-from .non_inferiority_type import NonInferiorityType
-from .number_stats import NumberStats
-from .observational_model import ObservationalModel
-from .official import Official
-from .official_role import OfficialRole
-from .org_study_id_info import OrgStudyIdInfo
-from .org_study_id_type import OrgStudyIdType
-from .organization import Organization
-from .outcome import Outcome
-from .outcome_measure import OutcomeMeasure
-from .outcome_measure_type import OutcomeMeasureType
-from .outcome_measures_module import OutcomeMeasuresModule
-from .outcomes_module import OutcomesModule
-from .oversight_module import OversightModule
-from .paged_studies import PagedStudies
-from .partial_date_struct import PartialDateStruct
-from .participant_flow_module import ParticipantFlowModule
-from .phase import Phase
-from .point_of_contact import PointOfContact
-from .primary_purpose import PrimaryPurpose
-from .protocol_section import ProtocolSection
-from .recruitment_status import RecruitmentStatus
-from .reference import Reference
-from .reference_type import ReferenceType
-from .references_module import ReferencesModule
-from .reporting_status import ReportingStatus
-from .responsible_party import ResponsibleParty
-from .responsible_party_type import ResponsiblePartyType
-from .results_section import ResultsSection
-from .retraction import Retraction
-from .sampling_method import SamplingMethod
-from .search_area import SearchArea
-from .search_document import SearchDocument
-from .search_part import SearchPart
-from .secondary_id_info import SecondaryIdInfo
-from .secondary_id_type import SecondaryIdType
-from .see_also_link import SeeAlsoLink
-from .sex import Sex
-from .sponsor import Sponsor
-from .sponsor_collaborators_module import SponsorCollaboratorsModule
-from .standard_age import StandardAge
-from .status import Status
-from .status_module import StatusModule
-from .string_stats import StringStats
-from .study import Study
-from .study_fhir import StudyFhir
-from .study_size import StudySize
-from .study_type import StudyType
-from .submission_info import SubmissionInfo
-from .submission_tracking import SubmissionTracking
-from .unposted_annotation import UnpostedAnnotation
-from .unposted_event import UnpostedEvent
-from .unposted_event_type import UnpostedEventType
-from .value_count import ValueCount
-from .version import Version
-from .violation_annotation import ViolationAnnotation
-from .violation_event import ViolationEvent
-from .violation_event_type import ViolationEventType
-from .web_link import WebLink
-from .who_masked import WhoMasked
 
 __all__ = (
     "AdverseEvent",
@@ -0,0 +1,111 @@
+"""Helpers for walking paged endpoints by following `nextPageToken`"""
+
+import asyncio
+from collections.abc import AsyncIterator
+from typing import Any, Optional, Union
+
+from . import errors
+from .api.studies import list_studies
+from .client import AuthenticatedClient, Client
+from .lazy import LazyPagedStudies, LazyStudy
+from .models.paged_studies import PagedStudies
+from .models.study import Study
+from .types import UNSET, Unset
+
+MAX_PAGE_SIZE = 1000
+
+
+async def _fetch_page(
+    *,
+    client: Union[AuthenticatedClient, Client],
+    page_token: Union[Unset, str],
+    lazy: bool = False,
+    **kwargs: Any,
+) -> Union[PagedStudies, LazyPagedStudies]:
+    if lazy:
+        # Skip list_studies' eager PagedStudies.from_dict and only decode the JSON
+        request = list_studies._get_kwargs(page_token=page_token, **kwargs)
+        response = await client.get_async_httpx_client().request(**request)
+        if response.status_code != 200:
+            raise errors.UnexpectedStatus(response.status_code, response.content)
+        return LazyPagedStudies.from_json(response.content)
+
+    response = await list_studies.asyncio_detailed(client=client, page_token=page_token, **kwargs)
+    if not isinstance(response.parsed, PagedStudies):
+        raise errors.UnexpectedStatus(response.status_code, response.content)
+    return response.parsed
+
+
+async def iter_pages(
+    *,
+    client: Union[AuthenticatedClient, Client],
+    page_size: int = MAX_PAGE_SIZE,
+    prefetch: bool = True,
+    lazy: bool = False,
+    **kwargs: Any,
+) -> AsyncIterator[Union[PagedStudies, LazyPagedStudies]]:
+    """Yield every page of a `list_studies` query, following `nextPageToken` until the last page.
+
+    With ``prefetch`` enabled the request for page N+1 is already in flight while the caller consumes
+    page N, so at most two pages are held in memory at any time.
+
+    Args:
+        client: The client used for every page request.
+        page_size: Studies per page, capped at ``MAX_PAGE_SIZE``.
+        prefetch: Whether to request the next page before the current one has been consumed.
+        lazy: Yield `LazyPagedStudies` whose studies only build their attrs models when a section is read.
+        **kwargs: Any other `list_studies` query parameter (``query_spons``, ``fields``, ...).
+            They are sent unchanged with every page, as the API requires.
+
+    Raises:
+        errors.UnexpectedStatus: If a page request does not return a `PagedStudies` payload.
+        httpx.TimeoutException: If a page request takes longer than Client.timeout.
+    """
+    page_size = min(page_size, MAX_PAGE_SIZE)
+
+    def schedule(page_token: Union[Unset, str]) -> "asyncio.Future[Union[PagedStudies, LazyPagedStudies]]":
+        return asyncio.ensure_future(
+            _fetch_page(client=client, page_token=page_token, lazy=lazy, page_size=page_size, **kwargs)
+        )
+
+    next_page: Optional[asyncio.Future[Union[PagedStudies, LazyPagedStudies]]] = schedule(UNSET)
+    try:
+        while next_page is not None:
+            page = await next_page
+            next_page = None
+            page_token = page.next_page_token
+            if page_token and prefetch:
+                next_page = schedule(page_token)
+
+            yield page
+
+            if page_token and next_page is None:
+                next_page = schedule(page_token)
+    finally:
+        if next_page is not None:
+            if next_page.done():
+                if not next_page.cancelled():
+                    # Retrieve a failed prefetch so abandoning iteration does not log it as never retrieved
+                    next_page.exception()
+            else:
+                next_page.cancel()
+
+
+async def iter_studies(
+    *,
+    client: Union[AuthenticatedClient, Client],
+    page_size: int = MAX_PAGE_SIZE,
+    prefetch: bool = True,
+    lazy: bool = False,
+    **kwargs: Any,
+) -> AsyncIterator[Union[Study, LazyStudy]]:
+    """Yield every study matching a `list_studies` query, one at a time, as each page is parsed.
+
+    Accepts the same arguments as `iter_pages`.
+    """
+    async for page in iter_pages(client=client, page_size=page_size, prefetch=prefetch, lazy=lazy, **kwargs):
+        for study in page.studies:
+            yield study
+
+
+__all__ = ["MAX_PAGE_SIZE", "iter_pages", "iter_studies"]
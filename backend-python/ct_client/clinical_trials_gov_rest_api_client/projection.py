@@ -0,0 +1,115 @@
+"""Derive the minimal `fields` parameter for `list_studies`/`fetch_study` from the attributes a consumer reads
+
+Consumers declare the JSON paths they touch (``protocolSection.designModule.phases``) as a `Projection`. The
+projection drops paths already covered by a requested ancestor and, given a `FieldIndex` built from the
+`/studies/metadata` `FieldNode` tree, validates them and sends the shorter piece names (``Phase``) instead.
+Projected responses still parse into the usual models; anything outside the projection is simply `UNSET`.
+"""
+
+from collections.abc import Iterable
+from typing import Optional, Union
+
+from . import errors
+from .api.studies import studies_metadata
+from .client import AuthenticatedClient, Client
+from .models.field_node import FieldNode
+
+# Always requested so projected studies can still be matched back to their trial
+NCT_ID_PATH = "protocolSection.identificationModule.nctId"
+
+
+class FieldIndex:
+    """Lookup between JSON field paths and CT.gov piece names, built from the `studies_metadata` tree"""
+
+    def __init__(self, nodes: Iterable[FieldNode]):
+        self.pieces: dict[str, str] = {}
+        self.paths: dict[str, str] = {}
+        self._walk(nodes, "")
+
+    def _walk(self, nodes: Iterable[FieldNode], parent: str) -> None:
+        for node in nodes:
+            path = f"{parent}.{node.name}" if parent else node.name
+            self.pieces[path] = node.piece
+            self.paths.setdefault(node.piece, path)
+            if node.children:
+                self._walk(node.children, path)
+
+    def resolve(self, name: str) -> str:
+        """JSON path for a path or piece name
+
+        Raises:
+            KeyError: If ``name`` is neither a known field path nor a piece name.
+        """
+        if name in self.pieces:
+            return name
+        if name in self.paths:
+            return self.paths[name]
+        raise KeyError(f"Unknown ClinicalTrials.gov field: {name}")
+
+    def piece(self, path: str) -> str:
+        return self.pieces[self.resolve(path)]
+
+
+class Projection:
+    """Set of study fields a consumer needs
+
+    Args:
+        *paths: JSON paths (``protocolSection.statusModule.overallStatus``) or, when resolved against a
+            `FieldIndex`, piece names (``OverallStatus``).
+        include_nct_id: Also request the NCT ID, so results can be keyed by trial.
+    """
+
+    def __init__(self, *paths: str, include_nct_id: bool = True):
+        self.paths = frozenset(paths) | ({NCT_ID_PATH} if include_nct_id else frozenset())
+
+    def __or__(self, other: "Projection") -> "Projection":
+        return Projection(*(self.paths | other.paths), include_nct_id=False)
+
+    def __repr__(self) -> str:
+        return f"Projection({', '.join(sorted(self.paths))})"
+
+    def minimal_paths(self, index: Optional[FieldIndex] = None) -> list[str]:
+        """Requested paths without those already included through a requested branch"""
+        paths = sorted({index.resolve(path) for path in self.paths} if index else self.paths)
+        minimal: list[str] = []
+        for path in paths:
+            # Sorted order puts every branch before its descendants
+            if not any(path.startswith(f"{branch}.") for branch in minimal):
+                minimal.append(path)
+        return minimal
+
+    def fields(self, index: Optional[FieldIndex] = None) -> list[str]:
+        """Names for the `fields` parameter: piece names with an index, JSON paths without one"""
+        paths = self.minimal_paths(index)
+        return [index.piece(path) for path in paths] if index else paths
+
+    def param(self, index: Optional[FieldIndex] = None) -> list[str]:
+        """`fields` argument for the generated API functions
+
+        The parameter is pipeDelimited with ``explode: false``, so the names are sent as one joined value rather
+        than as repeated query keys.
+        """
+        return ["|".join(self.fields(index))]
+
+
+def _index_from_response(response) -> FieldIndex:
+    if not isinstance(response.parsed, list):
+        raise errors.UnexpectedStatus(response.status_code, response.content)
+    return FieldIndex(response.parsed)
+
+
+async def load_field_index(client: Union[AuthenticatedClient, Client]) -> FieldIndex:
+    """Build a `FieldIndex` from `/studies/metadata`
+
+    Raises:
+        errors.UnexpectedStatus: If the metadata request does not return the field tree.
+    """
+    return _index_from_response(await studies_metadata.asyncio_detailed(client=client))
+
+
+def load_field_index_sync(client: Union[AuthenticatedClient, Client]) -> FieldIndex:
+    """Blocking version of `load_field_index`"""
+    return _index_from_response(studies_metadata.sync_detailed(client=client))
+
+
+__all__ = ["FieldIndex", "Projection", "load_field_index", "load_field_index_sync"]
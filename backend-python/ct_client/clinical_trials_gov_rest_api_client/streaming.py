@@ -0,0 +1,223 @@
+"""Decode `list_studies` responses incrementally instead of buffering the whole page
+
+`list_studies` parses a page with ``response.json()``/``response.text``, so a 1000-study page is held in memory
+several times over (raw bytes, decoded text, the dict tree and the models). `StudyStream` reads the body with
+``aiter_bytes`` and yields each study as soon as its bytes are complete: decoded study dicts for JSON, column dicts
+for CSV.
+"""
+
+import codecs
+import csv
+import re
+from collections.abc import AsyncIterator
+from typing import Any, Union
+
+from . import errors
+from .api.studies import list_studies
+from .client import AuthenticatedClient, Client
+from .lazy import LazyStudy, loads
+from .models.list_studies_format import ListStudiesFormat
+from .types import UNSET, Unset
+
+# For CSV the page token is only sent as a header, the body being nothing but rows
+NEXT_PAGE_TOKEN_HEADER = "x-next-page-token"
+TOTAL_COUNT_HEADER = "x-total-count"
+
+_STUDIES_ARRAY = re.compile(rb'"studies"\s*:\s*\[')
+_TOKENS = re.compile(rb'[\\"{}\[\]]')
+_PREFIX, _ARRAY, _SUFFIX = range(3)
+
+
+class StudyArrayScanner:
+    """Incremental splitter for the `studies` array of a `PagedStudies` JSON document
+
+    `feed` returns the raw bytes of every study object completed by the chunk; everything outside the array is
+    kept so `finish` can decode the page-level fields (``nextPageToken``, ``totalCount``).
+    """
+
+    def __init__(self):
+        self._state = _PREFIX
+        self._page = bytearray()
+        self._object = bytearray()
+        self._depth = 0
+        self._in_string = False
+        self._escaped = False
+
+    def feed(self, data: bytes) -> list[bytes]:
+        if self._state == _PREFIX:
+            self._page += data
+            match = _STUDIES_ARRAY.search(self._page)
+            if match is None:
+                return []
+            data = bytes(self._page[match.end():])
+            del self._page[match.end():]
+            self._state = _ARRAY
+        if self._state == _SUFFIX:
+            self._page += data
+            return []
+
+        studies = []
+        start = 0
+        # An escape split across chunks makes the first byte of this chunk literal
+        skip_until = 1 if self._escaped else 0
+        self._escaped = False
+        for match in _TOKENS.finditer(data):
+            pos = match.start()
+            if pos < skip_until:
+                continue
+            char = data[pos:pos + 1]
+            if self._in_string:
+                if char == b"\\":
+                    skip_until = pos + 2
+                    self._escaped = pos + 1 == len(data)
+                elif char == b'"':
+                    self._in_string = False
+            elif char == b'"':
+                self._in_string = True
+            elif char in b"{[":
+                if self._depth == 0:
+                    start = pos
+                self._depth += 1
+            elif self._depth == 0:
+                # The `]` closing the studies array
+                self._page += data[pos:]
+                self._state = _SUFFIX
+                return studies
+            else:
+                self._depth -= 1
+                if self._depth == 0:
+                    self._object += data[start:pos + 1]
+                    studies.append(bytes(self._object))
+                    self._object.clear()
+
+        if self._depth:
+            self._object += data[start:]
+        return studies
+
+    def finish(self) -> dict[str, Any]:
+        """Page-level fields of the document, with an empty `studies` list
+
+        Raises:
+            ValueError: If the body ended before the studies array was closed.
+        """
+        if self._state == _ARRAY:
+            raise ValueError("JSON body ended inside the studies array")
+        return loads(bytes(self._page)) if self._page.strip() else {}
+
+
+class CSVRowScanner:
+    """Incremental CSV decoder yielding one dict per row, keyed by the header row"""
+
+    def __init__(self, encoding: str = "utf-8"):
+        self._decoder = codecs.getincrementaldecoder(encoding)()
+        self._text = ""
+        self._record = ""
+        self._header: Union[list[str], None] = None
+
+    def _rows(self, lines: list[str]) -> list[dict[str, str]]:
+        rows = []
+        for line in lines:
+            self._record += line
+            # A record is complete once its quotes balance; RFC 4180 doubles quotes inside quoted fields
+            if self._record.count('"') % 2:
+                continue
+            record, self._record = self._record, ""
+            if not record.strip():
+                continue
+            values = next(csv.reader([record]))
+            if self._header is None:
+                self._header = [values[0].lstrip("\ufeff"), *values[1:]]
+            else:
+                rows.append(dict(zip(self._header, values)))
+        return rows
+
+    def feed(self, data: bytes) -> list[dict[str, str]]:
+        # Split on newlines only; str.splitlines would also break on characters allowed inside fields
+        *lines, self._text = (self._text + self._decoder.decode(data)).split("\n")
+        return self._rows([f"{line}\n" for line in lines])
+
+    def finish(self) -> list[dict[str, str]]:
+        self._text += self._decoder.decode(b"", final=True)
+        lines, self._text = [self._text], ""
+        rows = self._rows(lines)
+        if self._record.strip():
+            raise ValueError("CSV body ended inside a quoted field")
+        return rows
+
+
+class StudyStream:
+    """One `list_studies` page decoded while it downloads
+
+    Iterate it asynchronously to get the studies; ``next_page_token`` and ``total_count`` are set once the page
+    has been read to the end.
+
+    Args:
+        client: The client used for the request.
+        format_: ``JSON`` yields decoded study dicts, or `LazyStudy` views with ``lazy``. ``CSV`` yields one
+            dict per row, keyed by column name.
+        lazy: Wrap JSON studies in `LazyStudy`.
+        **kwargs: Any other `list_studies` query parameter.
+    """
+
+    def __init__(
+        self,
+        *,
+        client: Union[AuthenticatedClient, Client],
+        format_: ListStudiesFormat = ListStudiesFormat.JSON,
+        lazy: bool = False,
+        **kwargs: Any,
+    ):
+        self.client = client
+        self.format_ = format_
+        self.lazy = lazy
+        self.kwargs = kwargs
+        self.next_page_token: Union[Unset, str] = UNSET
+        self.total_count: Union[Unset, int] = UNSET
+
+    def __aiter__(self) -> AsyncIterator[Any]:
+        return self._records()
+
+    async def _records(self) -> AsyncIterator[Any]:
+        request = list_studies._get_kwargs(format_=self.format_, **self.kwargs)
+        async with self.client.get_async_httpx_client().stream(**request) as response:
+            if response.status_code != 200:
+                raise errors.UnexpectedStatus(response.status_code, await response.aread())
+
+            if self.format_ == ListStudiesFormat.CSV:
+                scanner = CSVRowScanner(response.encoding or "utf-8")
+                async for chunk in response.aiter_bytes():
+                    for row in scanner.feed(chunk):
+                        yield row
+                for row in scanner.finish():
+                    yield row
+                self.next_page_token = response.headers.get(NEXT_PAGE_TOKEN_HEADER, UNSET)
+                if TOTAL_COUNT_HEADER in response.headers:
+                    self.total_count = int(response.headers[TOTAL_COUNT_HEADER])
+                return
+
+            scanner = StudyArrayScanner()
+            async for chunk in response.aiter_bytes():
+                for study in scanner.feed(chunk):
+                    yield LazyStudy.from_json(study) if self.lazy else loads(study)
+            page = scanner.finish()
+            self.next_page_token = page.get("nextPageToken", UNSET)
+            self.total_count = page.get("totalCount", UNSET)
+
+
+def stream_studies(
+    *,
+    client: Union[AuthenticatedClient, Client],
+    format_: ListStudiesFormat = ListStudiesFormat.JSON,
+    lazy: bool = False,
+    **kwargs: Any,
+) -> StudyStream:
+    """Stream one `list_studies` page; see `StudyStream`
+
+    Raises:
+        errors.UnexpectedStatus: If the request does not return 200 (raised on iteration).
+        httpx.TimeoutException: If the request takes longer than Client.timeout.
+    """
+    return StudyStream(client=client, format_=format_, lazy=lazy, **kwargs)
+
+
+__all__ = ["CSVRowScanner", "StudyArrayScanner", "StudyStream", "stream_studies"]
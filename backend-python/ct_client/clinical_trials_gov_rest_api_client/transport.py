@@ -0,0 +1,222 @@
+"""httpx transports that pace requests with a token bucket and retry transient failures
+
+Wrap the real transport and hand the result to ``httpx.Client``/``httpx.AsyncClient``, then install those on a
+`Client` with ``set_httpx_client``/``set_async_httpx_client``.
+"""
+
+import asyncio
+import email.utils
+import random
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Optional
+
+import httpx
+from attrs import define
+
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+
+class TokenBucket:
+    """In-process token bucket shared by every coroutine and thread that uses it.
+
+    Callers reserve a token and are told how long to wait for it, so the lock is only held for the bookkeeping and
+    never while sleeping. ``rate`` is in requests per second, ``capacity`` is the allowed burst.
+    """
+
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        self.rate = rate
+        self.capacity = capacity or max(rate, 1.0)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _reserve(self, cost: float = 1.0, pause: float = 0.0) -> float:
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            if pause > 0:
+                self._tokens = min(self._tokens, -pause * self.rate)
+            self._tokens -= cost
+            return 0.0 if self._tokens >= 0 else -self._tokens / self.rate
+
+    async def acquire(self) -> float:
+        """Wait for a token and return the number of seconds spent waiting."""
+        wait = self._reserve()
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return wait
+
+    def acquire_sync(self) -> float:
+        """Blocking version of `acquire`."""
+        wait = self._reserve()
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+    async def pause(self, seconds: float) -> None:
+        """Hold back every caller for at least ``seconds`` (e.g. after a 429 with Retry-After)."""
+        self._reserve(cost=0.0, pause=seconds)
+
+    def pause_sync(self, seconds: float) -> None:
+        self._reserve(cost=0.0, pause=seconds)
+
+
+@define
+class TransportStats:
+    """Counters shared by the transports of one client"""
+
+    requests: int = 0
+    throttled: int = 0
+    throttle_wait_seconds: float = 0.0
+    rate_limited: int = 0
+    retries: int = 0
+    failures: int = 0
+
+
+def _parse_retry_after(response: httpx.Response) -> Optional[float]:
+    value = response.headers.get("Retry-After")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
+class _RetryPolicy:
+    def __init__(
+        self,
+        *,
+        limiter=None,
+        max_retries: int = 3,
+        backoff: float = 0.5,
+        max_backoff: float = 30.0,
+        stats: Optional[TransportStats] = None,
+    ):
+        self.limiter = limiter
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.stats = stats or TransportStats()
+
+    def _can_retry(self, request: httpx.Request, attempt: int) -> bool:
+        return request.method in IDEMPOTENT_METHODS and attempt < self.max_retries
+
+    def _delay(self, attempt: int, response: Optional[httpx.Response]) -> float:
+        """Retry-After when the server sent one, else full-jitter exponential backoff; capped at max_backoff."""
+        retry_after = _parse_retry_after(response) if response is not None else None
+        if retry_after is None:
+            return random.uniform(0, min(self.max_backoff, self.backoff * 2**attempt))
+        return min(retry_after, self.max_backoff)
+
+    def _record_wait(self, waited: float) -> None:
+        self.stats.requests += 1
+        if waited > 0:
+            self.stats.throttled += 1
+            self.stats.throttle_wait_seconds += waited
+
+
+class AsyncRetryTransport(_RetryPolicy, httpx.AsyncBaseTransport):
+    """Async transport enforcing the shared rate limit and retrying idempotent requests on 429/5xx"""
+
+    def __init__(self, transport: httpx.AsyncBaseTransport, **kwargs):
+        super().__init__(**kwargs)
+        self.transport = transport
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        attempt = 0
+        while True:
+            if self.limiter is not None:
+                self._record_wait(await self.limiter.acquire())
+            else:
+                self._record_wait(0.0)
+
+            try:
+                response = await self.transport.handle_async_request(request)
+            except httpx.TransportError:
+                if not self._can_retry(request, attempt):
+                    self.stats.failures += 1
+                    raise
+                delay = self._delay(attempt, None)
+            else:
+                if response.status_code not in RETRY_STATUSES:
+                    return response
+                if response.status_code == 429:
+                    self.stats.rate_limited += 1
+                if not self._can_retry(request, attempt):
+                    self.stats.failures += 1
+                    return response
+                delay = self._delay(attempt, response)
+                await response.aclose()
+                if response.status_code == 429 and self.limiter is not None:
+                    # The next acquire() waits out the pause, so sleeping as well would wait twice
+                    await self.limiter.pause(delay)
+                    delay = 0.0
+
+            self.stats.retries += 1
+            attempt += 1
+            if delay > 0:
+                await asyncio.sleep(delay)
+
+    async def aclose(self) -> None:
+        await self.transport.aclose()
+
+
+class RetryTransport(_RetryPolicy, httpx.BaseTransport):
+    """Blocking counterpart of `AsyncRetryTransport`"""
+
+    def __init__(self, transport: httpx.BaseTransport, **kwargs):
+        super().__init__(**kwargs)
+        self.transport = transport
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        attempt = 0
+        while True:
+            if self.limiter is not None:
+                self._record_wait(self.limiter.acquire_sync())
+            else:
+                self._record_wait(0.0)
+
+            try:
+                response = self.transport.handle_request(request)
+            except httpx.TransportError:
+                if not self._can_retry(request, attempt):
+                    self.stats.failures += 1
+                    raise
+                delay = self._delay(attempt, None)
+            else:
+                if response.status_code not in RETRY_STATUSES:
+                    return response
+                if response.status_code == 429:
+                    self.stats.rate_limited += 1
+                if not self._can_retry(request, attempt):
+                    self.stats.failures += 1
+                    return response
+                delay = self._delay(attempt, response)
+                response.close()
+                if response.status_code == 429 and self.limiter is not None:
+                    # The next acquire_sync() waits out the pause, so sleeping as well would wait twice
+                    self.limiter.pause_sync(delay)
+                    delay = 0.0
+
+            self.stats.retries += 1
+            attempt += 1
+            if delay > 0:
+                time.sleep(delay)
+
+    def close(self) -> None:
+        self.transport.close()
+
+
+__all__ = ["AsyncRetryTransport", "RetryTransport", "TokenBucket", "TransportStats"]
@@ -0,0 +1,165 @@
+#!/usr/bin/env python
+"""
+Compare cache codecs on the payloads CacheService stores: encode/decode time and bytes held in Redis.
+
+Usage: python scripts/benchmark_cache_codec.py [--trials 200] [--repeat 5]
+
+Codecs whose package (msgpack, zstandard, lz4) is not installed are skipped.
+"""
+import argparse
+import copy
+import logging
+import os
+import random
+import sys
+import time
+
+# Add parent directory to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.cache_codec import COMPRESSIONS, SERIALIZERS, CacheCodec
+from scripts.benchmark_study_parsing import STUDY
+
+
+CONDITIONS = [
+    ("Asthma", "D001249"), ("COPD", "D029424"), ("Lung Cancer", "D008175"), ("Breast Cancer", "D001943"),
+    ("Type 2 Diabetes", "D003924"), ("Obesity", "D009765"), ("Heart Failure", "D006333"), ("Psoriasis", "D011565"),
+]
+CITIES = [
+    ("Boston", "Massachusetts", "United States", 42.36, -71.06), ("Toronto", "Ontario", "Canada", 43.65, -79.38),
+    ("Berlin", None, "Germany", 52.52, 13.40), ("Madrid", None, "Spain", 40.42, -3.70),
+    ("Houston", "Texas", "United States", 29.76, -95.37), ("Seoul", None, "Korea, Republic of", 37.57, 126.98),
+    ("Melbourne", "Victoria", "Australia", -37.81, 144.96), ("Lyon", None, "France", 45.76, 4.84),
+]
+WORDS = (
+    "efficacy safety tolerability pharmacokinetics dose placebo randomized participants baseline week change "
+    "symptoms exacerbation response remission biomarker exposure adverse events quality life score treatment "
+    "arm cohort open-label extension long-term monotherapy combination standard care inhibitor antibody"
+).split()
+
+
+def sentence(rng: random.Random, words: int) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(words)).capitalize() + "."
+
+
+def build_trial(index: int, rng: random.Random) -> dict:
+    """A study with its own ids, titles, dates, conditions, arms and sites, as in a real portfolio"""
+    study = copy.deepcopy(STUDY)
+    protocol = study["protocolSection"]
+    nct_id = f"NCT{rng.randint(0, 99999999):08d}"
+    drug = f"ACM-{rng.randint(100, 999)}"
+    conditions = rng.sample(CONDITIONS, rng.randint(1, 3))
+    phase = rng.choice(["PHASE1", "PHASE2", "PHASE3", "PHASE4"])
+    start = f"{rng.randint(2005, 2024)}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}"
+
+    identification = protocol["identificationModule"]
+    identification.update(
+        nctId=nct_id,
+        orgStudyIdInfo={"id": f"ACME-{index:04d}-{rng.randint(1, 99)}"},
+        briefTitle=f"A Study of {drug} in {conditions[0][0]} ({sentence(rng, 4)[:-1]})",
+        officialTitle=f"A {phase.title()}, {sentence(rng, 12)[:-1]} of {drug} in {', '.join(c[0] for c in conditions)}",
+    )
+    status = protocol["statusModule"]
+    status["overallStatus"] = rng.choice(["RECRUITING", "COMPLETED", "TERMINATED", "ACTIVE_NOT_RECRUITING"])
+    status["startDateStruct"]["date"] = start
+    status["primaryCompletionDateStruct"]["date"] = f"{int(start[:4]) + rng.randint(1, 6)}{start[4:]}"
+    status["studyFirstSubmitDate"] = f"{int(start[:4]) - 1}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}"
+    protocol["descriptionModule"] = {
+        "briefSummary": " ".join(sentence(rng, rng.randint(8, 20)) for _ in range(3)),
+        "detailedDescription": " ".join(sentence(rng, rng.randint(8, 20)) for _ in range(rng.randint(4, 12))),
+    }
+    protocol["conditionsModule"] = {
+        "conditions": [name for name, _ in conditions],
+        "keywords": rng.sample(WORDS, 4),
+    }
+    design = protocol["designModule"]
+    design["phases"] = [phase]
+    design["enrollmentInfo"]["count"] = rng.randint(12, 3000)
+    arms = protocol["armsInterventionsModule"]
+    arms["armGroups"][0].update(label=drug, interventionNames=[f"Drug: {drug}"])
+    arms["interventions"][0].update(name=drug, armGroupLabels=[drug])
+    protocol["outcomesModule"] = {
+        "primaryOutcomes": [{"measure": sentence(rng, 6), "timeFrame": f"Week {rng.choice([12, 24, 52])}"}],
+        "secondaryOutcomes": [
+            {"measure": sentence(rng, 6), "timeFrame": f"Week {rng.randint(1, 104)}"} for _ in range(rng.randint(2, 8))
+        ],
+    }
+    minimum_age = rng.choice([12, 18, 40])
+    protocol["eligibilityModule"].update(
+        eligibilityCriteria="Inclusion Criteria:\n\n" + "\n".join(
+            f"* {sentence(rng, rng.randint(5, 12))}" for _ in range(rng.randint(4, 12))
+        ),
+        minimumAge=f"{minimum_age} Years",
+        maximumAge=f"{rng.randint(minimum_age + 20, 85)} Years",
+    )
+    locations = []
+    for site in range(rng.randint(1, 40)):
+        city, state, country, lat, lon = rng.choice(CITIES)
+        locations.append({
+            "facility": f"{city} Research Site {rng.randint(1, 500)}",
+            "status": rng.choice(["RECRUITING", "COMPLETED", "NOT_YET_RECRUITING"]),
+            "city": city,
+            "state": state,
+            "zip": f"{rng.randint(1000, 99999):05d}",
+            "country": country,
+            "geoPoint": {"lat": round(lat + rng.uniform(-0.3, 0.3), 4), "lon": round(lon + rng.uniform(-0.3, 0.3), 4)},
+        })
+    protocol["contactsLocationsModule"]["locations"] = locations
+    study["derivedSection"]["conditionBrowseModule"]["meshes"] = [{"id": mesh, "term": name} for name, mesh in conditions]
+    study["nctId"] = nct_id
+    return study
+
+
+def build_payloads(trials: int) -> dict:
+    """A company trial list (set_trials) and its analytics (set_trial_analytics)"""
+    rng = random.Random(trials)
+    documents = [build_trial(index, rng) for index in range(trials)]
+    nct_ids = [document["nctId"] for document in documents]
+    analytics = {
+        "phase_distribution": {"PHASE1": 40, "PHASE2": 95, "PHASE3": 52, "PHASE4": 13},
+        "status_summary": {"RECRUITING": 61, "COMPLETED": 120, "TERMINATED": 19},
+        "therapeutic_areas": {
+            name: {"count": count, "trials": rng.sample(nct_ids, min(count, len(nct_ids)))}
+            for name, count in ((name, rng.randint(1, 40)) for name, _ in CONDITIONS)
+        },
+        "total_trials": trials,
+        "enrollment_stats": {"total": 48000, "average": 240.0, "median": 180},
+    }
+    return {"company_trials": documents, "trial_analytics": analytics}
+
+
+def measure(codec: CacheCodec, value, repeat: int):
+    encode_times, decode_times = [], []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        data = codec.encode(value)
+        encode_times.append(time.perf_counter() - started)
+        started = time.perf_counter()
+        decoded = codec.decode(data)
+        decode_times.append(time.perf_counter() - started)
+    assert decoded == value, "round trip changed the value"
+    return min(encode_times), min(decode_times), len(data)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--trials", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    # Fallback warnings for uninstalled codecs; those combinations are skipped below
+    logging.getLogger("app.services.cache_codec").setLevel(logging.ERROR)
+
+    for key, value in build_payloads(args.trials).items():
+        print(f"\n{key}")
+        for serializer in SERIALIZERS:
+            for compression in COMPRESSIONS:
+                codec = CacheCodec(serializer, compression, compress_threshold=0)
+                if (codec.serializer, codec.compression) != (SERIALIZERS[serializer], COMPRESSIONS[compression]):
+                    continue  # Not installed; the codec fell back to something already measured
+                encode, decode, size = measure(codec, value, args.repeat)
+                print(f"{serializer:>8} + {compression:<5} encode {encode * 1000:7.2f} ms   "
+                      f"decode {decode * 1000:7.2f} ms   {size / 1024:8.1f} KiB")
+
+
+if __name__ == "__main__":
+    main()
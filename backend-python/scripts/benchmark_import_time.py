@@ -0,0 +1,89 @@
+#!/usr/bin/env python
+"""
+Measure import time of the ClinicalTrials.gov client with `python -X importtime`.
+
+Each module is imported in a fresh interpreter several times; the best cumulative time is
+reported along with the slowest nested imports of that run.
+
+Usage: python scripts/benchmark_import_time.py [--repeat 5] [--top 15] [--output importtime.txt] [module ...]
+"""
+import argparse
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+DEFAULT_MODULES = [
+    "ct_client.clinical_trials_gov_rest_api_client",
+    "ct_client.clinical_trials_gov_rest_api_client.models",
+    "ct_client.clinical_trials_gov_rest_api_client.api.studies.list_studies",
+    "ct_client.clinical_trials_gov_rest_api_client.api.studies.fetch_study",
+]
+
+
+def import_times(statement: str):
+    """Run a statement in a fresh interpreter and return [(cumulative_us, self_us, name)] for every import."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        rows.append((int(cumulative_us), int(self_us), name.rstrip()))
+    return rows
+
+
+def is_top_level(name: str) -> bool:
+    # Nested imports are indented by two extra spaces per level
+    return not name.startswith("  ")
+
+
+def measure(module: str, repeat: int, startup: set):
+    """Best total over ``repeat`` runs, counting the module, its parent packages and everything they import."""
+    best = None
+    for _ in range(repeat):
+        rows = import_times(f"import {module}")
+        total = sum(
+            cumulative for cumulative, _, name in rows if is_top_level(name) and name.strip() not in startup
+        )
+        if best is None or total < best[0]:
+            best = (total, rows)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("modules", nargs="*", default=DEFAULT_MODULES)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--top", type=int, default=15, help="slowest nested imports to list per module")
+    parser.add_argument("--output", help="also write the report to this file")
+    args = parser.parse_args()
+
+    # Modules the interpreter imports on its own (site, encodings, ...) are not ours to count
+    startup = {name.strip() for _, _, name in import_times("pass") if is_top_level(name)}
+
+    lines = []
+    for module in args.modules:
+        total, rows = measure(module, args.repeat, startup)
+        lines.append(f"{module}: {total / 1000:.1f} ms (best of {args.repeat})")
+        ours = [row for row in rows if row[2].strip() not in startup]
+        for cumulative, self_us, name in sorted(ours, key=lambda row: row[1], reverse=True)[:args.top]:
+            lines.append(f"    self {self_us / 1000:7.1f} ms   cumulative {cumulative / 1000:7.1f} ms   {name.strip()}")
+        lines.append("")
+
+    report = "\n".join(lines)
+    print(report)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(report)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,162 @@
+#!/usr/bin/env python
+"""
+Compare eager PagedStudies.from_dict parsing with the lazy study view on a 1000-study page.
+
+Usage: python scripts/benchmark_study_parsing.py [--studies 1000] [--repeat 5]
+"""
+import argparse
+import copy
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+# Add parent directory to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ct_client.clinical_trials_gov_rest_api_client.lazy import LazyPagedStudies
+from ct_client.clinical_trials_gov_rest_api_client.models.paged_studies import PagedStudies
+
+# Shaped like a typical interventional record from /api/v2/studies
+STUDY = {
+    "protocolSection": {
+        "identificationModule": {
+            "nctId": "NCT00000000",
+            "orgStudyIdInfo": {"id": "ACME-001"},
+            "organization": {"fullName": "Acme Therapeutics", "class": "INDUSTRY"},
+            "briefTitle": "A Study of ACM-101 in Adults With Moderate to Severe Asthma",
+            "officialTitle": "A Phase 2, Randomized, Double-Blind, Placebo-Controlled Study of ACM-101 in Asthma",
+        },
+        "statusModule": {
+            "statusVerifiedDate": "2024-01",
+            "overallStatus": "RECRUITING",
+            "startDateStruct": {"date": "2023-03-01", "type": "ACTUAL"},
+            "primaryCompletionDateStruct": {"date": "2025-06-30", "type": "ESTIMATED"},
+            "studyFirstSubmitDate": "2023-01-15",
+            "lastUpdatePostDateStruct": {"date": "2024-01-10", "type": "ACTUAL"},
+        },
+        "sponsorCollaboratorsModule": {
+            "leadSponsor": {"name": "Acme Therapeutics", "class": "INDUSTRY"},
+            "collaborators": [{"name": "University Hospital", "class": "OTHER"}],
+        },
+        "descriptionModule": {
+            "briefSummary": "The purpose of this study is to evaluate the efficacy and safety of ACM-101. " * 8,
+            "detailedDescription": "Participants will be randomized to ACM-101 or placebo for 24 weeks. " * 20,
+        },
+        "conditionsModule": {"conditions": ["Asthma"], "keywords": ["asthma", "biologic", "eosinophils"]},
+        "designModule": {
+            "studyType": "INTERVENTIONAL",
+            "phases": ["PHASE2"],
+            "designInfo": {
+                "allocation": "RANDOMIZED",
+                "interventionModel": "PARALLEL",
+                "primaryPurpose": "TREATMENT",
+                "maskingInfo": {"masking": "DOUBLE", "whoMasked": ["PARTICIPANT", "INVESTIGATOR"]},
+            },
+            "enrollmentInfo": {"count": 240, "type": "ESTIMATED"},
+        },
+        "armsInterventionsModule": {
+            "armGroups": [
+                {"label": "ACM-101", "type": "EXPERIMENTAL", "interventionNames": ["Drug: ACM-101"]},
+                {"label": "Placebo", "type": "PLACEBO_COMPARATOR", "interventionNames": ["Drug: Placebo"]},
+            ],
+            "interventions": [
+                {"type": "DRUG", "name": "ACM-101", "armGroupLabels": ["ACM-101"]},
+                {"type": "DRUG", "name": "Placebo", "armGroupLabels": ["Placebo"]},
+            ],
+        },
+        "outcomesModule": {
+            "primaryOutcomes": [
+                {"measure": "Change from baseline in FEV1", "timeFrame": "Week 24"},
+            ],
+            "secondaryOutcomes": [
+                {"measure": f"Secondary outcome {i}", "timeFrame": "Week 24"} for i in range(6)
+            ],
+        },
+        "eligibilityModule": {
+            "eligibilityCriteria": "Inclusion Criteria:\n\n* Adults aged 18 to 75\n" * 10,
+            "healthyVolunteers": False,
+            "sex": "ALL",
+            "minimumAge": "18 Years",
+            "maximumAge": "75 Years",
+            "stdAges": ["ADULT", "OLDER_ADULT"],
+        },
+        "contactsLocationsModule": {
+            "locations": [
+                {
+                    "facility": f"Research Site {i}",
+                    "status": "RECRUITING",
+                    "city": "Boston",
+                    "state": "Massachusetts",
+                    "zip": "02114",
+                    "country": "United States",
+                    "geoPoint": {"lat": 42.36, "lon": -71.06},
+                }
+                for i in range(25)
+            ],
+        },
+    },
+    "derivedSection": {
+        "conditionBrowseModule": {
+            "meshes": [{"id": "D001249", "term": "Asthma"}],
+            "ancestors": [{"id": f"D00{i}", "term": f"Ancestor {i}"} for i in range(8)],
+        },
+    },
+    "hasResults": False,
+}
+
+
+def build_page(size: int) -> bytes:
+    studies = []
+    for index in range(size):
+        study = copy.deepcopy(STUDY)
+        study["protocolSection"]["identificationModule"]["nctId"] = f"NCT{index:08d}"
+        studies.append(study)
+    return json.dumps({"studies": studies, "nextPageToken": "next", "totalCount": size}).encode()
+
+
+def eager(content: bytes):
+    page = PagedStudies.from_dict(json.loads(content))
+    return [(s.protocol_section.identification_module.nct_id, s.protocol_section.status_module.overall_status)
+            for s in page.studies]
+
+
+def lazy(content: bytes):
+    page = LazyPagedStudies.from_json(content)
+    return [(s.nct_id, s.overall_status) for s in page.studies]
+
+
+def measure(parse, content: bytes, repeat: int):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        parse(content)
+        timings.append(time.perf_counter() - started)
+
+    tracemalloc.start()
+    result = parse(content)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return min(timings), peak, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--studies", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    content = build_page(args.studies)
+    print(f"Page: {args.studies} studies, {len(content) / 1024 / 1024:.1f} MiB of JSON")
+
+    results = {}
+    for name, parse in (("eager from_dict", eager), ("lazy view", lazy)):
+        seconds, peak, results[name] = measure(parse, content, args.repeat)
+        print(f"{name:>16}: {seconds * 1000:8.1f} ms   peak {peak / 1024 / 1024:7.1f} MiB")
+
+    assert results["eager from_dict"] == results["lazy view"], "parsers disagree"
+
+
+if __name__ == "__main__":
+    main()
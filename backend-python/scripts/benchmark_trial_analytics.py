@@ -0,0 +1,105 @@
+#!/usr/bin/env python
+"""
+Compare in-process trial analytics with the $facet aggregation against a local mongod.
+
+Usage: python scripts/benchmark_trial_analytics.py [--url mongodb://localhost:27017] [--trials 10000 100000]
+       [--companies 1] [--repeat 3]
+
+For each size, trials spread over --companies companies are written into a scratch database
+(benchmark_trial_analytics, dropped afterwards). The python engine reads the analysed fields of every trial
+and computes in-process; the aggregation engine returns only the per-company aggregates.
+"""
+import argparse
+import asyncio
+import os
+import random
+import sys
+import time
+
+# Add parent directory to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from motor.motor_asyncio import AsyncIOMotorClient
+
+from app.services.trial_analytics_engine import ANALYSED_FIELDS, TrialAnalyticsEngine
+
+DATABASE = "benchmark_trial_analytics"
+CONDITIONS = ["Asthma", "COPD", "Lung Cancer", "Breast Cancer", "Type 2 Diabetes", "Obesity", "Heart Failure"]
+
+
+def build_trials(count: int, company_ids: list, rng: random.Random) -> list:
+    trials = []
+    for index in range(count):
+        start_year = rng.randint(2000, 2024)
+        trials.append({
+            "nct_id": f"NCT{index:08d}",
+            "company_id": company_ids[index % len(company_ids)],
+            "protocolSection": {
+                "identificationModule": {"nctId": f"NCT{index:08d}", "briefTitle": f"Study {index}"},
+                "designModule": {
+                    "phases": rng.choice([["PHASE1"], ["PHASE2"], ["PHASE2", "PHASE3"], ["PHASE3"], []]),
+                    "enrollmentInfo": {"count": rng.randint(1, 3000)},
+                },
+                "statusModule": {
+                    "overallStatus": rng.choice(["RECRUITING", "COMPLETED", "TERMINATED", "ACTIVE_NOT_RECRUITING"]),
+                    "startDateStruct": {"date": f"{start_year}-{rng.randint(1, 12):02d}"},
+                    "completionDateStruct": {"date": f"{start_year + rng.randint(0, 6)}-{rng.randint(1, 12):02d}-01"},
+                },
+                "conditionsModule": {"conditions": rng.sample(CONDITIONS, rng.randint(1, 3))},
+            },
+        })
+    return trials
+
+
+async def python_engine(collection, company_ids: list) -> dict:
+    projection = {field: 1 for field in ANALYSED_FIELDS}
+    return {
+        company_id: TrialAnalyticsEngine.compute(
+            [trial async for trial in collection.find({"company_id": company_id}, projection)]
+        )
+        for company_id in company_ids
+    }
+
+
+async def best_of(repeat: int, run) -> float:
+    times = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        await run()
+        times.append(time.perf_counter() - started)
+    return min(times)
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--url", default="mongodb://localhost:27017")
+    parser.add_argument("--trials", type=int, nargs="+", default=[10000, 100000])
+    parser.add_argument("--companies", type=int, default=1)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    client = AsyncIOMotorClient(args.url)
+    collection = client[DATABASE]["trials"]
+    company_ids = [f"company-{index}" for index in range(args.companies)]
+    try:
+        for count in args.trials:
+            await client.drop_database(DATABASE)
+            await collection.create_index("company_id")
+            trials = build_trials(count, company_ids, random.Random(count))
+            for index in range(0, len(trials), 10000):
+                await collection.insert_many(trials[index:index + 10000])
+
+            python_seconds = await best_of(args.repeat, lambda: python_engine(collection, company_ids))
+            aggregation_seconds = await best_of(
+                args.repeat, lambda: TrialAnalyticsEngine.aggregate(collection, company_ids)
+            )
+            print(f"{count:>7} trials  python {python_seconds * 1000:9.1f} ms   "
+                  f"aggregation {aggregation_seconds * 1000:9.1f} ms   "
+                  f"speed-up {python_seconds / aggregation_seconds:5.1f}x")
+    finally:
+        await client.drop_database(DATABASE)
+        client.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
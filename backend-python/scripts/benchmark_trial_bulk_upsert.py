@@ -0,0 +1,112 @@
+#!/usr/bin/env python
+"""
+Compare the previous save_trial_data loop with TrialService's bulk save paths end to end against a local mongod.
+
+Usage: python scripts/benchmark_trial_bulk_upsert.py [--url mongodb://localhost:27017] [--trials 2000]
+       [--batch-size 500] [--concurrency 4]
+
+Every path validates each trial against the ``trials`` schema (ClinicalTrial, registered in the scratch
+database benchmark_trial_bulk, dropped afterwards) and invalidates the company's cache, so Redis should be
+running too. The previous loop validates on the event loop and upserts one trial per round trip;
+save_trial_data and bulk_save_trials validate in worker threads and upsert in unordered bulk_write batches.
+Each path is timed twice: once inserting new trials and once updating them.
+"""
+import argparse
+import asyncio
+import copy
+import os
+import sys
+import time
+
+# Add parent directory to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from motor.motor_asyncio import AsyncIOMotorClient
+
+from app.config.database import MongoDB
+from app.models.trial import ClinicalTrial
+from app.services.schema_service import SchemaService
+from app.services.trial_service import TrialService, cache_service
+from app.system_specs.schema_manager import SchemaVersion, schema_manager
+from scripts.benchmark_study_parsing import STUDY
+
+DATABASE = "benchmark_trial_bulk"
+COMPANY_ID = "benchmark"
+
+
+def build_trials(count: int, offset: int) -> list:
+    trials = []
+    for index in range(count):
+        trial = copy.deepcopy(STUDY)
+        trial["nct_id"] = f"NCT{offset + index:08d}"
+        # ClinicalTrial requires it; the sample study predates that field
+        trial["protocolSection"]["statusModule"]["completionDateStruct"] = {"date": "2025-12-31", "type": "ESTIMATED"}
+        trials.append(trial)
+    return trials
+
+
+async def previous_save_trial_data(company_id: str, trials: list):
+    """save_trial_data before the bulk path: validate on the event loop, then one upsert per trial"""
+    context = await SchemaService.get_collection_context(TrialService.COLLECTION)
+    async with MongoDB.get_collection(TrialService.COLLECTION) as collection:
+        for trial in trials:
+            TrialService._stamp(company_id, trial)
+            if not await SchemaService.validate_document(TrialService.COLLECTION, trial, context):
+                raise ValueError("Invalid trial data for current schema context")
+            await collection.find_one_and_update({"nct_id": trial["nct_id"]}, {"$set": trial}, upsert=True)
+    await cache_service.invalidate_company(company_id)
+    await cache_service.clear_missing("trial", *(trial["nct_id"] for trial in trials))
+
+
+async def save(trials: list):
+    result = await TrialService.save_trial_data(COMPANY_ID, trials)
+    assert result["success"], result["errors"][:1]
+
+
+async def bulk_save(trials: list, batch_size: int, concurrency: int):
+    result = await TrialService.bulk_save_trials(COMPANY_ID, trials, batch_size, concurrency)
+    assert result["success"], result["errors"][:1]
+
+
+async def timed(label: str, count: int, write):
+    started = time.perf_counter()
+    await write
+    elapsed = time.perf_counter() - started
+    print(f"{label:<28} {elapsed * 1000:9.1f} ms   {count / elapsed:9.0f} trials/s")
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--url", default="mongodb://localhost:27017")
+    parser.add_argument("--trials", type=int, default=2000)
+    parser.add_argument("--batch-size", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=4)
+    args = parser.parse_args()
+
+    client = AsyncIOMotorClient(args.url)
+    MongoDB.client, MongoDB.db = client, client[DATABASE]
+    collection = MongoDB.db[TrialService.COLLECTION]
+    try:
+        await client.drop_database(DATABASE)
+        # Without an index on nct_id every upsert scans the collection and drowns out the comparison
+        await collection.create_index("nct_id", unique=True)
+        await schema_manager.register_schema("trials", ClinicalTrial, SchemaVersion(1, 0, 0))
+
+        for phase in ("insert", "update"):
+            print(f"\n{phase} {args.trials} trials")
+            await timed(
+                "validate + upsert loop", args.trials, previous_save_trial_data(COMPANY_ID, build_trials(args.trials, 0))
+            )
+            await timed("save_trial_data", args.trials, save(build_trials(args.trials, args.trials)))
+            await timed(
+                f"bulk_save_trials {args.batch_size} x {args.concurrency}",
+                args.trials,
+                bulk_save(build_trials(args.trials, 2 * args.trials), args.batch_size, args.concurrency)
+            )
+    finally:
+        await client.drop_database(DATABASE)
+        client.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
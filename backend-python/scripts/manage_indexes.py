@@ -0,0 +1,56 @@
+#!/usr/bin/env python
+"""
+Apply and check the MongoDB indexes declared in app/config/indexes.py.
+
+Usage:
+  python scripts/manage_indexes.py apply [--drop-changed] [--drop-extra]
+  python scripts/manage_indexes.py check
+
+``check`` reports missing, extra and changed indexes and explains each declared query shape; it exits
+with status 1 if anything is missing or changed or any query scans the collection or sorts in memory.
+Explains run against the current data, so check a populated database.
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+
+# Add parent directory to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from motor.motor_asyncio import AsyncIOMotorClient
+
+from app.config.settings import get_settings
+from app.services.index_service import IndexService
+
+
+async def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+    apply = commands.add_parser("apply", help="create missing indexes")
+    apply.add_argument("--drop-changed", action="store_true", help="rebuild indexes whose options changed")
+    apply.add_argument("--drop-extra", action="store_true", help="drop indexes that are not declared")
+    commands.add_parser("check", help="report drift and uncovered queries")
+    args = parser.parse_args()
+
+    settings = get_settings()
+    client = AsyncIOMotorClient(settings.MONGODB_URL)
+    db = client[settings.DATABASE_NAME]
+    try:
+        if args.command == "apply":
+            report = await IndexService.apply(db, args.drop_changed, args.drop_extra)
+            print(json.dumps(report, indent=2))
+            return 1 if any(result["failed"] for result in report.values()) else 0
+
+        drift = await IndexService.drift(db)
+        uncovered = await IndexService.check_queries(db)
+        print(json.dumps({"drift": drift, "uncovered_queries": uncovered}, indent=2))
+        broken = any(result["missing"] or result["changed"] for result in drift.values())
+        return 1 if broken or uncovered else 0
+    finally:
+        client.close()
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
@@ -0,0 +1,40 @@
+#!/usr/bin/env python
+"""
+Move the trial arrays embedded in companies into the trials collection and company_trial_links.
+
+Usage: python scripts/normalize_company_trials.py [--batch-size 20] [--pause 0.5]
+
+Runs online and can be stopped and rerun at any time; companies written while they were being moved keep
+their arrays and are listed as skipped. Set COMPANY_TRIALS_STORAGE=normalized before (or right after) running
+it, or the next embedded write of a company puts its array back. Apply the indexes first
+(scripts/manage_indexes.py apply) so the link upserts do not scan.
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+
+# Add parent directory to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.config.database import MongoDB
+from app.services.trial_service import CompanyTrialService
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--batch-size", type=int, default=None)
+    parser.add_argument("--pause", type=float, default=0.0, help="seconds to wait between batches")
+    args = parser.parse_args()
+
+    await MongoDB.connect()
+    try:
+        report = await CompanyTrialService.normalize_all(args.batch_size, args.pause)
+        print(json.dumps(report, indent=2))
+    finally:
+        await MongoDB.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
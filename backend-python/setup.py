@@ -14,5 +14,8 @@ setup(
         "pydantic-settings",
         "neo4j",
         "python-dotenv",
+        "httpx[http2]",
+        "prometheus-client",
+        "orjson",
     ],
 ) 